@@ -0,0 +1,458 @@
+# hooks/content_pack_hook.py
+"""Write every page's markdown and section outline for the MCP server.
+
+The MCP server (mcp-server/) answers read_topic and read_sections by
+downloading a page's themed HTML, stripping the navigation and converting
+what is left back to markdown. The site build already has that markdown:
+this hook saves each page's source (after macros have been rendered) with
+its h2-h4 section outline, one small JSON file per page, so the server can
+read any single page without conversion:
+
+- content-pack/index.json: format, build digest, and the url, title, file
+  and digest of every page, by page key
+- content-pack/pages/<key>.json: url, title, markdown and sections (title,
+  level, start and end offsets into the markdown, anchor)
+
+Anchors are the heading ids of the rendered page, taken from its table of
+contents. Attribute lists ({:target="_blank"}) are removed from the
+markdown, and relative link and image targets (markdown links, reference
+definitions and src/href attributes of HTML tags) are rewritten to absolute
+URLs under site_url, outside code blocks, so the markdown reads the same
+wherever the server shows it. Targets are resolved against the page's source
+file, as MkDocs resolves them.
+
+The site navigation is written to content-pack/nav.json as an outline,
+[depth, title, url] per entry in nav order, with URLs relative to the site
+root. A section whose first page is an index page links to that page, as
+the theme shows it (navigation.indexes); the home page is left out.
+
+The diagrams of every page are collected from its rendered HTML into
+content-pack/diagrams.json (url, title and diagrams of each page with any,
+by page key), so the server can catalog them without crawling the site.
+Each diagram is found by the rules of the server's extract_diagrams, which
+mcp-server/tests/test_content_pack.py checks on the same HTML, and has its
+fields: title (alt text), image_url (relative to the site root unless
+absolute), context, section and anchor.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+log = logging.getLogger("mkdocs.hooks.content_pack")
+
+PACK_FORMAT = 1
+PACK_DIR = "content-pack"
+SECTION_LEVELS = (2, 3, 4)
+
+_FENCE_RE = re.compile(r"^[ \t]*(`{3,}|~{3,})")
+_HEADING_RE = re.compile(r"^(#{1,6})[ \t]+(.*?)[ \t]*#*[ \t]*$")
+_ATTR_LIST_RE = re.compile(r"[ \t]*\{:[^}\n]*\}")
+# The target of an inline link or image, of a reference definition, and of a
+# src or href attribute of an HTML tag
+_LINK_RES = (
+    re.compile(r"(!?\[[^\[\]]*\]\([ \t]*<?)((?:[^()\s<>]|\([^()\s]*\))+)"),
+    re.compile(r"^([ \t]{0,3}\[[^\]]+\]:[ \t]*<?)([^\s<>]+)"),
+    re.compile(r"(<[a-zA-Z][^>]*?\s(?:src|href)=[\"'])([^\"']+)"),
+)
+
+# Images are not diagrams when their alt text has one of these words, or when
+# narrower than this (as in the server's extract_diagrams)
+_SKIP_ALT_WORDS = ("logo", "icon", "favicon", "badge", "avatar")
+MIN_DIAGRAM_WIDTH = 100
+_HEADING_TAGS = ("h1", "h2", "h3", "h4")
+_CAPTION_TAGS = ("figcaption", "em", "center", "p")
+_VOID_TAGS = ("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+              "source", "track", "wbr")
+
+# Page key -> entry, and page key -> diagrams, collected while pages are rendered
+_pages = {}
+_diagrams = {}
+# The site navigation, written once every page has its title
+_nav = []
+
+
+def page_key(url):
+    """Return the server's key for a page URL (foo/bar.html and foo/bar/ -> foo/bar)."""
+    path = url.split("#", 1)[0].strip("/")
+    for suffix in ("index.html", "index.md", ".html", ".md"):
+        if path.endswith(suffix):
+            path = path[: -len(suffix)]
+            break
+    return path.strip("/")
+
+
+def clean_markdown(markdown):
+    """Remove attribute lists outside fenced code blocks."""
+    lines = []
+    fence = None
+    for line in markdown.splitlines(keepends=True):
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker[0] * 3
+            elif marker.startswith(fence):
+                fence = None
+        elif fence is None and "{:" in line:
+            line = _ATTR_LIST_RE.sub("", line)
+        lines.append(line)
+    return "".join(lines)
+
+
+def link_url(target, page_url, src_uri=None, files=None, site_url=""):
+    """Return the absolute URL of a relative link or image target of a page.
+
+    A target is resolved against the page's source file (src_uri) when it
+    names a file of the build, so foo.md links to foo's page, and against the
+    page URL otherwise. Absolute URLs and fragment-only targets are returned
+    unchanged, and an empty query (foo.md?#anchor) is dropped.
+    """
+    if not target or target.startswith("#") or urlsplit(target).scheme or target.startswith("//"):
+        return target
+    path, sep, fragment = target.partition("#")
+    path, qsep, query = path.partition("?")
+    if not query:
+        qsep = ""
+    resolved = None
+    if src_uri is not None and files is not None and not path.startswith("/"):
+        src_path = posixpath.normpath(posixpath.join(posixpath.dirname(src_uri), unquote(path)))
+        file = files.get_file_from_path(src_path)
+        if file is not None:
+            resolved = file.url
+    if resolved is None:
+        resolved = site_path(page_url, path)
+    if site_url:
+        resolved = f"{site_url.rstrip('/')}/{resolved}"
+    return resolved + qsep + query + sep + fragment
+
+
+def absolute_links(markdown, page_url, src_uri=None, files=None, site_url=""):
+    """Rewrite relative link and image targets outside fenced code blocks (see link_url)."""
+
+    def replace(match):
+        target = link_url(match.group(2), page_url, src_uri, files, site_url)
+        return match.group(1) + target
+
+    lines = []
+    fence = None
+    for line in markdown.splitlines(keepends=True):
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker[0] * 3
+            elif marker.startswith(fence):
+                fence = None
+        elif fence is None and ("](" in line or "]:" in line or "=" in line):
+            for link_re in _LINK_RES:
+                line = link_re.sub(replace, line)
+        lines.append(line)
+    return "".join(lines)
+
+
+def _flatten_toc(items):
+    for item in items:
+        yield item
+        yield from _flatten_toc(item.children)
+
+
+def build_sections(markdown, toc):
+    """Return the h2-h4 outline of a page's markdown.
+
+    Headings are matched in document order with the table of contents entries
+    of the same level, which supply the displayed title and the anchor.
+    Headings inside fenced code blocks are ignored, and a section ends at the
+    next heading of the same or a higher level.
+    """
+    headings = []  # [level, title, offset]
+    fence = None
+    offset = 0
+    for line in markdown.splitlines(keepends=True):
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker[0] * 3
+            elif marker.startswith(fence):
+                fence = None
+        elif fence is None:
+            match = _HEADING_RE.match(line.rstrip("\r\n"))
+            if match:
+                headings.append([len(match.group(1)), match.group(2), offset])
+        offset += len(line)
+
+    entries = list(_flatten_toc(toc))
+    position = 0
+    sections = []
+    for i, (level, title, start) in enumerate(headings):
+        anchor = ""
+        for j in range(position, len(entries)):
+            if entries[j].level == level:
+                title, anchor = entries[j].title, entries[j].id
+                position = j + 1
+                break
+        if level not in SECTION_LEVELS:
+            continue
+        end = len(markdown)
+        for next_level, _, next_start in headings[i + 1:]:
+            if next_level <= level:
+                end = next_start
+                break
+        sections.append({
+            "title": title,
+            "level": level,
+            "start": start,
+            "end": end,
+            "anchor": anchor,
+        })
+    return sections
+
+
+def site_path(page_url, target):
+    """Resolve a link or image target of a page to a path from the site root.
+
+    Absolute URLs and fragment-only targets are returned unchanged.
+    """
+    if not target or target.startswith("#") or urlsplit(target).scheme or target.startswith("//"):
+        return target
+    path, sep, rest = target.partition("#")
+    path, qsep, query = path.partition("?")
+    if path.startswith("/"):
+        resolved = path
+    else:
+        resolved = posixpath.join(posixpath.dirname(page_url), path)
+    resolved = posixpath.normpath(resolved).lstrip("/")
+    if resolved == ".":
+        resolved = ""
+    elif path.endswith("/"):
+        resolved += "/"
+    return resolved + qsep + query + sep + rest
+
+
+def _strip_join(parts):
+    """Join text nodes as BeautifulSoup's get_text(strip=True) does."""
+    return "".join(part.strip() for part in parts if part.strip())
+
+
+class _Element:
+    """An open element, as the diagram parser tracks it."""
+
+    __slots__ = ("tag", "diagrams", "caption", "has_caption", "sibling_diagrams", "capture")
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.diagrams = []  # the diagrams it is the parent of
+        self.caption = None  # text of its first caption descendant, once that has closed
+        self.has_caption = False  # whether a caption descendant has started
+        self.sibling_diagrams = []  # diagrams waiting for its next p, em or center child
+        self.capture = None  # [text parts, elements it is the caption of, sibling diagrams]
+
+
+class _DiagramParser(HTMLParser):
+    """Collect the diagrams of a rendered page with the server's extract_diagrams rules.
+
+    A diagram's context is the text of the first figcaption, em, center or p
+    inside the image's parent, before or after the image. A div or figure
+    parent without one takes the text of its next p, em or center sibling,
+    cut to 200 characters. The section is the last h1-h4 before the image.
+    Text is joined as BeautifulSoup's get_text(strip=True) joins it.
+    """
+
+    def __init__(self, page_url):
+        super().__init__(convert_charrefs=True)
+        self.page_url = page_url
+        self.diagrams = []
+        # The document itself is the parent of top-level images
+        self._stack = [_Element("[document]")]
+        self._heading = None  # [text parts, id] of the heading being read
+        self._section, self._anchor = "", ""
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "img":
+            self._image(attrs)
+            return
+        if tag in _VOID_TAGS:
+            return
+        if tag in _HEADING_TAGS:
+            self._heading = [[], attrs.get("id") or ""]
+        element = _Element(tag)
+        if tag in _CAPTION_TAGS:
+            owners = [open_element for open_element in self._stack if not open_element.has_caption]
+            for owner in owners:
+                owner.has_caption = True
+            parent = self._stack[-1]
+            siblings = []
+            if tag != "figcaption" and parent.sibling_diagrams:
+                siblings, parent.sibling_diagrams = parent.sibling_diagrams, []
+            if owners or siblings:
+                element.capture = [[], owners, siblings]
+        self._stack.append(element)
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS or all(element.tag != tag for element in self._stack[1:]):
+            return
+        if self._heading is not None and tag in _HEADING_TAGS:
+            self._section = _strip_join(self._heading[0]).replace("\u00b6", "").strip()
+            self._anchor = self._heading[1]
+            self._heading = None
+        while True:
+            element = self._stack.pop()
+            self._close(element)
+            if element.tag == tag:
+                break
+
+    def _close(self, element):
+        if element.capture is not None:
+            parts, owners, siblings = element.capture
+            text = _strip_join(parts)
+            for owner in owners:
+                owner.caption = text
+                for diagram in owner.diagrams:
+                    diagram["context"] = text
+            for diagram in siblings:
+                diagram["context"] = text[:200]
+        if element.tag in ("div", "figure") and not element.has_caption and element.diagrams:
+            self._stack[-1].sibling_diagrams.extend(element.diagrams)
+
+    def handle_data(self, data):
+        if self._heading is not None:
+            self._heading[0].append(data)
+        for element in self._stack:
+            if element.capture is not None:
+                element.capture[0].append(data)
+
+    def _image(self, attrs):
+        src, alt = attrs.get("src") or "", attrs.get("alt") or ""
+        if not src or not alt or any(word in alt.lower() for word in _SKIP_ALT_WORDS):
+            return
+        width = attrs.get("width") or ""
+        if width.isdigit() and int(width) < MIN_DIAGRAM_WIDTH:
+            return
+        parent = self._stack[-1]
+        diagram = {
+            "title": alt,
+            "image_url": site_path(self.page_url, src),
+            "context": parent.caption or "",
+            "section": self._section,
+            "anchor": self._anchor,
+        }
+        self.diagrams.append(diagram)
+        parent.diagrams.append(diagram)
+
+
+def _strip_join(parts):
+    """Join text nodes as BeautifulSoup's get_text(strip=True) does."""
+    return "".join(part.strip() for part in parts if part.strip())
+
+
+def extract_diagrams(html, page_url):
+    """Return the diagrams of a page's rendered HTML (see _DiagramParser)."""
+    parser = _DiagramParser(page_url)
+    parser.feed(html)
+    parser.close()
+    return parser.diagrams
+
+
+def nav_outline(items, depth=0):
+    """Return the outline of MkDocs navigation items: [depth, title, url] in nav order."""
+    outline = []
+    for item in items:
+        if item.is_section:
+            children = list(item.children)
+            url = None
+            if children and children[0].is_page and children[0].is_index:
+                url = children.pop(0).url
+            outline.append([depth, item.title, url])
+            outline.extend(nav_outline(children, depth + 1))
+        elif not (item.is_page and item.is_homepage):
+            outline.append([depth, item.title or "", item.url])
+    return outline
+
+
+def _member_path(key):
+    return f"{PACK_DIR}/pages/{key or 'index'}.json"
+
+
+def on_pre_build(config, **kwargs):
+    _pages.clear()
+    _diagrams.clear()
+    _nav.clear()
+
+
+def on_nav(nav, config, files, **kwargs):
+    _nav.append(nav)
+    return nav
+
+
+def on_page_content(html, page, config, files, **kwargs):
+    # page.markdown is the source after on_page_markdown (macros) and page.toc
+    # holds the heading ids of the rendered HTML
+    key = page_key(page.url)
+    diagrams = extract_diagrams(html or "", page.url)
+    if diagrams:
+        _diagrams[key] = {"url": page.url, "title": page.title or "", "diagrams": diagrams}
+    markdown = clean_markdown(page.markdown or "")
+    if not markdown.strip():
+        return html
+    page_file = getattr(page, "file", None)
+    markdown = absolute_links(
+        markdown,
+        page.url,
+        page_file.src_uri if page_file is not None else None,
+        files,
+        config.get("site_url") or "",
+    )
+    _pages[key] = {
+        "url": page.url,
+        "title": page.title or "",
+        "markdown": markdown,
+        "sections": build_sections(markdown, page.toc),
+    }
+    return html
+
+
+def on_post_build(config, **kwargs):
+    site_dir = config["site_dir"]
+    index = {}
+    build = hashlib.sha256()
+    for key in sorted(_pages):
+        page = _pages[key]
+        data = json.dumps(page, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        build.update(digest.encode("ascii"))
+        member = _member_path(key)
+        target = os.path.join(site_dir, *member.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(data)
+        index[key] = {
+            "url": page["url"],
+            "title": page["title"],
+            "file": member,
+            "digest": digest,
+        }
+
+    build = build.hexdigest()[:16]
+    outline = nav_outline(_nav[-1].items) if _nav else []
+    os.makedirs(os.path.join(site_dir, PACK_DIR), exist_ok=True)
+    for name, key, content in (
+        ("index.json", "pages", index),
+        ("diagrams.json", "pages", _diagrams),
+        ("nav.json", "nav", outline),
+    ):
+        with open(os.path.join(site_dir, PACK_DIR, name), "w", encoding="utf-8") as f:
+            json.dump(
+                {"format": PACK_FORMAT, "build": build, key: content},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+    diagram_count = sum(len(page["diagrams"]) for page in _diagrams.values())
+    log.info(f"Content pack: {len(index)} pages, {diagram_count} diagrams -> {PACK_DIR}/")
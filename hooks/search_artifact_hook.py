@@ -0,0 +1,141 @@
+# hooks/search_artifact_hook.py
+"""Emit a pre-tokenized search index for the MCP server.
+
+The MCP server (mcp-server/) builds its search index from
+search/search_index.json on every start: it merges the per-heading entries
+into pages, tokenizes every page and counts document frequencies. This hook
+does that work once per site build and writes the result next to the MkDocs
+index as search/atlas_search.json:
+
+- docs: location, title, text, token count and facets (content level and
+  top-level section) of every page
+- vocabulary and postings: the documents and term frequencies of each token
+- stats: document count and average length, for BM25
+- sections: the heading outline of every page, as offsets into its text
+
+The merging and tokenization rules must match the server's search_index.py;
+ARTIFACT_FORMAT and TOKEN_PATTERN let the server reject an artifact built
+with different rules and fall back to search_index.json.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import Counter
+
+log = logging.getLogger("mkdocs.hooks.search_artifact")
+
+ARTIFACT_FORMAT = 1
+ARTIFACT_PATH = os.path.join("search", "atlas_search.json")
+TOKEN_PATTERN = r"[a-z0-9]+"
+TITLE_WEIGHT = 2
+
+_CONTENT_LEVEL_RE = re.compile(r"Content Level:\s*(\d+)", re.IGNORECASE)
+
+
+def _tokenize(text):
+    return re.findall(TOKEN_PATTERN, text.lower())
+
+
+def _merge_pages(entries):
+    """Group search_index.json entries into pages, as the server does.
+
+    Returns [title, parts, headings] per page location, where headings are
+    (anchor, title, part number) of the heading entries. MkDocs writes a
+    page's own entry before its headings, so a page is never restarted.
+    """
+    pages = {}
+    for entry in entries:
+        location = entry.get("location", "")
+        title = entry.get("title", "")
+        text = entry.get("text", "")
+        if not location or not title or title == "Home":
+            continue
+        base, _, anchor = location.partition("#")
+        if base not in pages or not anchor:
+            pages[base] = [title, [], []]
+        page = pages[base]
+        if anchor:
+            page[2].append((anchor, title, len(page[1])))
+        page[1].append(text)
+    return pages
+
+
+def _facets(location, text):
+    level = _CONTENT_LEVEL_RE.search(text)
+    parts = location.split("/")
+    section = parts[1] if len(parts) > 2 and parts[0] == "topics" else None
+    return {"level": int(level.group(1)) if level else None, "section": section}
+
+
+def build_artifact(search_index):
+    """Build the artifact from a parsed search_index.json."""
+    docs, sections = [], []
+    postings = {}
+    total_length = 0
+    pages = _merge_pages(search_index.get("docs", []))
+    for doc_id, (location, (title, parts, headings)) in enumerate(pages.items()):
+        text = " ".join(parts)
+        tokens = _tokenize(" ".join([title] * TITLE_WEIGHT + [text]))
+        total_length += len(tokens)
+        for token, count in Counter(tokens).items():
+            postings.setdefault(token, []).extend((doc_id, count))
+
+        # Offsets of each part within the joined text
+        offsets, position = [], 0
+        for part in parts:
+            offsets.append(position)
+            position += len(part) + 1
+        for anchor, heading, part in headings:
+            start = offsets[part]
+            sections.append([doc_id, anchor, heading, start, start + len(parts[part])])
+
+        docs.append({
+            "location": location,
+            "title": title,
+            "text": text,
+            "length": len(tokens),
+            **_facets(location, text),
+        })
+
+    vocabulary = sorted(postings)
+    return {
+        "format": ARTIFACT_FORMAT,
+        "tokenizer": {"pattern": TOKEN_PATTERN, "title_weight": TITLE_WEIGHT},
+        "docs": docs,
+        "vocabulary": vocabulary,
+        "postings": [postings[token] for token in vocabulary],
+        "stats": {
+            "num_docs": len(docs),
+            "avg_doc_len": total_length / len(docs) if docs else 0,
+        },
+        "sections": sections,
+    }
+
+
+def on_post_build(config, **kwargs):
+    """Write search/atlas_search.json from the search/search_index.json of this build.
+
+    Hooks run after the search plugin has written search_index.json.
+    """
+    site_dir = config["site_dir"]
+    source = os.path.join(site_dir, "search", "search_index.json")
+    if not os.path.exists(source):
+        log.warning("search/search_index.json not found; no search artifact written")
+        return
+
+    with open(source, "rb") as f:
+        raw = f.read()
+    artifact = build_artifact(json.loads(raw))
+    # Versioned with the build: the digest of the index it was derived from
+    artifact["build"] = hashlib.sha256(raw).hexdigest()[:16]
+
+    target = os.path.join(site_dir, ARTIFACT_PATH)
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+    log.info(
+        f"Search artifact: {len(artifact['docs'])} pages, "
+        f"{len(artifact['vocabulary'])} terms -> {ARTIFACT_PATH}"
+    )
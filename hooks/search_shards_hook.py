@@ -0,0 +1,152 @@
+# hooks/search_shards_hook.py
+"""Split the search artifact into shards that clients fetch on demand.
+
+search/search_index.json and search/atlas_search.json hold the full text of
+every page, so a client downloads all of it before it can answer one query.
+Most of that is page text, which a query only needs for the snippets of its
+top results. This hook splits search/atlas_search.json (written by
+search_artifact_hook.py, which must run first) into search/shards/:
+
+- manifest.json: format, build, tokenizer, stats, every page's location,
+  title, length, facets and docs shard, and the shard files
+- terms/<c>.json: {token: postings} for the tokens starting with character c
+- docs/<n>.json: {"start": first doc id, "texts": [...], "sections": [...]}
+  for a run of consecutive pages; section offsets index into their text
+
+A query fetches the manifest, the terms shard of each query token and the
+docs shards of the results it shows. Every file is also written gzip
+compressed (.gz) and, when the brotli package is installed, brotli
+compressed (.br), for hosts that serve precompressed files.
+"""
+
+import gzip
+import json
+import logging
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+log = logging.getLogger("mkdocs.hooks.search_shards")
+
+SHARDS_FORMAT = 1
+SHARDS_DIR = os.path.join("search", "shards")
+# Page text per docs shard, in characters; a longer page gets a shard to itself
+DOCS_SHARD_CHARS = 64 * 1024
+
+
+def _shard_docs(docs):
+    """Group consecutive doc ids into runs of about DOCS_SHARD_CHARS of text."""
+    runs, run, size = [], [], 0
+    for doc_id, doc in enumerate(docs):
+        if run and size + len(doc["text"]) > DOCS_SHARD_CHARS:
+            runs.append(run)
+            run, size = [], 0
+        run.append(doc_id)
+        size += len(doc["text"])
+    if run:
+        runs.append(run)
+    return runs
+
+
+def build_shards(artifact):
+    """Split a parsed search artifact into the manifest and shard files.
+
+    Returns:
+        (manifest, files), where files maps paths relative to SHARDS_DIR to
+        their JSON content.
+    """
+    files = {}
+
+    terms = {}
+    for token, postings in zip(artifact["vocabulary"], artifact["postings"]):
+        terms.setdefault(token[0], {})[token] = postings
+    for initial, shard in terms.items():
+        files[f"terms/{initial}.json"] = shard
+
+    docs = artifact["docs"]
+    sections = {}
+    for doc_id, anchor, title, start, end in artifact["sections"]:
+        sections.setdefault(doc_id, []).append([doc_id, anchor, title, start, end])
+    doc_shard = {}
+    for number, run in enumerate(_shard_docs(docs)):
+        files[f"docs/{number}.json"] = {
+            "start": run[0],
+            "texts": [docs[doc_id]["text"] for doc_id in run],
+            "sections": [s for doc_id in run for s in sections.get(doc_id, [])],
+        }
+        for doc_id in run:
+            doc_shard[doc_id] = number
+
+    manifest = {
+        "format": SHARDS_FORMAT,
+        "build": artifact.get("build"),
+        "tokenizer": artifact["tokenizer"],
+        "stats": artifact["stats"],
+        "docs": [
+            {
+                **{key: value for key, value in doc.items() if key != "text"},
+                "shard": doc_shard[doc_id],
+            }
+            for doc_id, doc in enumerate(docs)
+        ],
+        "terms": sorted(terms),
+        "doc_shards": len(set(doc_shard.values())),
+        "encodings": ["gzip", "br"] if brotli is not None else ["gzip"],
+    }
+    return manifest, files
+
+
+def _write(path, content):
+    data = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    # mtime=0 keeps the compressed files identical between builds of the same index
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data))
+    return len(data)
+
+
+def _artifact_hook_configured(config):
+    # config["hooks"] lists (or, once validated, maps) hook paths as written in mkdocs.yml
+    return any(
+        os.path.basename(name) == "search_artifact_hook.py" for name in config.get("hooks") or ()
+    )
+
+
+def on_post_build(config, **kwargs):
+    """Write search/shards/ from the search/atlas_search.json of this build.
+
+    Hooks run in the order mkdocs.yml lists them, so search_artifact_hook.py
+    has written the artifact by now. A missing artifact is an error when that
+    hook is configured (it failed, or is listed after this one), and only a
+    warning when the site does not build the artifact at all.
+    """
+    site_dir = config["site_dir"]
+    source = os.path.join(site_dir, "search", "atlas_search.json")
+    if not os.path.exists(source):
+        if _artifact_hook_configured(config):
+            log.error("search/atlas_search.json was not written; no search shards written")
+        else:
+            log.warning("search/atlas_search.json not found; no search shards written")
+        return
+
+    with open(source, encoding="utf-8") as f:
+        manifest, files = build_shards(json.load(f))
+
+    target = os.path.join(site_dir, SHARDS_DIR)
+    total = 0
+    for name, content in files.items():
+        total += _write(os.path.join(target, *name.split("/")), content)
+    manifest_size = _write(os.path.join(target, "manifest.json"), manifest)
+    log.info(
+        f"Search shards: {len(manifest['terms'])} terms shards, "
+        f"{manifest['doc_shards']} docs shards ({total} bytes), "
+        f"manifest {manifest_size} bytes -> {SHARDS_DIR}"
+    )
@@ -0,0 +1,116 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Throughput benchmark for HTML-to-markdown conversion on real Atlas pages.
+
+Compares the single-pass converter (``html_to_markdown``), once per installed
+parser backend, with the previous approach — parse the whole page with
+``html.parser``, serialize the content subtree, and let markdownify parse it
+again — and checks they all produce the same markdown.
+
+Pages come from a local MkDocs build or are fetched from the deployed site:
+
+    uv run python benchmarks/convert_throughput.py --site-dir ../site
+    uv run python benchmarks/convert_throughput.py --pages 30
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import markdownify
+
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.utils.fetcher import close_client, fetch_urls_concurrent
+from genai_atlas_mcp_server.utils.html_converter import (
+    _MARKDOWN_OPTIONS,
+    PARSER_BACKENDS,
+    _backend_available,
+    html_to_markdown,
+    select_main_content,
+)
+from genai_atlas_mcp_server.utils.search_index import get_search_index
+
+
+def two_pass_markdown(html: str) -> str:
+    """The previous conversion: full parse, serialize, markdownify re-parse."""
+    from bs4 import BeautifulSoup
+
+    main_content = select_main_content(BeautifulSoup(html, 'html.parser'))
+    content = markdownify.markdownify(str(main_content), **_MARKDOWN_OPTIONS)
+    return content.strip() if content else ''
+
+
+def load_local_pages(site_dir: Path, limit: int) -> List[str]:
+    """Read topic pages from a local site build."""
+    paths = sorted(site_dir.glob('topics/**/*.html'))[:limit]
+    return [path.read_text(encoding='utf-8') for path in paths]
+
+
+async def fetch_pages(limit: int) -> List[str]:
+    """Fetch topic pages from the deployed site."""
+    index = get_search_index()
+    await index.ensure_loaded()
+    urls = [doc.url for doc in index.get_all_docs()][:limit]
+    pages = await fetch_urls_concurrent(urls, max_concurrent=config.max_concurrent_fetches)
+    await close_client()
+    return [page for page in pages if page]
+
+
+def bench(name: str, convert: Callable[[str], str], pages: List[str], rounds: int) -> float:
+    """Time ``convert`` over all pages and print pages per second."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for html in pages:
+            convert(html)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(
+        f'{name:<12} {len(pages) / best:8.1f} pages/s '
+        f'(best of {rounds}, median {statistics.median(timings):.2f}s)'
+    )
+    return best
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--site-dir', type=Path, help='Local MkDocs site/ build to read')
+    parser.add_argument('--pages', type=int, default=50, help='Number of pages (default: 50)')
+    parser.add_argument('--rounds', type=int, default=3, help='Timing rounds (default: 3)')
+    args = parser.parse_args()
+
+    if args.site_dir:
+        pages = load_local_pages(args.site_dir, args.pages)
+    else:
+        pages = asyncio.run(fetch_pages(args.pages))
+    if not pages:
+        print('No pages to convert', file=sys.stderr)
+        return 1
+
+    print(f'{len(pages)} pages, {sum(map(len, pages)) // len(pages)} bytes on average')
+    reference = [two_pass_markdown(html) for html in pages]
+    before = bench('two-pass', two_pass_markdown, pages, args.rounds)
+
+    mismatches = 0
+    for backend in PARSER_BACKENDS:
+        if not _backend_available(backend):
+            print(f'{backend:<12} not installed')
+            continue
+        config.html_parser = backend
+        backend_mismatches = sum(
+            html_to_markdown(html) != expected for html, expected in zip(pages, reference)
+        )
+        mismatches += backend_mismatches
+        after = bench(backend, html_to_markdown, pages, args.rounds)
+        print(f'{"":<12} {before / after:8.1f}x, {backend_mismatches} output mismatches')
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,8 @@
 """Configuration settings for the GenAI Atlas MCP Server."""
 
 import os
+from typing import Optional
+from urllib.parse import unquote, urlparse
 
 from pydantic import BaseModel, Field
 
@@ -14,20 +16,107 @@ ATLAS_BASE_URL = os.getenv(
     'ATLAS_BASE_URL', 'https://awslabs.github.io/generative-ai-atlas'
 )
 
+# Local MkDocs build directory (site/) to read content from instead of the network.
+# A file:// ATLAS_BASE_URL implies serving everything from that directory.
+ATLAS_SITE_DIR = os.getenv('ATLAS_SITE_DIR') or (
+    unquote(urlparse(ATLAS_BASE_URL).path) if ATLAS_BASE_URL.startswith('file://') else None
+)
+
+# Snapshot archive to serve page content from (see `genai-atlas-mcp-server snapshot`)
+ATLAS_SNAPSHOT = os.getenv('ATLAS_SNAPSHOT')
+
+# Start-up warm-up (opt-in, it downloads both indexes on every launch): load them in the
+# background, optionally prefetch N topic pages
+ATLAS_WARMUP = os.getenv('ATLAS_WARMUP', 'false').lower() not in ('0', 'false', 'no')
+ATLAS_WARMUP_PREFETCH = int(os.getenv('ATLAS_WARMUP_PREFETCH', '0'))
+
+# Seconds between sitemap.xml polls for changed pages (0, the default, disables them)
+ATLAS_CHANGE_POLL_INTERVAL = float(os.getenv('ATLAS_CHANGE_POLL_INTERVAL', '0'))
+
+# Seconds a fetched page is served without revalidation
+ATLAS_PAGE_TTL = float(os.getenv('ATLAS_PAGE_TTL', '3600'))
+
+# Seconds a tool waits on the origin before answering from a stale copy (0 waits for the timeout)
+ATLAS_TOOL_DEADLINE = float(os.getenv('ATLAS_TOOL_DEADLINE', '10'))
+
+# HTTP client: HTTP/2 (when the h2 package is installed) and connection pool sizing
+ATLAS_HTTP2 = os.getenv('ATLAS_HTTP2', 'true').lower() not in ('0', 'false', 'no')
+ATLAS_MAX_CONNECTIONS = int(os.getenv('ATLAS_MAX_CONNECTIONS', '10'))
+ATLAS_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('ATLAS_MAX_KEEPALIVE_CONNECTIONS', '5'))
+ATLAS_KEEPALIVE_EXPIRY = float(os.getenv('ATLAS_KEEPALIVE_EXPIRY', '60'))
+
+# BeautifulSoup tree builder: auto (lxml when installed), lxml or html.parser
+ATLAS_HTML_PARSER = os.getenv('ATLAS_HTML_PARSER', 'auto')
+
+# Page conversion worker pool: thread or process workers (0 converts on the event loop)
+ATLAS_CONVERT_WORKERS = int(os.getenv('ATLAS_CONVERT_WORKERS', str(min(4, os.cpu_count() or 1))))
+ATLAS_CONVERT_EXECUTOR = os.getenv('ATLAS_CONVERT_EXECUTOR', 'thread')
+ATLAS_CONVERT_QUEUE = int(os.getenv('ATLAS_CONVERT_QUEUE', '32'))
+
+# Event-loop lag sampling interval and warning threshold in seconds (0 interval disables)
+ATLAS_LOOP_LAG_INTERVAL = float(os.getenv('ATLAS_LOOP_LAG_INTERVAL', '1'))
+ATLAS_LOOP_LAG_WARN = float(os.getenv('ATLAS_LOOP_LAG_WARN', '0.25'))
+
+# Read image headers to report diagram format, dimensions and size
+ATLAS_IMAGE_PROBE = os.getenv('ATLAS_IMAGE_PROBE', 'true').lower() not in ('0', 'false', 'no')
+
+# Finished search_atlas, get_reference_example and list_topics responses kept (0 disables)
+ATLAS_RESPONSE_CACHE_SIZE = int(os.getenv('ATLAS_RESPONSE_CACHE_SIZE', '256'))
+
+# Serve page content from one download of llms-full.txt instead of fetching each page.
+# Off by default: pages are told apart in it by their h1 headings, which is a heuristic
+ATLAS_CORPUS = os.getenv('ATLAS_CORPUS', 'false').lower() not in ('0', 'false', 'no')
+
+# Serve page content from the build-time content pack (hooks/content_pack_hook.py) when present
+ATLAS_CONTENT_PACK = os.getenv('ATLAS_CONTENT_PACK', 'true').lower() not in ('0', 'false', 'no')
+
 # URLs for data sources
 ATLAS_SEARCH_INDEX_URL = f'{ATLAS_BASE_URL}/search/search_index.json'
+ATLAS_SEARCH_ARTIFACT_URL = f'{ATLAS_BASE_URL}/search/atlas_search.json'
 ATLAS_LLMS_TXT_URL = f'{ATLAS_BASE_URL}/llms.txt'
+ATLAS_LLMS_FULL_TXT_URL = f'{ATLAS_BASE_URL}/llms-full.txt'
+ATLAS_CONTENT_PACK_URL = f'{ATLAS_BASE_URL}/content-pack/index.json'
+ATLAS_SITEMAP_URL = f'{ATLAS_BASE_URL}/sitemap.xml'
 
 
 class Config(BaseModel):
     """Configuration settings for the MCP server."""
 
     base_url: str = Field(default=ATLAS_BASE_URL)
+    site_dir: Optional[str] = Field(default=ATLAS_SITE_DIR)
+    snapshot_path: Optional[str] = Field(default=ATLAS_SNAPSHOT)
     search_index_url: str = Field(default=ATLAS_SEARCH_INDEX_URL)
+    search_artifact_url: str = Field(default=ATLAS_SEARCH_ARTIFACT_URL)
     llms_txt_url: str = Field(default=ATLAS_LLMS_TXT_URL)
+    llms_full_txt_url: str = Field(default=ATLAS_LLMS_FULL_TXT_URL)
+    content_pack_url: str = Field(default=ATLAS_CONTENT_PACK_URL)
+    sitemap_url: str = Field(default=ATLAS_SITEMAP_URL)
     timeout: float = Field(default=30.0)
     user_agent: str = Field(default=f'genai-atlas-mcp/{__version__}')
     max_concurrent_fetches: int = Field(default=5)
+    http2: bool = Field(default=ATLAS_HTTP2)
+    max_connections: int = Field(default=ATLAS_MAX_CONNECTIONS)
+    max_keepalive_connections: int = Field(default=ATLAS_MAX_KEEPALIVE_CONNECTIONS)
+    keepalive_expiry: float = Field(default=ATLAS_KEEPALIVE_EXPIRY)
+    max_response_bytes: int = Field(default=20 * 1024 * 1024)
+    page_cache_size: int = Field(default=256)
+    page_cache_bytes: int = Field(default=16 * 1024 * 1024)
+    html_parser: str = Field(default=ATLAS_HTML_PARSER)
+    convert_workers: int = Field(default=ATLAS_CONVERT_WORKERS)
+    convert_executor: str = Field(default=ATLAS_CONVERT_EXECUTOR)
+    convert_queue: int = Field(default=ATLAS_CONVERT_QUEUE)
+    loop_lag_interval: float = Field(default=ATLAS_LOOP_LAG_INTERVAL)
+    loop_lag_warn: float = Field(default=ATLAS_LOOP_LAG_WARN)
+    image_probe: bool = Field(default=ATLAS_IMAGE_PROBE)
+    corpus: bool = Field(default=ATLAS_CORPUS)
+    content_pack: bool = Field(default=ATLAS_CONTENT_PACK)
+    content_cache_size: int = Field(default=64)
+    response_cache_size: int = Field(default=ATLAS_RESPONSE_CACHE_SIZE)
+    page_ttl: float = Field(default=ATLAS_PAGE_TTL)
+    tool_deadline: float = Field(default=ATLAS_TOOL_DEADLINE)
+    warmup: bool = Field(default=ATLAS_WARMUP)
+    warmup_prefetch: int = Field(default=ATLAS_WARMUP_PREFETCH)
+    change_poll_interval: float = Field(default=ATLAS_CHANGE_POLL_INTERVAL)
 
 
 config = Config()
@@ -3,7 +3,7 @@
 
 """Data models for the GenAI Atlas MCP Server."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -33,11 +33,65 @@ class TopicEntry(BaseModel):
     section: Optional[str] = None
 
 
+class TopicNode(BaseModel):
+    """A node of the Atlas topic tree.
+
+    ``id`` is derived from the page path, so it is stable across reloads.
+    Group nodes without a page of their own have no ``url``. ``breadcrumbs``
+    holds the titles of the node's ancestors, outermost first.
+    """
+
+    id: str
+    title: str
+    url: Optional[str] = None
+    section: Optional[str] = None
+    parent: Optional[str] = None
+    depth: int = 0
+    breadcrumbs: List[str] = []
+    children: List[str] = []
+
+
 class DiagramEntry(BaseModel):
-    """A diagram reference found in Atlas content."""
+    """A diagram reference found in Atlas content.
+
+    ``format``, ``width``, ``height`` and ``bytes`` describe the image file;
+    they are empty until the image header has been probed.
+    """
 
     title: str
     image_url: str
     context: str
     page_title: str
     page_url: str
+    section: str = ''
+    anchor: str = ''
+    format: str = ''
+    width: Optional[int] = None
+    height: Optional[int] = None
+    bytes: Optional[int] = None
+
+
+class PageSection(BaseModel):
+    """A heading in a converted page and the span of markdown it covers.
+
+    ``start`` and ``end`` are character offsets into the page markdown, ``key``
+    is the title as normalized for matching, and ``anchor`` is the heading's
+    id on the page (the URL fragment that links to it).
+    """
+
+    title: str
+    level: int
+    start: int
+    end: int
+    key: str = ''
+    anchor: str = ''
+
+
+class PageContent(BaseModel):
+    """An Atlas page converted to markdown, with its section outline and diagrams."""
+
+    url: str
+    title: str = ''
+    markdown: str
+    sections: List[PageSection] = []
+    diagrams: List[Dict[str, str]] = []
@@ -3,6 +3,8 @@
 
 """Generative AI Atlas MCP Server implementation."""
 
+import argparse
+import asyncio
 import os
 import sys
 from collections.abc import AsyncIterator
@@ -11,13 +13,24 @@ from contextlib import asynccontextmanager
 from loguru import logger
 from mcp.server.fastmcp import FastMCP
 
+from .config import config
+from .tools.collect_sections import collect_sections
 from .tools.get_reference_example import get_reference_example
 from .tools.list_diagrams import list_diagrams
+from .tools.list_sections import list_sections
 from .tools.list_topics import list_topics
 from .tools.read_sections import read_sections
 from .tools.read_topic import read_topic
 from .tools.search import search_atlas
+from .utils.change_detector import get_change_detector
 from .utils.fetcher import close_client
+from .utils.loop_lag import get_loop_lag_monitor
+from .utils.response_cache import cached_tool
+from .utils.search_index import get_search_index
+from .utils.snapshot import build_snapshot
+from .utils.topic_index import get_topic_index
+from .utils.warmup import warm_up
+from .utils.workers import close_worker_pool
 
 # Configure logging
 logger.remove()
@@ -39,10 +52,15 @@ GenAI implementation.
   pattern, or technique. Start here when you don't know which page to read.
 - **read_topic**: When you have a specific URL and need the full page content.
   Supports pagination for long documents.
+- **list_sections**: When you want to see which sections a page has before reading
+  them. Returns the heading outline with anchors and section sizes, but no content.
 - **read_sections**: When you need specific sections from a page (e.g., "TL;DR",
   "Architecture"). More token-efficient than reading the full page.
+- **collect_sections**: When you need the same section (e.g., "TL;DR") from many
+  topics at once — every topic matching a query or a topic section, in one call.
 - **list_topics**: When you want to browse what's available, optionally filtered
-  by section (fundamentals, architecture, examples, etc.).
+  by section (fundamentals, architecture, examples, etc.). Browse the tree one
+  level at a time with depth=1 and a topic id as subtree; those results are paged.
 - **get_reference_example**: When you need architecture patterns or industry-specific
   reference implementations. Filters to architecture and example content.
 - **list_diagrams**: When you need visual architecture or flow diagrams. Returns
@@ -53,17 +71,51 @@ GenAI implementation.
 - Start with search_atlas to find relevant topics, then use read_topic or
   read_sections to get detailed content.
 - Use read_sections with "TL;DR" to get quick summaries before reading full topics.
+- Use list_sections to find a page's exact section titles instead of guessing them.
+- To compare or summarize several topics, use collect_sections with "TL;DR" rather
+  than calling read_sections once per page.
 - For long documents, use pagination (start_index) rather than fetching everything.
 - Always cite the Atlas URL when providing information to users.
 - Use list_topics to discover content areas you might not know about.
 """
 
+
+async def _run_warm_up() -> None:
+    """Run warm-up in the background, logging rather than raising failures."""
+    try:
+        await warm_up(prefetch=config.warmup_prefetch)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f'Warm-up failed; indexes will load on first use: {e}')
+
+
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
-    """Manage server lifecycle — clean up HTTP client on shutdown."""
+    """Manage server lifecycle — start background tasks, clean up HTTP client on shutdown."""
+    # Runs in the background so the MCP handshake is never blocked on the network
+    tasks = []
+    if config.warmup:
+        tasks.append(asyncio.create_task(_run_warm_up()))
+    if config.change_poll_interval > 0:
+        tasks.append(
+            asyncio.create_task(get_change_detector().run(config.change_poll_interval))
+        )
+    if config.loop_lag_interval > 0:
+        tasks.append(asyncio.create_task(get_loop_lag_monitor().run()))
     try:
         yield
     finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if config.loop_lag_interval > 0:
+            logger.info(f'Event loop lag: {get_loop_lag_monitor().stats()}')
+        close_worker_pool()
         await close_client()
 
 
@@ -80,17 +132,60 @@ mcp = FastMCP(
     ],
 )
 
-# Register all tools
-mcp.tool()(search_atlas)
+# Register all tools; responses computed from the in-memory indexes alone are cached
+mcp.tool()(cached_tool(search_atlas, lambda: get_search_index().version))
 mcp.tool()(read_topic)
+mcp.tool()(list_sections)
 mcp.tool()(read_sections)
-mcp.tool()(list_topics)
-mcp.tool()(get_reference_example)
+mcp.tool()(collect_sections)
+mcp.tool()(cached_tool(list_topics, lambda: get_topic_index().version))
+mcp.tool()(cached_tool(get_reference_example, lambda: get_search_index().version))
 mcp.tool()(list_diagrams)
 
 
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(prog=APP_NAME, description='Generative AI Atlas MCP server')
+    parser.add_argument(
+        '--snapshot',
+        metavar='PATH',
+        help='Serve read_topic, read_sections and list_diagrams from a snapshot archive',
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    snapshot_parser = subparsers.add_parser(
+        'snapshot', help='Crawl the Atlas and write a single-file snapshot archive'
+    )
+    snapshot_parser.add_argument('output', help='Path of the archive to write')
+    snapshot_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=config.max_concurrent_fetches,
+        help='Maximum concurrent page fetches (default: %(default)s)',
+    )
+    return parser.parse_args(argv)
+
+
+async def _run_snapshot(output: str, concurrency: int) -> int:
+    """Build a snapshot and release the HTTP client and conversion workers."""
+    try:
+        return await build_snapshot(output, max_concurrent=concurrency)
+    finally:
+        close_worker_pool()
+        await close_client()
+
+
 def main() -> None:
     """Main entry point for the MCP server."""
+    args = _parse_args()
+
+    if args.command == 'snapshot':
+        count = asyncio.run(_run_snapshot(args.output, max(1, args.concurrency)))
+        print(f'Wrote {count} pages to {args.output}', file=sys.stderr)
+        return
+
+    if args.snapshot:
+        config.snapshot_path = args.snapshot
+
     logger.info(f'Starting {APP_NAME}')
     mcp.run()
 
@@ -0,0 +1,121 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Collect sections tool for the GenAI Atlas MCP Server."""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from ..utils.html_converter import html_to_markdown
+from ..utils.search_index import get_search_index
+from ..utils.section_index import IndexedSection
+from ..utils.topic_index import get_topic_index
+from ..utils.url_utils import page_key
+from ..utils.workers import run_cpu_bound
+
+# Longest section body returned per page
+MAX_SECTION_CHARS = 3000
+
+
+async def collect_sections(
+    heading: str,
+    query: Optional[str] = None,
+    topic_section: Optional[str] = None,
+    max_results: int = 10,
+) -> str:
+    """Read the same section (e.g. "TL;DR") from many Atlas topics in one call.
+
+    Most Atlas topics share a standard structure, so one heading can be read
+    across every topic that matches a search query and/or a topic section,
+    without a read_sections call per page. Answers come from the site's
+    search index; no pages are fetched.
+
+    ## Example Queries
+    - heading="TL;DR", query="RAG" — Summaries of the RAG topics
+    - heading="Making it practical", topic_section="architecture"
+    - heading="Suggested Pre-Reading", query="agents", max_results=5
+
+    Args:
+        heading: Section heading to read, matched like read_sections matches it
+                 (case-insensitive, e.g. "TL;DR", "Architecture").
+        query: Optional search query selecting topics, most relevant first.
+        topic_section: Optional topic section filter, as in list_topics
+                       (e.g. "fundamentals", "architecture", "examples").
+        max_results: Maximum topics to return (default: 10, max: 20).
+
+    Returns:
+        The section from each matching topic, with the topic title and a link
+        to the section.
+    """
+    if not heading or not heading.strip():
+        return 'Error: heading cannot be empty'
+    max_results = max(1, min(max_results, 20))
+
+    index = get_search_index()
+    await index.ensure_loaded()
+    sections = index.sections
+
+    # Candidate pages, most relevant first
+    if query:
+        urls = [r.url for r in index.search(query, max_results=50)]
+    else:
+        urls = sections.pages_with(heading)
+    if topic_section:
+        topic_index = get_topic_index()
+        await topic_index.ensure_loaded()
+        in_section = {page_key(t.url) for t in topic_index.list_topics(section=topic_section)}
+        urls = [url for url in urls if page_key(url) in in_section]
+
+    titles = {page_key(doc.url): doc.title for doc in index.get_all_docs()}
+    # (topic title, section); a heading can repeat within a page
+    matches: List[Tuple[str, IndexedSection]] = []
+    matched_pages = 0
+    missing = 0
+    for url in urls:
+        found = sections.get(url, heading)
+        if not found:
+            missing += 1
+            continue
+        matches.extend((titles.get(page_key(url), url), section) for section in found)
+        matched_pages += 1
+        if matched_pages >= max_results:
+            break
+
+    if not matches:
+        common = ', '.join(
+            f'"{title}" ({count} topics)' for title, count in sections.common_headings(10)
+        )
+        return (
+            f'No matching topics have a "{heading.strip()}" section.\n\n'
+            f'Common section headings: {common}'
+        )
+
+    bodies = await asyncio.gather(*[_section_markdown(section) for _, section in matches])
+    parts = [
+        f'## {title}\n\nSource: {section.url}\n\n{body}'
+        for (title, section), body in zip(matches, bodies)
+    ]
+    result = f'"{matches[0][1].title}" from {matched_pages} Atlas topics:\n\n'
+    result += '\n\n---\n\n'.join(parts)
+    if query and missing:
+        result += (
+            f'\n\n**Note**: {missing} other matching topics have no '
+            f'"{heading.strip()}" section.'
+        )
+    return result
+
+
+async def _section_markdown(section: IndexedSection) -> str:
+    """Return a section body as markdown, truncated to ``MAX_SECTION_CHARS``."""
+    text = section.text
+    if section.is_html:
+        text = await run_cpu_bound(html_to_markdown, text)
+    if not text:
+        return '_This section has no text of its own; see its subsections on the page._'
+    if len(text) > MAX_SECTION_CHARS:
+        text = (
+            text[:MAX_SECTION_CHARS]
+            + f'\n\n... (truncated; use read_sections(url="{section.page_url}", '
+            f'section_titles=["{section.title}"]) for the full section)'
+        )
+    return text
@@ -3,13 +3,21 @@
 
 """List diagrams tool for the GenAI Atlas MCP Server."""
 
+import asyncio
 from typing import Any, Dict, List, Optional
 
 from ..config import config
+from ..utils.diagram_catalog import get_diagram_catalog
 from ..utils.fetcher import fetch_urls_concurrent
-from ..utils.html_converter import extract_diagrams
+from ..utils.html_converter import MIN_DIAGRAM_WIDTH, extract_diagrams
 from ..utils.search_index import get_search_index
-from ..utils.url_utils import resolve_atlas_url
+from ..utils.snapshot import get_snapshot
+from ..utils.url_resolver import get_url_resolver
+from ..utils.url_utils import page_key, resolve_atlas_url
+from ..utils.workers import run_cpu_bound
+
+# Architecture and example pages, which are most likely to have diagrams
+DIAGRAM_SECTIONS = ['3_0_architecture', '6_0_example', '2_3_core']
 
 
 async def list_diagrams(
@@ -22,7 +30,13 @@ async def list_diagrams(
     charts, process illustrations) and returns their titles, image URLs, and
     surrounding context.
 
-    Users can click the image URLs to view the diagrams directly.
+    Users can click the image URLs to view the diagrams directly. Diagrams
+    are looked up in a catalog of every page's diagrams, built on first use.
+    The catalog comes from the snapshot or the site's content pack; on a site
+    without a content pack, the first call fetches every Atlas page (about 180)
+    to build it, and answers from a few pages until that finishes.
+    Each diagram's image format, pixel size and file size are included when
+    known, so clients can choose which to show without downloading them.
 
     ## Example Queries
     - topic="RAG" — Find RAG pipeline diagrams
@@ -36,12 +50,55 @@ async def list_diagrams(
         max_results: Maximum diagrams to return (default: 10, max: 30).
 
     Returns:
-        List of diagram entries with title, image URL, context, and source page.
+        List of diagram entries with title, image URL, context, source page,
+        the section of the page the diagram is in, and the image ``format``,
+        ``width``, ``height`` and ``bytes`` (None where unknown).
     """
     max_results = max(1, min(max_results, 30))
     index = get_search_index()
     await index.ensure_loaded()
 
+    # Past the tool deadline, scan a few pages live while the catalog finishes building
+    deadline = config.tool_deadline if config.tool_deadline > 0 else None
+    catalog = get_diagram_catalog()
+    if await catalog.wait_loaded(deadline):
+        # Extra candidates stand in for images the probe finds too small
+        candidates = max_results * 2 if config.image_probe else max_results
+        if topic:
+            # Diagrams on the topic's most relevant pages rank alongside keyword matches
+            results = index.search(topic, max_results=10)
+            page_scores = {page_key(r.url): 2.0 / (1 + rank) for rank, r in enumerate(results)}
+            entries = catalog.search(topic, candidates, page_scores=page_scores)
+        else:
+            entries = catalog.browse(DIAGRAM_SECTIONS, candidates)
+        if config.image_probe:
+            await catalog.probe_images(entries, deadline)
+            entries = [
+                entry for entry in entries
+                if entry.width is None or entry.width >= MIN_DIAGRAM_WIDTH
+            ]
+        return [
+            {
+                'title': entry.title,
+                'image_url': entry.image_url,
+                'context': entry.context,
+                'page_url': entry.page_url,
+                'page_title': entry.page_title,
+                'section': entry.section,
+                'format': entry.format or None,
+                'width': entry.width,
+                'height': entry.height,
+                'bytes': entry.bytes,
+            }
+            for entry in entries[:max_results]
+        ]
+    return await _scan_pages(topic, max_results)
+
+
+async def _scan_pages(topic: Optional[str], max_results: int) -> List[Dict[str, Any]]:
+    """Fetch a handful of likely pages and extract their diagrams."""
+    index = get_search_index()
+
     # Find relevant pages to scan for diagrams
     if topic:
         results = index.search(topic, max_results=10)
@@ -49,28 +106,50 @@ async def list_diagrams(
     else:
         # Scan architecture and example pages which are most likely to have diagrams
         docs = index.get_all_docs()
-        diagram_sections = ['3_0_architecture', '6_0_example', '2_3_core']
         original_urls = [
             d.url for d in docs
-            if any(s in d.url for s in diagram_sections)
+            if any(s in d.url for s in DIAGRAM_SECTIONS)
         ][:15]
 
-    # Resolve URLs and fetch concurrently
-    resolved_urls = [resolve_atlas_url(u) for u in original_urls]
+    # Answer from the snapshot where possible; fetch only the pages it lacks
+    snapshot = get_snapshot()
+    page_diagrams: Dict[str, List[Dict[str, str]]] = {}
+    if snapshot:
+        for url in original_urls:
+            page = await snapshot.get(url)
+            if page is not None:
+                page_diagrams[url] = page.diagrams
+
+    # Resolve the remaining URLs and fetch concurrently
+    resolver = get_url_resolver()
+    missing_urls = [u for u in original_urls if u not in page_diagrams]
+    resolved_urls = [resolver.lookup(u) or resolve_atlas_url(u) for u in missing_urls]
+    # Past the tool deadline, answer from the pages that did arrive
     html_pages = await fetch_urls_concurrent(
-        resolved_urls, max_concurrent=config.max_concurrent_fetches
+        resolved_urls,
+        max_concurrent=config.max_concurrent_fetches,
+        deadline=config.tool_deadline if config.tool_deadline > 0 else None,
     )
-
+    fetched = [
+        (original_url, resolved_url, html)
+        for original_url, resolved_url, html in zip(missing_urls, resolved_urls, html_pages)
+        if html
+    ]
+    # Parse the fetched pages in the worker pool, off the event loop
+    extracted = await asyncio.gather(*[
+        run_cpu_bound(extract_diagrams, html, resolved_url)
+        for _, resolved_url, html in fetched
+    ])
+    for (original_url, _, _), diagrams in zip(fetched, extracted):
+        page_diagrams[original_url] = diagrams
+
+    titles = {page_key(doc.url): doc.title for doc in index.get_all_docs()}
     all_diagrams: List[Dict[str, Any]] = []
 
-    for original_url, resolved_url, html in zip(original_urls, resolved_urls, html_pages):
+    for original_url in original_urls:
         if len(all_diagrams) >= max_results:
             break
-        if not html:
-            continue
-
-        page_diagrams = extract_diagrams(html, resolved_url)
-        for diag in page_diagrams:
+        for diag in page_diagrams.get(original_url, []):
             if len(all_diagrams) >= max_results:
                 break
             all_diagrams.append({
@@ -78,6 +157,12 @@ async def list_diagrams(
                 'image_url': diag['image_url'],
                 'context': diag['context'],
                 'page_url': original_url,
+                'page_title': titles.get(page_key(original_url), ''),
+                'section': diag.get('section', ''),
+                'format': None,
+                'width': None,
+                'height': None,
+                'bytes': None,
             })
 
     return all_diagrams
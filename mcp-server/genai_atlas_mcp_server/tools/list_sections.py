@@ -0,0 +1,67 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""List sections tool for the GenAI Atlas MCP Server."""
+
+import asyncio
+
+from ..config import config
+from ..utils.content_cache import get_page_content
+from ..utils.fetcher import deadline_error, staleness_note
+from ..utils.url_utils import validate_atlas_url
+
+
+async def list_sections(url: str) -> str:
+    """List the section headings of an Atlas topic without its content.
+
+    Returns the page's h2–h4 outline — heading titles, nesting, anchors and
+    the size of each section — so you can pick sections to pass to
+    read_sections instead of guessing titles or reading the whole page.
+
+    ## Example Usage
+    ```
+    list_sections(url="https://awslabs.github.io/.../2_1_7_rag/2_1_7_rag.html")
+    ```
+
+    Args:
+        url: URL of the Atlas topic page.
+
+    Returns:
+        The page outline, one heading per line, indented by level.
+    """
+    url_str = str(url)
+
+    validation_error = validate_atlas_url(url_str)
+    if validation_error:
+        return validation_error
+
+    try:
+        loaded = await get_page_content(url_str, config.tool_deadline)
+    except asyncio.TimeoutError:
+        return deadline_error(url_str, config.tool_deadline)
+    if loaded is None:
+        return f'Error: Failed to fetch {url_str}'
+    page, stale_age = loaded
+
+    if not page.sections:
+        result = (
+            f'{url_str} does not contain subsections. '
+            'Use read_topic to get the full document.'
+        )
+    else:
+        lines = []
+        for section in page.sections:
+            indent = '  ' * (section.level - 2)
+            anchor = f' — #{section.anchor}' if section.anchor else ''
+            size = section.end - section.start
+            lines.append(f'{indent}- {section.title}{anchor} ({size} chars)')
+        outline = '\n'.join(lines)
+        result = (
+            f'Sections of {url_str} ({len(page.markdown)} chars in total):\n\n{outline}\n\n'
+            f'Use read_sections(url="{url_str}", section_titles=[...]) with titles or '
+            'anchors from this list to read them.'
+        )
+
+    if stale_age is not None:
+        result += staleness_note(stale_age)
+    return result
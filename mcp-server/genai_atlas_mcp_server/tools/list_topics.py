@@ -3,17 +3,29 @@
 
 """List topics tool for the GenAI Atlas MCP Server."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from ..utils.topic_index import get_topic_index
 
 
-async def list_topics(section: Optional[str] = None) -> List[Dict[str, Any]]:
+async def list_topics(
+    section: Optional[str] = None,
+    subtree: Optional[str] = None,
+    depth: Optional[int] = None,
+    offset: int = 0,
+    max_results: Optional[int] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """Browse the Atlas topic hierarchy.
 
-    Returns all available topics from the Generative AI Atlas, optionally
-    filtered by section. Use this to discover what content is available
-    before diving into specific topics.
+    Returns topics from the Generative AI Atlas navigation tree, in site
+    order, optionally filtered by section or limited to one branch. Use this
+    to discover what content is available before diving into specific topics.
+
+    Called with at most a section, it returns the flat list of every
+    matching topic. To browse incrementally instead, start with depth=1 for
+    the top-level areas, then pass a topic's id as subtree (again with
+    depth=1) to open that branch; these results are paged, and each topic
+    carries its breadcrumbs and number of children.
 
     ## Available Sections
     - "fundamentals" — GenAI core concepts, business value, responsible AI
@@ -25,15 +37,82 @@ async def list_topics(section: Optional[str] = None) -> List[Dict[str, Any]]:
     - "resources" or "tools" — AWS services, frameworks, community
     - "isv" — ISV-specific guidance
 
+    ## Example Queries
+    - depth=1 — The top-level areas of the Atlas
+    - subtree="Key Primitives", depth=1 — The topics directly under Key Primitives
+    - section="examples" — Every topic in the examples section
+
     Args:
         section: Optional filter — partial match against section names
-                 (e.g., "rag", "architecture", "examples"). Case-insensitive.
+                 (e.g., "architecture", "examples"). Case-insensitive.
+        subtree: Optional id, URL or exact title of a topic; only the topics
+                 below it are listed.
+        depth: Optional number of levels to list below the subtree (or the
+               top of the tree); 1 lists direct children only.
+        offset: Number of matching topics to skip, for paging (default: 0).
+        max_results: Maximum topics to return per page (default: 50, max: 200).
 
     Returns:
-        List of topics with title, URL, and section classification.
+        With only ``section`` given, a list of topics with title, URL and
+        section. Otherwise ``topics`` (each with id, title, URL, section, depth, parent id,
+        breadcrumbs and number of children), ``total`` matching topics, and
+        ``next_offset`` to pass for the next page (None on the last page).
     """
     index = get_topic_index()
     await index.ensure_loaded()
+    if subtree is None and depth is None and offset == 0 and max_results is None:
+        return [t.model_dump() for t in index.list_topics(section=section)]
+
+    max_results = max(1, min(max_results or 50, 200))
+    offset = max(0, offset)
+    if depth is not None:
+        depth = max(1, depth)
+    tree = index.tree
+
+    root = None
+    if subtree:
+        root = tree.get(subtree)
+        if root is None:
+            match = index.find_topic(subtree)
+            root = tree.get(match.url) if match else None
+        if root is None:
+            return {
+                'error': f'Unknown subtree: {subtree}. Use list_topics(depth=1) to see '
+                'the top-level topics and their ids.',
+                'topics': [],
+                'total': 0,
+                'next_offset': None,
+            }
+
+    nodes = tree.descendants(root, depth)
+    if section:
+        section_lower = section.lower()
+        nodes = [node for node in nodes if node.section and section_lower in node.section.lower()]
 
-    topics = index.list_topics(section=section)
-    return [t.model_dump() for t in topics]
+    page = nodes[offset:offset + max_results]
+    next_offset = offset + len(page)
+    result: Dict[str, Any] = {
+        'topics': [
+            {
+                'id': node.id,
+                'title': node.title,
+                'url': node.url,
+                'section': node.section,
+                'depth': node.depth,
+                'parent': node.parent,
+                'breadcrumbs': node.breadcrumbs,
+                'children': len(node.children),
+            }
+            for node in page
+        ],
+        'total': len(nodes),
+        'next_offset': next_offset if next_offset < len(nodes) else None,
+    }
+    if root is not None:
+        result['subtree'] = {
+            'id': root.id,
+            'title': root.title,
+            'url': root.url,
+            'breadcrumbs': root.breadcrumbs,
+        }
+    return result
@@ -3,11 +3,14 @@
 
 """Read sections tool for the GenAI Atlas MCP Server."""
 
+import asyncio
 from typing import List
 
-from ..utils.fetcher import fetch_url
-from ..utils.html_converter import extract_sections
-from ..utils.url_utils import resolve_atlas_url, try_html_fallback_url, validate_atlas_url
+from ..config import config
+from ..utils.content_cache import get_page_content
+from ..utils.fetcher import deadline_error, staleness_note
+from ..utils.page_content import read_page_sections
+from ..utils.url_utils import validate_atlas_url
 
 
 async def read_sections(
@@ -21,6 +24,8 @@ async def read_sections(
     "Benefits", "When to use").
 
     Section matching is case-insensitive and handles whitespace differences.
+    Anchors (e.g. "tldr" or "#tldr") also match; use list_sections to see a
+    page's headings and anchors.
 
     ## Common Atlas Section Names
     Most Atlas topics follow a consistent structure:
@@ -42,7 +47,7 @@ async def read_sections(
 
     Args:
         url: URL of the Atlas topic page.
-        section_titles: List of section heading titles to extract.
+        section_titles: List of section heading titles (or anchors) to extract.
 
     Returns:
         Markdown content containing only the requested sections.
@@ -56,25 +61,23 @@ async def read_sections(
     if not section_titles:
         return 'Error: section_titles cannot be empty'
 
-    # Resolve .md URLs to deployed HTML paths
-    resolved_url = resolve_atlas_url(url_str)
-    raw_html = await fetch_url(resolved_url)
-
-    # Fallback: try .html extension
-    if raw_html is None:
-        fallback_url = try_html_fallback_url(url_str)
-        if fallback_url:
-            raw_html = await fetch_url(fallback_url)
-
-    if raw_html is None:
+    try:
+        loaded = await get_page_content(url_str, config.tool_deadline)
+    except asyncio.TimeoutError:
+        return deadline_error(url_str, config.tool_deadline)
+    if loaded is None:
         return f'Error: Failed to fetch {url_str}'
+    page, stale_age = loaded
 
     try:
-        markdown = extract_sections(raw_html, section_titles)
+        markdown = read_page_sections(page, section_titles)
     except ValueError as e:
         return (
             f'Error: {e}\n\n'
             f'Tip: Use read_topic(url="{url_str}") to get the full document content instead.'
         )
 
-    return f'Sections from {url_str}:\n\n{markdown}'
+    result = f'Sections from {url_str}:\n\n{markdown}'
+    if stale_age is not None:
+        result += staleness_note(stale_age)
+    return result
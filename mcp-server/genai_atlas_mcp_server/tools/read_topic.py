@@ -3,15 +3,29 @@
 
 """Read topic tool for the GenAI Atlas MCP Server."""
 
-from ..utils.fetcher import fetch_url
-from ..utils.html_converter import html_to_markdown
-from ..utils.url_utils import resolve_atlas_url, try_html_fallback_url, validate_atlas_url
+import asyncio
+from typing import Optional
+
+from ..config import config
+from ..utils.content_cache import get_page_content
+from ..utils.fetcher import deadline_error, staleness_note
+from ..utils.paginator import (
+    CHARS_PER_TOKEN,
+    content_version,
+    decode_cursor,
+    encode_cursor,
+    estimate_tokens,
+    page_end,
+)
+from ..utils.url_utils import validate_atlas_url
 
 
 async def read_topic(
     url: str,
     max_length: int = 5000,
     start_index: int = 0,
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> str:
     """Fetch and read the full content of a specific Atlas topic.
 
@@ -23,7 +37,10 @@ async def read_topic(
     - Accepts .md URLs (from llms.txt/list_topics) or .html URLs
 
     ## Handling Long Documents
-    If the response indicates truncation, call again with the suggested start_index.
+    Long documents are returned a page at a time. Pages end at a heading or
+    paragraph break, never inside a code block or table. If the response
+    indicates truncation, call again with the returned cursor (it keeps the
+    page size). Use max_tokens to size pages by an estimated token budget.
     For very long documents (>30,000 chars), stop reading once you've found the needed info.
 
     ## Example URLs
@@ -34,6 +51,11 @@ async def read_topic(
         url: URL of the Atlas topic page to read.
         max_length: Maximum characters to return (default: 5000, max: 100000).
         start_index: Character offset for pagination (default: 0).
+        max_tokens: Optional page size in estimated tokens (max: 25000); overrides
+                    max_length.
+        cursor: Continuation cursor from a previous truncated response; overrides
+                start_index, and keeps that response's page size unless max_tokens
+                is given.
 
     Returns:
         Markdown content of the Atlas topic, with pagination info if truncated.
@@ -45,48 +67,58 @@ async def read_topic(
     if validation_error:
         return validation_error
 
-    max_length = max(1, min(max_length, 100000))
+    budget = max(1, min(max_length, 100000))
+    if max_tokens is not None:
+        budget = max(1, min(max_tokens, 25000)) * CHARS_PER_TOKEN
     start_index = max(0, start_index)
-
-    # Resolve .md URLs to deployed HTML paths
-    resolved_url = resolve_atlas_url(url_str)
-
-    # Try fetching with the resolved URL
-    raw_html = await fetch_url(resolved_url)
-
-    # Fallback: try .html extension directly
-    if raw_html is None:
-        fallback_url = try_html_fallback_url(url_str)
-        if fallback_url:
-            raw_html = await fetch_url(fallback_url)
-
-    # Fallback: try appending index.html
-    if raw_html is None and not resolved_url.endswith('.html'):
-        index_url = resolved_url.rstrip('/') + '/index.html'
-        raw_html = await fetch_url(index_url)
-
-    if raw_html is None:
+    version = None
+    if cursor:
+        try:
+            version, start_index, cursor_budget = decode_cursor(cursor)
+        except ValueError as e:
+            return f'Error: {e}. Call read_topic without a cursor to start over.'
+        if max_tokens is None:
+            budget = max(1, min(cursor_budget, 100000))
+
+    # Converted once per page version; later pages of the same topic are slices
+    try:
+        loaded = await get_page_content(url_str, config.tool_deadline)
+    except asyncio.TimeoutError:
+        return deadline_error(url_str, config.tool_deadline)
+    if loaded is None:
         return f'Error: Failed to fetch {url_str} (tried multiple URL patterns)'
+    page, stale_age = loaded
+    content = page.markdown
 
-    content = html_to_markdown(raw_html)
     if not content:
         return f'Error: No content extracted from {url_str}'
 
     original_length = len(content)
+    current_version = content_version(content)
+    if version is not None and version != current_version:
+        return (
+            f'Error: {url_str} has changed since this cursor was issued. '
+            'Call read_topic without a cursor to read the current version.'
+        )
 
     if start_index >= original_length:
         return f'Atlas topic from {url_str}:\n\nNo more content available.'
 
-    end_index = min(start_index + max_length, original_length)
-    truncated = content[start_index:end_index]
+    end_index = page_end(content, start_index, budget)
+    truncated = content[start_index:end_index].strip()
 
     result = f'Atlas topic from {url_str}:\n\n{truncated}'
 
     remaining = original_length - end_index
     if remaining > 0:
+        next_cursor = encode_cursor(current_version, end_index, budget)
         result += (
-            f'\n\n---\nContent truncated. {remaining} characters remaining. '
-            f'Call read_topic with start_index={end_index} to continue.'
+            f'\n\n---\nContent truncated. {remaining} characters '
+            f'(~{estimate_tokens(content[end_index:])} tokens) remaining. '
+            f'Call read_topic with cursor="{next_cursor}" to continue '
+            f'(or start_index={end_index} with the same page size).'
         )
+    if stale_age is not None:
+        result += staleness_note(stale_age)
 
     return result
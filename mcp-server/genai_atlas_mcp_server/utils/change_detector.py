@@ -0,0 +1,221 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Detect changed Atlas pages from sitemap.xml and refresh only those.
+
+The MkDocs build stamps every sitemap entry with the page's last git revision
+date (``git-revision-date-localized``). Polling the sitemap and diffing the
+``<lastmod>`` values against the previous poll tells us exactly which pages
+changed, were added or were removed, so the caches and the search index can be
+refreshed page by page instead of expiring everything on a timer.
+
+``<lastmod>`` has day granularity: a page edited twice on the same day is
+picked up by the first poll after the first edit only. The indexes still
+reload fully on restart.
+
+Without that plugin MkDocs stamps every entry with the build date, or omits
+``<lastmod>``; every rebuild would then look like a change to every page. A
+sitemap whose entries have no dates, or all the same date, stops polling.
+Polling is off unless ``ATLAS_CHANGE_POLL_INTERVAL`` is set.
+"""
+
+import asyncio
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from ..config import config
+from .content_cache import convert_page, get_content_cache
+from .content_pack import get_content_pack
+from .corpus import get_corpus
+from .diagram_catalog import get_diagram_catalog
+from .fetcher import fetch_atlas_page, fetch_url
+from .html_converter import html_to_text
+from .page_cache import get_page_cache
+from .search_index import get_search_index
+from .section_index import sections_from_page
+from .topic_index import get_topic_index
+from .url_resolver import get_url_resolver
+from .url_utils import atlas_relative_path, page_key
+from .workers import run_cpu_bound
+
+_SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+def parse_sitemap(xml: str) -> Dict[str, Dict[str, str]]:
+    """Parse sitemap.xml into a map of page key -> entry.
+
+    Args:
+        xml: The sitemap document.
+
+    Returns:
+        Map of page key to ``{'loc': ..., 'lastmod': ...}``. ``loc`` is rebased
+        onto ``config.base_url`` (the sitemap always carries the public site
+        URL); ``lastmod`` is empty when the entry has none.
+
+    Raises:
+        ValueError: If the document is not well-formed XML.
+    """
+    try:
+        root = ET.fromstring(xml)
+    except ET.ParseError as e:
+        raise ValueError(f'Invalid sitemap: {e}') from e
+
+    entries = {}
+    for url in root.iter(f'{_SITEMAP_NS}url'):
+        loc = (url.findtext(f'{_SITEMAP_NS}loc') or '').strip()
+        relative = atlas_relative_path(loc) if loc else None
+        if relative is None:
+            continue
+        loc = f"{config.base_url.rstrip('/')}/{relative}"
+        lastmod = (url.findtext(f'{_SITEMAP_NS}lastmod') or '').strip()
+        entries[page_key(loc)] = {'loc': loc, 'lastmod': lastmod}
+    return entries
+
+
+def has_page_dates(entries: Dict[str, Dict[str, str]]) -> bool:
+    """Whether sitemap entries carry per-page ``<lastmod>`` dates.
+
+    False when any entry lacks one, or when several pages all share one date
+    (the build date MkDocs writes without git revision dates).
+    """
+    dates = [entry['lastmod'] for entry in entries.values()]
+    if not dates or not all(dates):
+        return False
+    return len(dates) == 1 or len(set(dates)) > 1
+
+
+class ChangeSet:
+    """Pages that changed between two sitemap polls."""
+
+    def __init__(self, changed: List[str], added: List[str], removed: List[str]):
+        """Initialize a change set of page URLs."""
+        self.changed = changed
+        self.added = added
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.changed or self.added or self.removed)
+
+
+class ChangeDetector:
+    """Polls sitemap.xml and applies page-level invalidation for changed pages."""
+
+    def __init__(self):
+        """Initialize a detector with no baseline yet."""
+        self._entries: Optional[Dict[str, Dict[str, str]]] = None
+        # Set when the sitemap cannot tell changed pages apart
+        self.disabled = False
+
+    async def poll(self) -> Optional[ChangeSet]:
+        """Fetch the sitemap and diff it against the previous poll.
+
+        The first successful poll only records the baseline.
+
+        Returns:
+            The changes since the previous poll, or None if the sitemap could
+            not be read or this was the baseline poll.
+        """
+        xml = await fetch_url(config.sitemap_url, missing_ok=True)
+        if xml is None:
+            return None
+        try:
+            entries = parse_sitemap(xml)
+        except ValueError as e:
+            logger.warning(str(e))
+            return None
+
+        resolver = get_url_resolver()
+        for entry in entries.values():
+            resolver.register(entry['loc'])
+
+        if not has_page_dates(entries):
+            logger.warning(
+                'sitemap.xml has no per-page <lastmod> dates; change detection stopped'
+            )
+            self.disabled = True
+            return None
+
+        previous, self._entries = self._entries, entries
+        if previous is None:
+            logger.info(f'Sitemap baseline recorded ({len(entries)} pages)')
+            return None
+
+        changed = [
+            entry['loc']
+            for key, entry in entries.items()
+            if key in previous and entry['lastmod'] != previous[key]['lastmod']
+        ]
+        added = [entry['loc'] for key, entry in entries.items() if key not in previous]
+        removed = [entry['loc'] for key, entry in previous.items() if key not in entries]
+        return ChangeSet(changed=changed, added=added, removed=removed)
+
+    async def apply(self, changes: ChangeSet) -> None:
+        """Invalidate and re-index only the pages in a change set."""
+        refresh = changes.changed + changes.added
+        get_page_cache().invalidate(refresh + changes.removed)
+        get_content_cache().invalidate(refresh + changes.removed)
+        # Changed pages are read from the site until the corpus is reloaded
+        get_corpus().invalidate(refresh + changes.removed)
+        get_content_pack().invalidate(refresh + changes.removed)
+
+        search_index = get_search_index()
+        catalog = get_diagram_catalog()
+        for url in changes.removed:
+            search_index.remove_page(url)
+            catalog.remove_page(url)
+            get_url_resolver().forget(url)
+
+        semaphore = asyncio.Semaphore(config.max_concurrent_fetches)
+
+        async def _reindex(url: str) -> None:
+            async with semaphore:
+                result = await fetch_atlas_page(url)
+            if result is None:
+                logger.warning(f'Could not re-fetch changed page {url}')
+                return
+            html, fetched_url = result
+            title, text = await run_cpu_bound(html_to_text, html)
+            page = await convert_page(html, fetched_url)
+            search_index.upsert_page(url, title, text, sections=sections_from_page(page, url))
+            if catalog.loaded:
+                catalog.replace_page(url, title, page.diagrams)
+
+        await asyncio.gather(*[_reindex(url) for url in refresh])
+
+        if changes.added or changes.removed:
+            get_topic_index().mark_stale()
+            get_corpus().mark_stale()
+            get_content_pack().mark_stale()
+
+        logger.info(
+            f'Refreshed Atlas pages: {len(changes.changed)} changed, '
+            f'{len(changes.added)} added, {len(changes.removed)} removed'
+        )
+
+    async def run(self, interval: float) -> None:
+        """Poll every ``interval`` seconds and apply changes, until polling is disabled."""
+        while not self.disabled:
+            try:
+                changes = await self.poll()
+                if changes:
+                    await self.apply(changes)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f'Change detection failed: {e}')
+            await asyncio.sleep(interval)
+
+
+# Global singleton
+_detector: Optional[ChangeDetector] = None
+
+
+def get_change_detector() -> ChangeDetector:
+    """Get the global change detector singleton."""
+    global _detector
+    if _detector is None:
+        _detector = ChangeDetector()
+    return _detector
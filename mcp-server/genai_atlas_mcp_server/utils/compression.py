@@ -0,0 +1,151 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compact in-memory storage for cached text.
+
+Cached page HTML, converted markdown and search text are held compressed and
+decompressed on access. Atlas pages are dominated by the same MkDocs
+boilerplate (header, the full site navigation, footer), so each codec primes
+a dictionary with the first sizeable text it compresses — later pages then
+compress to little more than their own content. With zstd (``zstandard``,
+installed with the ``compression`` extra) a raw-content dictionary shrinks
+pages over 20x; without it the codec falls back to zlib, which can only use
+the first 32 KB of the sample as a preset dictionary (about 8x).
+
+Every blob starts with a one-byte tag naming how it was encoded, so blobs
+written before the dictionary was primed stay readable. Blobs compressed with
+the dictionary also carry its id, a checksum of the dictionary bytes.
+
+The dictionary depends on what a codec compressed first, so each process
+primes its own: blobs must not cross a process boundary. Work sent to worker
+processes (``workers``) returns plain text, and the calling process
+compresses it. A blob compressed with another codec's dictionary raises
+``ValueError`` rather than decoding to garbage or failing deep in zstd.
+"""
+
+import struct
+import zlib
+from typing import Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the optional extra
+    zstandard = None
+
+_DECOMPRESS_ERRORS = (zlib.error,) + ((zstandard.ZstdError,) if zstandard else ())
+
+# Blob tags; the dictionary tags are followed by the dictionary id
+_RAW = b'\x00'
+_ZLIB = b'\x01'
+_ZLIB_DICT = b'\x02'
+_ZSTD = b'\x03'
+_ZSTD_DICT = b'\x04'
+
+# Texts shorter than this are stored as-is
+_MIN_COMPRESS_SIZE = 256
+# Smallest text worth keeping as the dictionary
+_MIN_DICT_SAMPLE = 4096
+# zlib only looks back 32 KB, so a longer preset dictionary is wasted
+_ZLIB_WINDOW = 32 * 1024
+# Dictionary id: the CRC-32 of the dictionary, big-endian
+_DICT_ID = struct.Struct('>I')
+
+
+class TextCodec:
+    """Compresses text with a dictionary primed from the first large sample."""
+
+    def __init__(self, level: int = 3, use_zstd: bool = True):
+        """Initialize a codec.
+
+        Args:
+            level: Compression level (zstd or zlib).
+            use_zstd: Use zstd when ``zstandard`` is installed.
+        """
+        self.level = level
+        self.use_zstd = use_zstd and zstandard is not None
+        self._dictionary: Optional[bytes] = None
+        self._dict_id = b''
+        self._zstd_dict = None
+
+    @property
+    def primed(self) -> bool:
+        """Return True once the dictionary has been set."""
+        return self._dictionary is not None
+
+    def _prime(self, sample: bytes) -> None:
+        """Adopt a sample as the dictionary for all later blobs."""
+        self._dictionary = sample
+        self._dict_id = _DICT_ID.pack(zlib.crc32(sample))
+        if self.use_zstd:
+            self._zstd_dict = zstandard.ZstdCompressionDict(
+                sample, dict_type=zstandard.DICT_TYPE_RAWCONTENT
+            )
+
+    def compress(self, text: str) -> bytes:
+        """Compress text into a tagged blob."""
+        data = text.encode('utf-8')
+        if len(data) < _MIN_COMPRESS_SIZE:
+            return _RAW + data
+
+        if self._dictionary is None:
+            blob = self._compress_plain(data)
+            if len(data) >= _MIN_DICT_SAMPLE:
+                self._prime(data)
+            return blob
+
+        if self.use_zstd:
+            compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self._zstd_dict)
+            return _ZSTD_DICT + self._dict_id + compressor.compress(data)
+        compressor = zlib.compressobj(self.level, zdict=self._dictionary[:_ZLIB_WINDOW])
+        return _ZLIB_DICT + self._dict_id + compressor.compress(data) + compressor.flush()
+
+    def _compress_plain(self, data: bytes) -> bytes:
+        """Compress without a dictionary."""
+        if self.use_zstd:
+            return _ZSTD + zstandard.ZstdCompressor(level=self.level).compress(data)
+        return _ZLIB + zlib.compress(data, self.level)
+
+    def decompress(self, blob: bytes) -> str:
+        """Decompress a blob produced by ``compress``.
+
+        Raises:
+            ValueError: If the blob is corrupt, was compressed with another
+                dictionary (by another codec or process), or needs zstd that is
+                not installed.
+        """
+        tag, payload = blob[:1], blob[1:]
+        if tag in (_ZLIB_DICT, _ZSTD_DICT):
+            dict_id, payload = payload[:_DICT_ID.size], payload[_DICT_ID.size:]
+            if dict_id != self._dict_id:
+                raise ValueError(
+                    'Compressed blob uses another dictionary; blobs only decode in the codec '
+                    'and process that compressed them'
+                )
+        try:
+            if tag == _RAW:
+                data = payload
+            elif tag == _ZLIB:
+                data = zlib.decompress(payload)
+            elif tag == _ZLIB_DICT:
+                decompressor = zlib.decompressobj(zdict=self._dictionary[:_ZLIB_WINDOW])
+                data = decompressor.decompress(payload) + decompressor.flush()
+            elif tag in (_ZSTD, _ZSTD_DICT) and zstandard is not None:
+                dict_data = self._zstd_dict if tag == _ZSTD_DICT else None
+                data = zstandard.ZstdDecompressor(dict_data=dict_data).decompress(payload)
+            else:
+                raise ValueError(f'Unsupported blob tag {tag!r}')
+        except _DECOMPRESS_ERRORS as e:
+            raise ValueError(f'Corrupt compressed blob: {e}') from e
+        return data.decode('utf-8')
+
+
+# One codec per kind of text, so each primes a dictionary that suits it
+_codecs: Dict[str, TextCodec] = {}
+
+
+def get_codec(kind: str) -> TextCodec:
+    """Get this process's shared codec for a kind of text (``'html'``, ``'markdown'``, ...)."""
+    codec = _codecs.get(kind)
+    if codec is None:
+        codec = _codecs[kind] = TextCodec()
+    return codec
@@ -0,0 +1,176 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Cache of converted pages, so each page is parsed and converted once.
+
+Converting a page (BeautifulSoup parse, selector scans, markdownify) costs
+far more than anything done with the result, even off the event loop. ``read_topic`` pagination and
+``read_sections`` used to repeat the conversion on every call; this cache
+keeps the ``PageContent`` (markdown, section outline, diagrams) for each page,
+keyed by page key and a hash of the HTML it was converted from. A page whose
+HTML changed is reconverted on the next call; entries are held compressed.
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Iterable, Optional, Tuple, TypeVar
+
+from ..config import config
+from ..models import PageContent
+from .compression import get_codec
+from .content_pack import get_content_pack
+from .corpus import get_corpus
+from .fetcher import fetch_atlas_page_within
+from .page_content import build_page_content
+from .snapshot import get_snapshot
+from .url_utils import page_key
+from .workers import run_cpu_bound
+
+T = TypeVar('T')
+
+
+def content_hash(html: str) -> str:
+    """Return a short digest identifying a page's HTML."""
+    return hashlib.blake2b(html.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ContentCache:
+    """Bounded LRU cache of converted pages."""
+
+    def __init__(self, max_entries: int):
+        """Initialize an empty cache holding at most ``max_entries`` pages."""
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[str, bytes]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached pages."""
+        return len(self._entries)
+
+    def get(self, url: str, digest: str) -> Optional[PageContent]:
+        """Look up a converted page.
+
+        Args:
+            url: Any URL form of an Atlas page.
+            digest: ``content_hash`` of the page's current HTML.
+
+        Returns:
+            The converted page, or None if it is not cached for that HTML.
+        """
+        key = page_key(url)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != digest:
+            return None
+        self._entries.move_to_end(key)
+        return PageContent.model_validate_json(get_codec('markdown').decompress(entry[1]))
+
+    def put(self, url: str, digest: str, page: PageContent) -> None:
+        """Store a converted page, evicting the least recently used entry if full."""
+        if self.max_entries <= 0:
+            return
+        key = page_key(url)
+        self._entries[key] = (digest, get_codec('markdown').compress(page.model_dump_json()))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, urls: Iterable[str]) -> None:
+        """Drop the given pages from the cache."""
+        for url in urls:
+            self._entries.pop(page_key(url), None)
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        self._entries.clear()
+
+
+async def convert_page(html: str, url: str) -> PageContent:
+    """Convert a page's HTML, reusing the cached conversion of identical HTML.
+
+    Conversion runs in the worker pool, off the event loop.
+
+    Args:
+        html: Raw HTML of the page.
+        url: URL the page was fetched from (used for relative image paths).
+
+    Returns:
+        The converted page.
+    """
+    cache = get_content_cache()
+    digest = content_hash(html)
+    page = cache.get(url, digest)
+    if page is None:
+        page = await run_cpu_bound(build_page_content, html, url)
+        cache.put(url, digest, page)
+    return page
+
+
+async def _within(awaitable: Awaitable[T], deadline: float) -> Optional[T]:
+    """Await a shared load for at most ``deadline`` seconds; None if it is still running."""
+    task = asyncio.shield(awaitable)
+    try:
+        return await (asyncio.wait_for(task, deadline) if deadline > 0 else task)
+    except asyncio.TimeoutError:
+        return None
+
+
+async def get_page_content(
+    url: str, deadline: float
+) -> Optional[Tuple[PageContent, Optional[float]]]:
+    """Get a page as markdown, from the snapshot, the content pack, the corpus or the site.
+
+    The content pack index and the corpus (llms-full.txt) are loaded on first
+    use; if that takes longer than ``deadline``, the page is read from the
+    next source meanwhile.
+
+    Args:
+        url: Any URL form of an Atlas page.
+        deadline: Seconds to wait for the site before answering from a stale
+            cached copy (see ``fetch_atlas_page_within``).
+
+    Returns:
+        ``(page, stale_age)`` where ``stale_age`` is the age in seconds of a
+        stale copy (None when fresh), or None if the page could not be fetched.
+
+    Raises:
+        asyncio.TimeoutError: If the deadline passed with nothing cached.
+    """
+    snapshot = get_snapshot()
+    page = await snapshot.get(url) if snapshot else None
+    if page is not None:
+        return page, None
+
+    if config.content_pack:
+        pack = get_content_pack()
+        if not pack.loaded:
+            await _within(pack.ensure_loaded(), deadline)
+        if url in pack:
+            page = await _within(pack.get(url), deadline)
+            if page is not None:
+                return page, None
+
+    if config.corpus:
+        corpus = get_corpus()
+        if not corpus.loaded:
+            await _within(corpus.ensure_loaded(), deadline)
+        page = corpus.get(url)
+        if page is not None:
+            return page, None
+
+    fetched = await fetch_atlas_page_within(url, deadline)
+    if fetched is None:
+        return None
+    html, fetched_url, stale_age = fetched
+    return await convert_page(html, fetched_url), stale_age
+
+
+# Global singleton
+_content_cache: Optional[ContentCache] = None
+
+
+def get_content_cache() -> ContentCache:
+    """Get the global converted-page cache singleton."""
+    global _content_cache
+    if _content_cache is None:
+        _content_cache = ContentCache(config.content_cache_size)
+    return _content_cache
@@ -0,0 +1,228 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Per-page content written at site build time.
+
+The ``content_pack_hook`` MkDocs hook (hooks/ in the repository root) saves
+every page's markdown, from the source rather than the themed HTML, with its
+h2–h4 section outline and heading anchors:
+
+- ``content-pack/index.json`` lists the pages by page key, with their URL,
+  title, file and digest
+- ``content-pack/pages/<key>.json`` holds one page
+- ``content-pack/diagrams.json`` holds the diagrams of every page, taken
+  from the rendered HTML
+- ``content-pack/nav.json`` holds the site navigation (see ``topic_tree``)
+
+The index is downloaded once; each page file is fetched the first time the
+page is read and kept compressed. ``read_topic``, ``list_sections`` and
+``read_sections`` answer from the pack without converting any HTML. Sites
+built without the hook have no index, and pages are read from the corpus or
+the site instead.
+
+Pages served from the pack carry no diagram metadata. The diagram catalog
+is built from ``diagrams.json`` instead, with one download.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from loguru import logger
+from pydantic import ValidationError
+
+from ..config import config
+from ..models import PageContent, PageSection
+from .compression import get_codec
+from .fetcher import fetch_url
+from .html_converter import normalize_heading
+from .url_utils import page_key
+
+PACK_FORMAT = 1
+
+
+def parse_pack_page(text: str) -> PageContent:
+    """Build a ``PageContent`` from a page file of the content pack.
+
+    Page URLs in the pack are relative to the site root.
+
+    Raises:
+        ValueError: If the text is not a valid page file.
+    """
+    data = json.loads(text)
+    try:
+        sections = [
+            PageSection(**section, key=normalize_heading(section['title']))
+            for section in data.get('sections', [])
+        ]
+        return PageContent(
+            url=f'{config.base_url.rstrip("/")}/{data["url"]}',
+            title=data.get('title', ''),
+            markdown=data['markdown'],
+            sections=sections,
+        )
+    except (AttributeError, KeyError, TypeError, ValidationError) as e:
+        raise ValueError(f'Invalid content pack page: {e}') from e
+
+
+def pack_file_url(name: str) -> str:
+    """Return the URL of a file of the content pack, next to the index."""
+    return f'{config.content_pack_url.rsplit("/", 1)[0]}/{name}'
+
+
+def _site_url(path: str) -> str:
+    """Return the absolute URL of a path from the site root (absolute URLs are kept)."""
+    if path.startswith(('http://', 'https://', 'file://')):
+        return path
+    return f'{config.base_url.rstrip("/")}/{path}'
+
+
+async def fetch_pack_diagrams() -> Optional[List[Tuple[str, str, List[Dict[str, Any]]]]]:
+    """Fetch the diagrams of every page from the content pack.
+
+    Returns:
+        (page URL, page title, diagrams) for each page with diagrams, the
+        diagrams as returned by ``extract_diagrams``, or None if the site has
+        no valid diagram file.
+    """
+    text = await fetch_url(pack_file_url('diagrams.json'), missing_ok=True)
+    if text is None:
+        return None
+    try:
+        data = json.loads(text)
+        if data.get('format') != PACK_FORMAT:
+            raise ValueError(f'unsupported format {data.get("format")}')
+        return [
+            (
+                _site_url(page['url']),
+                page.get('title', ''),
+                [
+                    {**diagram, 'image_url': _site_url(diagram['image_url'])}
+                    for diagram in page['diagrams']
+                ],
+            )
+            for page in data['pages'].values()
+        ]
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f'Invalid content pack diagrams: {e}')
+        return None
+
+
+class ContentPack:
+    """The build-time content pack of the Atlas site, by page key."""
+
+    def __init__(self):
+        """Initialize an empty pack."""
+        self._index: Dict[str, Dict[str, str]] = {}
+        self._pages: Dict[str, bytes] = {}
+        self._loaded = False
+        self._failed = False
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of pages in the pack."""
+        return len(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        """Whether the pack holds the page a URL points to."""
+        return page_key(url) in self._index
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the pack index has been loaded."""
+        return self._loaded
+
+    async def ensure_loaded(self) -> None:
+        """Load the pack index if not already loaded (or tried and failed)."""
+        if self._loaded or self._failed:
+            return
+        async with self._lock:
+            if self._loaded or self._failed:
+                return
+            await self._load()
+
+    def mark_stale(self) -> None:
+        """Reload the index on next use; fetched pages stay available until then."""
+        self._loaded = self._failed = False
+
+    async def _load(self) -> None:
+        """Internal load logic — must be called under self._lock."""
+        text = await fetch_url(config.content_pack_url, missing_ok=True)
+        if text is None:
+            logger.info('No content pack on the site; pages are read from the site')
+            self._failed = True
+            return
+        try:
+            index = json.loads(text)
+        except ValueError as e:
+            logger.warning(f'Invalid content pack index: {e}')
+            self._failed = True
+            return
+        if not isinstance(index, dict):
+            logger.warning(f'Invalid content pack index: expected an object, got {type(index).__name__}')
+            self._failed = True
+            return
+        if index.get('format') != PACK_FORMAT:
+            logger.warning(f'Unsupported content pack format: {index.get("format")}')
+            self._failed = True
+            return
+
+        pages = index.get('pages', {})
+        if not isinstance(pages, dict) or not all(
+            isinstance(entry, dict) and 'file' in entry for entry in pages.values()
+        ):
+            logger.warning('Invalid content pack index: pages must map page keys to entries')
+            self._failed = True
+            return
+        # Pages whose file changed in the new build are fetched again
+        for key in list(self._pages):
+            if key not in pages or self._index[key].get('digest') != pages[key].get('digest'):
+                del self._pages[key]
+        self._index = pages
+        self._loaded = True
+        logger.info(f'Loaded content pack index ({len(pages)} pages, build {index.get("build")})')
+
+    def _page_url(self, entry: Dict[str, str]) -> str:
+        """Return the URL of a page file, next to the index."""
+        root = config.content_pack_url.rsplit('/', 2)[0]
+        return f'{root}/{quote(entry["file"])}'
+
+    async def get(self, url: str) -> Optional[PageContent]:
+        """Return the page for any URL form, or None if the pack lacks it."""
+        key = page_key(url)
+        codec = get_codec('markdown')
+        blob = self._pages.get(key)
+        if blob is not None:
+            return PageContent.model_validate_json(codec.decompress(blob))
+
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        text = await fetch_url(self._page_url(entry), missing_ok=True)
+        if text is None:
+            return None
+        try:
+            page = parse_pack_page(text)
+        except ValueError as e:
+            logger.warning(f'{e} ({entry["file"]})')
+            return None
+        self._pages[key] = codec.compress(page.model_dump_json())
+        return page
+
+    def invalidate(self, urls: Sequence[str]) -> None:
+        """Drop fetched pages that changed on the site, so they are fetched again."""
+        for url in urls:
+            self._pages.pop(page_key(url), None)
+
+
+# Global singleton
+_content_pack: Optional[ContentPack] = None
+
+
+def get_content_pack() -> ContentPack:
+    """Get the global content pack singleton."""
+    global _content_pack
+    if _content_pack is None:
+        _content_pack = ContentPack()
+    return _content_pack
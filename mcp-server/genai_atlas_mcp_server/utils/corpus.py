@@ -0,0 +1,301 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""The full Atlas corpus from llms-full.txt.
+
+The site publishes ``llms-full.txt`` (the ``llmstxt`` plugin in mkdocs.yml):
+the markdown of every page listed in llms.txt, concatenated in llms.txt
+order. One streamed download of it replaces an HTML fetch and conversion per
+page: ``read_topic``, ``list_sections`` and ``read_sections`` answer from the
+corpus, and the search index is built from it when search_index.json cannot
+be loaded.
+
+The file has no page delimiters. Each page starts with its h1, but the h1 is
+the page's own title (``Retrieval Augmented Generation (RAG)``), not the
+llms.txt link text (``RAG``), some pages have no h1 or more than one, and
+``#`` lines inside code blocks are not headings. Pages are therefore matched
+to h1 headings by a monotone alignment (dynamic programming, as for sequence
+alignment): every page is assigned the heading most similar to its link text
+and path, in order, while stray headings stay inside the page before them.
+A heading that starts with the link text, or spells it out in parentheses
+(``RAG`` and ``Retrieval Augmented Generation (RAG)``), is a full match.
+
+The alignment is a heuristic: on the site, right pages and headings share as
+little as nothing (``SDLC`` and ``Software Development Lifecycle``), so no
+similarity threshold separates right from wrong matches, and a page whose h1
+is missing can take its neighbour's. The corpus is therefore opt-in
+(``ATLAS_CORPUS``); the content pack is the exact source of page content.
+
+The corpus carries no images, so pages served from it have no diagrams;
+``list_diagrams`` keeps reading the HTML.
+"""
+
+import asyncio
+import re
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from loguru import logger
+
+from ..config import config
+from ..models import PageContent
+from .compression import get_codec
+from .fetcher import fetch_stream
+from .page_content import markdown_outline
+from .topic_index import get_topic_index
+from .url_utils import page_key, resolve_atlas_url
+from .workers import run_cpu_bound
+
+_FENCE_RE = re.compile(r'^[ \t]*(`{3,}|~{3,})')
+
+# Alignment scores: a heading left inside the previous page, a page without a heading
+_STRAY_HEADING = -0.2
+_MISSING_PAGE = -1.0
+
+
+class CorpusSplitter:
+    """Incremental scanner for the h1 headings of streamed markdown."""
+
+    def __init__(self):
+        """Initialize an empty scanner."""
+        self._chunks: List[str] = []
+        self._partial = ''
+        self._offset = 0
+        self._fence: Optional[str] = None
+        # (offset, title) of every h1 outside code blocks
+        self.headings: List[Tuple[int, str]] = []
+
+    def feed(self, text: str) -> None:
+        """Scan the next chunk of text."""
+        self._chunks.append(text)
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._scan(line)
+            self._offset += len(line) + 1
+
+    def close(self) -> str:
+        """Scan the final line and return the full text."""
+        self._scan(self._partial)
+        self._partial = ''
+        return ''.join(self._chunks)
+
+    def _scan(self, line: str) -> None:
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if self._fence is None:
+                self._fence = marker[0] * 3
+            elif marker.startswith(self._fence):
+                self._fence = None
+        elif self._fence is None and line.startswith('# '):
+            self.headings.append((self._offset, line[2:].strip()))
+
+
+def _grams(text: str) -> Set[str]:
+    """Return the character trigrams of the words in a text."""
+    grams: Set[str] = set()
+    for word in re.findall(r'[a-z0-9]+', text.lower()):
+        padded = f' {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _page_label(title: str, url: str) -> str:
+    """Describe a page for alignment: its link text and its file or directory name."""
+    name = page_key(url).rsplit('/', 1)[-1]
+    name = re.sub(r'^[0-9_.-]+', '', name).replace('_', ' ')
+    # llms.txt lists section index pages as "Index"
+    return name if title == 'Index' else f'{title} {name}'
+
+
+def _words(text: str) -> List[str]:
+    """Return the lowercase words of a text."""
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def _names_page(title: str, heading: str) -> bool:
+    """Whether a heading starts with a page's link text or spells it in parentheses."""
+    title_words = _words(title)
+    if not title_words:
+        return False
+    heading_words = _words(heading)
+    if heading_words[:len(title_words)] == title_words:
+        return True
+    return any(_words(inner) == title_words for inner in re.findall(r'\(([^()]*)\)', heading))
+
+
+def align_pages(
+    labels: Sequence[str], headings: Sequence[str], titles: Optional[Sequence[str]] = None
+) -> List[Optional[int]]:
+    """Match pages to the h1 headings that start them, in order.
+
+    Args:
+        labels: Text describing each page (link text and path), in corpus order.
+        headings: The h1 headings of the corpus, in order.
+        titles: Optional link text of each page; a heading that names it (see
+            ``_names_page``) is a full match.
+
+    Returns:
+        For each page, the position of its heading in ``headings``, or None
+        for a page whose heading could not be placed.
+    """
+    page_grams = [_grams(label) for label in labels]
+    heading_grams = [_grams(heading) for heading in headings]
+
+    def _similarity(page: int, heading: int) -> float:
+        if titles is not None and _names_page(titles[page], headings[heading]):
+            return 1.0
+        a, b = page_grams[page], heading_grams[heading]
+        return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+    rows, cols = len(labels), len(headings)
+    # score[i][j]: best alignment of the first i pages with the first j headings
+    score = [[float('-inf')] * (cols + 1) for _ in range(rows + 1)]
+    step = [[''] * (cols + 1) for _ in range(rows + 1)]
+    score[0][0] = 0.0
+    for i in range(rows + 1):
+        for j in range(cols + 1):
+            current = score[i][j]
+            if current == float('-inf'):
+                continue
+            moves = []
+            if j < cols:
+                # Headings before the first page are preamble
+                moves.append((i, j + 1, current + _STRAY_HEADING, 'stray'))
+            if i < rows and j < cols:
+                moves.append((i + 1, j + 1, current + _similarity(i, j), 'match'))
+            if i < rows:
+                moves.append((i + 1, j, current + _MISSING_PAGE, 'missing'))
+            for ni, nj, value, move in moves:
+                if value > score[ni][nj]:
+                    score[ni][nj] = value
+                    step[ni][nj] = move
+
+    matches: List[Optional[int]] = [None] * rows
+    i, j = rows, cols
+    while i or j:
+        move = step[i][j]
+        if move == 'match':
+            matches[i - 1] = j - 1
+        if move in ('match', 'missing'):
+            i -= 1
+        if move in ('match', 'stray'):
+            j -= 1
+    return matches
+
+
+def split_corpus(
+    text: str, headings: Sequence[Tuple[int, str]], pages: Sequence[Tuple[str, str]]
+) -> List[PageContent]:
+    """Split the corpus into converted pages.
+
+    Args:
+        text: The full llms-full.txt text.
+        headings: ``(offset, title)`` of its h1 headings (see ``CorpusSplitter``).
+        pages: ``(title, url)`` of every llms.txt link, in order.
+
+    Returns:
+        A page, with its section outline, for each link whose heading was found.
+    """
+    matches = align_pages(
+        [_page_label(title, url) for title, url in pages],
+        [title for _, title in headings],
+        # llms.txt lists section index pages as "Index", which names no heading
+        ['' if title == 'Index' else title for title, _ in pages],
+    )
+    starts = [(headings[m][0], position) for position, m in enumerate(matches) if m is not None]
+    result = []
+    for n, (start, position) in enumerate(starts):
+        end = starts[n + 1][0] if n + 1 < len(starts) else len(text)
+        markdown = text[start:end].strip() + '\n'
+        result.append(PageContent(
+            url=resolve_atlas_url(pages[position][1]),
+            title=headings[matches[position]][1],
+            markdown=markdown,
+            sections=markdown_outline(markdown),
+        ))
+    return result
+
+
+class Corpus:
+    """The Atlas pages from llms-full.txt, by page key."""
+
+    def __init__(self):
+        """Initialize an empty corpus."""
+        self._pages: Dict[str, bytes] = {}
+        self._loaded = False
+        self._failed = False
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of pages."""
+        return len(self._pages)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the corpus has been loaded."""
+        return self._loaded
+
+    async def ensure_loaded(self) -> None:
+        """Load llms-full.txt if not already loaded (or tried and failed)."""
+        if self._loaded or self._failed:
+            return
+        async with self._lock:
+            if self._loaded or self._failed:
+                return
+            await self._load()
+
+    def mark_stale(self) -> None:
+        """Reload llms-full.txt on next use; current pages stay available until then."""
+        self._loaded = self._failed = False
+
+    async def _load(self) -> None:
+        """Internal load logic — must be called under self._lock."""
+        logger.info('Loading Atlas corpus from llms-full.txt...')
+        topics = get_topic_index()
+        splitter = CorpusSplitter()
+        loaded, _ = await asyncio.gather(
+            fetch_stream(config.llms_full_txt_url, splitter.feed, missing_ok=True),
+            topics.ensure_loaded(),
+        )
+        if not loaded or not topics.pages:
+            logger.warning('Failed to load llms-full.txt; pages are read from the site')
+            self._failed = True
+            return
+
+        pages = await run_cpu_bound(split_corpus, splitter.close(), splitter.headings, topics.pages)
+        codec = get_codec('markdown')
+        self._pages = {page_key(page.url): codec.compress(page.model_dump_json()) for page in pages}
+        self._loaded = True
+        logger.info(f'Loaded {len(pages)} of {len(topics.pages)} pages from llms-full.txt')
+
+    def get(self, url: str) -> Optional[PageContent]:
+        """Return the page for any URL form, or None if the corpus lacks it."""
+        blob = self._pages.get(page_key(url))
+        if blob is None:
+            return None
+        return PageContent.model_validate_json(get_codec('markdown').decompress(blob))
+
+    def pages(self) -> Iterator[PageContent]:
+        """Iterate over all pages, in llms.txt order."""
+        for key in list(self._pages):
+            page = self.get(key)
+            if page is not None:
+                yield page
+
+    def invalidate(self, urls: Sequence[str]) -> None:
+        """Drop pages that changed on the site, so they are read from the site instead."""
+        for url in urls:
+            self._pages.pop(page_key(url), None)
+
+
+# Global singleton
+_corpus: Optional[Corpus] = None
+
+
+def get_corpus() -> Corpus:
+    """Get the global corpus singleton."""
+    global _corpus
+    if _corpus is None:
+        _corpus = Corpus()
+    return _corpus
@@ -0,0 +1,295 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Corpus-wide catalog of the diagrams embedded in Atlas pages.
+
+``list_diagrams`` used to fetch and parse 10–15 pages on every call. The
+catalog is built once instead — from the snapshot when one is configured,
+otherwise from the content pack's ``diagrams.json`` (one download), and only
+on sites without either by fetching every page in the search index, about
+180 pages — and holds each
+diagram's image URL, alt text, caption context, page and section. A keyword
+index over those fields answers topic queries without touching the network.
+The change detector keeps the catalog current page by page.
+
+Image metadata (format, dimensions, file size) is probed from the first bytes
+of each image the first time it is listed, and kept with the catalog.
+"""
+
+import asyncio
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from ..config import config
+from ..models import DiagramEntry
+from .content_pack import fetch_pack_diagrams
+from .fetcher import fetch_atlas_page
+from .html_converter import extract_diagrams
+from .image_probe import probe_image
+from .search_index import get_search_index
+from .snapshot import get_snapshot
+from .url_utils import page_key
+from .workers import run_cpu_bound
+
+# Weight of a token match in each field of a diagram
+_FIELD_WEIGHTS = (('title', 3.0), ('section', 2.0), ('page_title', 1.0), ('context', 1.0))
+
+
+def _tokenize(text: str) -> List[str]:
+    """Tokenize text into lowercase words."""
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+class DiagramCatalog:
+    """Diagrams of every Atlas page, with a keyword index."""
+
+    def __init__(self):
+        """Initialize an empty catalog."""
+        self._entries: Dict[int, DiagramEntry] = {}
+        self._pages: Dict[str, List[int]] = {}
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._next_id = 0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._build: Optional[asyncio.Task] = None
+        # Probed image metadata by image URL (None if the image could not be read)
+        self._images: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._probes: Dict[str, asyncio.Task] = {}
+        self._probe_semaphore = asyncio.Semaphore(config.max_concurrent_fetches)
+
+    def __len__(self) -> int:
+        """Return the number of catalogued diagrams."""
+        return len(self._entries)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the catalog has been built."""
+        return self._loaded
+
+    async def ensure_loaded(self) -> None:
+        """Build the catalog if not already built."""
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            await self._load()
+
+    async def wait_loaded(self, timeout: Optional[float]) -> bool:
+        """Wait up to ``timeout`` seconds for the catalog, starting the build if needed.
+
+        The build keeps running in the background when the wait times out.
+
+        Returns:
+            True if the catalog is ready.
+        """
+        if self._loaded:
+            return True
+        if self._build is None or self._build.done():
+            self._build = asyncio.create_task(self.ensure_loaded())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._build), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self._loaded
+
+    async def _load(self) -> None:
+        """Internal build logic — must be called under self._lock."""
+        snapshot = get_snapshot()
+        if snapshot is None and config.content_pack:
+            pages = await fetch_pack_diagrams()
+            if pages is not None:
+                for url, page_title, diagrams in pages:
+                    self.replace_page(url, page_title, diagrams)
+                self._loaded = True
+                logger.info(
+                    f'Catalogued {len(self._entries)} diagrams from {len(self._pages)} pages'
+                    ' of the content pack'
+                )
+                return
+
+        search_index = get_search_index()
+        await search_index.ensure_loaded()
+        docs = search_index.get_all_docs()
+        if not docs:
+            logger.error('Cannot build the diagram catalog without the search index')
+            return
+
+        logger.info(f'Building diagram catalog from {len(docs)} pages...')
+        semaphore = asyncio.Semaphore(config.max_concurrent_fetches)
+
+        async def _page_diagrams(url: str) -> Optional[List[Dict[str, str]]]:
+            page = await snapshot.get(url) if snapshot else None
+            if page is not None:
+                return page.diagrams
+            async with semaphore:
+                fetched = await fetch_atlas_page(url)
+            if fetched is None:
+                return None
+            html, fetched_url = fetched
+            return await run_cpu_bound(extract_diagrams, html, fetched_url)
+
+        results = await asyncio.gather(*[_page_diagrams(doc.url) for doc in docs])
+        failed = sum(diagrams is None for diagrams in results)
+        if failed == len(docs):
+            logger.error('Failed to build the diagram catalog')
+            return
+
+        for doc, diagrams in zip(docs, results):
+            if diagrams:
+                self.replace_page(doc.url, doc.title, diagrams)
+        self._loaded = True
+        logger.info(
+            f'Catalogued {len(self._entries)} diagrams from {len(self._pages)} pages'
+            + (f' ({failed} pages could not be fetched)' if failed else '')
+        )
+
+    def replace_page(self, url: str, page_title: str, diagrams: Iterable[Dict[str, str]]) -> None:
+        """Replace a page's diagrams.
+
+        Args:
+            url: URL of the page.
+            page_title: Title of the page.
+            diagrams: Diagram dicts as returned by ``extract_diagrams``.
+        """
+        self.remove_page(url)
+        ids = []
+        for diagram in diagrams:
+            entry = DiagramEntry(
+                title=diagram['title'],
+                image_url=diagram['image_url'],
+                context=diagram.get('context', ''),
+                page_title=page_title,
+                page_url=url,
+                section=diagram.get('section', ''),
+                anchor=diagram.get('anchor', ''),
+            )
+            self._apply_image(entry)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = entry
+            ids.append(entry_id)
+            for field, weight in _FIELD_WEIGHTS:
+                for token in _tokenize(getattr(entry, field)):
+                    postings = self._postings[token]
+                    postings[entry_id] = postings.get(entry_id, 0.0) + weight
+        if ids:
+            self._pages[page_key(url)] = ids
+
+    def remove_page(self, url: str) -> None:
+        """Drop a page's diagrams."""
+        ids = self._pages.pop(page_key(url), [])
+        for entry_id in ids:
+            entry = self._entries.pop(entry_id)
+            # The page changed, so its images may have too
+            self._images.pop(entry.image_url, None)
+            for field, _ in _FIELD_WEIGHTS:
+                for token in _tokenize(getattr(entry, field)):
+                    postings = self._postings.get(token)
+                    if postings is not None:
+                        postings.pop(entry_id, None)
+                        if not postings:
+                            del self._postings[token]
+
+    def search(
+        self,
+        query: str,
+        max_results: int = 10,
+        page_scores: Optional[Dict[str, float]] = None,
+    ) -> List[DiagramEntry]:
+        """Find diagrams matching a keyword query.
+
+        Args:
+            query: Keywords matched against alt text, section, page title and context.
+            max_results: Maximum diagrams to return.
+            page_scores: Optional relevance of pages to the query (by page key),
+                added to the score of every diagram on those pages.
+
+        Returns:
+            Diagrams, most relevant first.
+        """
+        num_entries = len(self._entries) or 1
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(_tokenize(query)):
+            postings = self._postings.get(token, {})
+            idf = math.log(1 + num_entries / (1 + len(postings)))
+            for entry_id, weight in postings.items():
+                scores[entry_id] += weight * idf
+        for key, page_score in (page_scores or {}).items():
+            for entry_id in self._pages.get(key, []):
+                scores[entry_id] += page_score
+
+        ranked: List[Tuple[float, int]] = sorted(
+            ((score, entry_id) for entry_id, score in scores.items() if score > 0),
+            key=lambda item: (-item[0], item[1]),
+        )
+        return [self._entries[entry_id] for _, entry_id in ranked[:max_results]]
+
+    async def probe_images(
+        self, entries: Iterable[DiagramEntry], timeout: Optional[float] = None
+    ) -> None:
+        """Fill in the image metadata of diagrams, probing images not yet probed.
+
+        Each image is probed once; the result is kept for later calls.
+
+        Args:
+            entries: Diagrams from this catalog.
+            timeout: Seconds to wait for probes. Diagrams whose probe is still
+                running are left without metadata; the probe carries on in the
+                background and its result is kept.
+        """
+        entries = list(entries)
+        pending = []
+        for entry in entries:
+            url = entry.image_url
+            if url in self._images:
+                continue
+            task = self._probes.get(url)
+            if task is None:
+                task = self._probes[url] = asyncio.ensure_future(self._probe(url))
+            pending.append(task)
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        for entry in entries:
+            self._apply_image(entry)
+
+    async def _probe(self, url: str) -> None:
+        """Probe one image and cache its metadata."""
+        try:
+            async with self._probe_semaphore:
+                self._images[url] = await probe_image(url)
+        finally:
+            self._probes.pop(url, None)
+
+    def _apply_image(self, entry: DiagramEntry) -> None:
+        """Copy cached image metadata onto a diagram."""
+        info = self._images.get(entry.image_url)
+        if info is not None:
+            entry.format = info['format']
+            entry.width = info['width']
+            entry.height = info['height']
+            entry.bytes = info['bytes']
+
+    def browse(self, url_parts: Iterable[str], max_results: int = 10) -> List[DiagramEntry]:
+        """Return diagrams from pages whose URL contains any of ``url_parts``, in page order."""
+        parts = list(url_parts)
+        results = [
+            entry for entry in self._entries.values() if any(p in entry.page_url for p in parts)
+        ]
+        return results[:max_results]
+
+
+# Global singleton
+_catalog: Optional[DiagramCatalog] = None
+
+
+def get_diagram_catalog() -> DiagramCatalog:
+    """Get the global diagram catalog singleton."""
+    global _catalog
+    if _catalog is None:
+        _catalog = DiagramCatalog()
+    return _catalog
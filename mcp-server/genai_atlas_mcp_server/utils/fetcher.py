@@ -4,142 +4,604 @@
 """HTTP fetching utilities for the GenAI Atlas MCP Server."""
 
 import asyncio
-from typing import List, Optional
+import codecs
+import importlib.util
+import json
+import os
+import weakref
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
 
 import httpx
 from loguru import logger
 
 from ..config import config
+from .page_cache import get_page_cache
+from .pool_stats import PoolStats
+from .url_resolver import get_url_resolver
+from .url_utils import atlas_url_to_local_path, atlas_url_to_site_path, page_key
 
-# Module-level client for connection reuse across calls within the same event loop
-_client: Optional[httpx.AsyncClient] = None
-_client_lock: Optional[asyncio.Lock] = None
+# Read size for the local filesystem content source
+_FILE_CHUNK_SIZE = 64 * 1024
+# Seconds to wait for a client on another event loop to close
+_CLOSE_TIMEOUT = 5.0
 
+# One client per event loop: httpx connections are bound to the loop that opened
+# them, so each loop keeps its own warm pool instead of the client being torn
+# down whenever a different loop shows up.
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = (
+    weakref.WeakKeyDictionary()
+)
+_pool_stats = PoolStats()
 
-def _get_lock() -> asyncio.Lock:
-    """Get or create the asyncio lock for the current event loop."""
-    global _client_lock
-    if _client_lock is None:
-        _client_lock = asyncio.Lock()
-    return _client_lock
+
+def _http2_available() -> bool:
+    """Return True if the optional ``h2`` package is installed."""
+    return importlib.util.find_spec('h2') is not None
 
 
 def _create_client() -> httpx.AsyncClient:
-    """Create a new httpx async client."""
+    """Create a new httpx async client.
+
+    httpx advertises every content encoding it can decode, so installing the
+    ``compression`` extra adds ``br`` and ``zstd`` to ``Accept-Encoding``.
+    HTTP/2 (the ``http2`` extra) lets concurrent fetches share one connection.
+    """
     return httpx.AsyncClient(
         headers={'User-Agent': config.user_agent},
         follow_redirects=True,
         timeout=config.timeout,
+        http2=config.http2 and _http2_available(),
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
     )
 
 
 async def _get_client() -> httpx.AsyncClient:
-    """Get or create the shared async HTTP client (async-safe).
+    """Get or create the shared async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    # Clients of loops that have since closed cannot be used or closed — drop them
+    for stale_loop in [lp for lp in _clients if lp.is_closed()]:
+        del _clients[stale_loop]
+
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = _create_client()
+    return client
+
+
+def pool_stats() -> Dict[str, int]:
+    """Return connection pool statistics for the shared HTTP clients.
 
-    Handles stale clients from closed event loops by recreating them.
+    Returns:
+        Request and connection counters (``requests``, ``http2_requests``,
+        ``connections_opened``, ``connections_reused``) and, when the pools
+        can be inspected, the current ``open_connections`` and
+        ``idle_connections`` across all pools.
     """
-    global _client
-    if _client is not None and not _client.is_closed:
-        return _client
-    lock = _get_lock()
-    async with lock:
-        # Double-check after acquiring lock
-        if _client is not None and not _client.is_closed:
-            return _client
-        _client = _create_client()
-        return _client
+    return _pool_stats.snapshot(list(_clients.values()))
+
+
+def _incremental_decoder(response: httpx.Response) -> codecs.IncrementalDecoder:
+    """Build an incremental text decoder for the response's declared charset."""
+    encoding = response.charset_encoding or 'utf-8'
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
 
+async def _stream_body(
+    client: httpx.AsyncClient,
+    url: str,
+    on_chunk: Callable[[str], None],
+    missing_ok: bool = False,
+) -> bool:
+    """Stream a response body through ``on_chunk`` as decoded text.
 
-async def _safe_request(method: str, url: str) -> Optional[httpx.Response]:
-    """Make an HTTP request, handling stale client errors.
+    The body is never held in full: each network chunk is decoded incrementally
+    and handed to the consumer, and the download is aborted once it exceeds
+    ``config.max_response_bytes``.
+
+    Returns:
+        True if the whole body was delivered, False on HTTP error or size overrun.
+    """
+    limit = config.max_response_bytes
+    async with client.stream(
+        'GET', url, extensions={'trace': _pool_stats.tracer()}
+    ) as response:
+        if response.status_code >= 400:
+            if missing_ok and response.status_code == 404:
+                logger.debug(f'Not found: {url}')
+            else:
+                logger.error(f'Failed to fetch {url} — status {response.status_code}')
+            return False
+
+        declared = response.headers.get('content-length', '')
+        if declared.isdigit() and int(declared) > limit:
+            logger.error(f'Refusing {url} — declared size {declared} exceeds {limit} bytes')
+            return False
+
+        decoder = _incremental_decoder(response)
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > limit:
+                logger.error(f'Aborted {url} — body exceeds {limit} bytes')
+                return False
+            text = decoder.decode(chunk)
+            if text:
+                on_chunk(text)
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            on_chunk(tail)
+    return True
+
+
+def _open_local(url: str) -> Tuple[Path, BinaryIO, int]:
+    """Resolve an Atlas URL to a file of the local site build and open it.
+
+    Blocking; called through ``asyncio.to_thread``.
+
+    Returns:
+        The path, the open file and its size in bytes.
+
+    Raises:
+        FileNotFoundError: If the URL does not map to a file in the site.
+    """
+    path = atlas_url_to_local_path(url)
+    if path is None:
+        raise FileNotFoundError(f'{url} is outside the local site build')
+    f = path.open('rb')
+    try:
+        return path, f, os.fstat(f.fileno()).st_size
+    except BaseException:
+        f.close()
+        raise
+
+
+async def _stream_file(
+    url: str, on_chunk: Callable[[str], None], missing_ok: bool = False
+) -> bool:
+    """Stream a file from the local site build through ``on_chunk``.
+
+    Mirrors ``_stream_body`` for the local content source: same size limit,
+    same incremental UTF-8 decoding. The path is resolved, and the file opened
+    and read, in a worker thread, one chunk at a time, so filesystem access
+    never blocks the event loop; ``on_chunk`` runs on the loop as for network
+    responses.
+
+    Returns:
+        True if the whole file was delivered, False if missing or too large.
+    """
+    limit = config.max_response_bytes
+    try:
+        path, f, size = await asyncio.to_thread(_open_local, url)
+    except FileNotFoundError as e:
+        if missing_ok:
+            logger.debug(f'Not found: {url}')
+        else:
+            logger.error(f'Failed to read {url}: {e}')
+        return False
+    except OSError as e:
+        logger.error(f'Failed to read {url}: {e}')
+        return False
+    try:
+        if size > limit:
+            logger.error(f'Refusing {path} — size exceeds {limit} bytes')
+            return False
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        while chunk := await asyncio.to_thread(f.read, _FILE_CHUNK_SIZE):
+            text = decoder.decode(chunk)
+            if text:
+                on_chunk(text)
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            on_chunk(tail)
+    except OSError as e:
+        logger.error(f'Failed to read {path}: {e}')
+        return False
+    finally:
+        f.close()
+    return True
+
+
+async def fetch_stream(
+    url: str, on_chunk: Callable[[str], None], missing_ok: bool = False
+) -> bool:
+    """Stream decoded text from a URL into a consumer.
+
+    Use this to feed incremental parsers directly from the source without
+    buffering the full body. When a local site build is configured
+    (``config.site_dir``), Atlas URLs are served from disk instead of HTTP.
 
     Args:
-        method: HTTP method ('get').
         url: The URL to fetch.
+        on_chunk: Called with each decoded text chunk, in order.
+        missing_ok: Log a 404 at debug rather than error level (for probes).
 
     Returns:
-        The response, or None if the request failed.
+        True if the full body was delivered, False if the fetch failed.
     """
-    global _client
+    if atlas_url_to_site_path(url) is not None:
+        return await _stream_file(url, on_chunk, missing_ok)
+
     client = await _get_client()
     try:
-        return await client.get(url)
-    except RuntimeError:
-        # Client was bound to a closed event loop — recreate it
-        logger.debug(f'Recreating HTTP client (stale event loop) for {url}')
-        _client = _create_client()
-        try:
-            return await _client.get(url)
-        except httpx.HTTPError as e:
-            logger.error(f'HTTP error fetching {url} after client reset: {e}')
-            return None
+        return await _stream_body(client, url, on_chunk, missing_ok)
     except httpx.HTTPError as e:
         logger.error(f'HTTP error fetching {url}: {e}')
-        return None
+        return False
 
 
-async def fetch_url(url: str) -> Optional[str]:
+async def fetch_url(url: str, missing_ok: bool = False) -> Optional[str]:
     """Fetch content from a URL.
 
     Args:
         url: The URL to fetch.
+        missing_ok: Log a 404 at debug rather than error level (for probes).
 
     Returns:
         The response text, or None if the fetch failed.
     """
-    response = await _safe_request('get', url)
-    if response is None:
+    chunks: List[str] = []
+    if not await fetch_stream(url, chunks.append, missing_ok):
         return None
-    if response.status_code >= 400:
-        logger.error(f'Failed to fetch {url} — status {response.status_code}')
-        return None
-    return response.text
+    return ''.join(chunks)
 
 
 async def fetch_json(url: str) -> Optional[dict]:
     """Fetch JSON content from a URL.
 
+    For large documents with one big array, prefer ``fetch_stream`` with a
+    ``JsonArrayStream`` parser.
+
     Args:
         url: The URL to fetch.
 
     Returns:
         Parsed JSON as a dict, or None if the fetch failed.
     """
-    response = await _safe_request('get', url)
-    if response is None:
-        return None
-    if response.status_code >= 400:
-        logger.error(f'Failed to fetch {url} — status {response.status_code}')
+    text = await fetch_url(url)
+    if text is None:
         return None
     try:
-        return response.json()
+        return json.loads(text)
     except ValueError as e:
         logger.error(f'Error parsing JSON from {url}: {e}')
         return None
 
 
-async def fetch_urls_concurrent(urls: List[str], max_concurrent: int = 5) -> List[Optional[str]]:
+def _read_file_head(url: str, max_bytes: int) -> Optional[Tuple[bytes, Optional[int]]]:
+    """Read the first ``max_bytes`` of a file from the local site build.
+
+    Blocking; called through ``asyncio.to_thread``.
+    """
+    try:
+        _, f, size = _open_local(url)
+        with f:
+            return f.read(max_bytes), size
+    except FileNotFoundError:
+        logger.debug(f'Not found: {url}')
+    except OSError as e:
+        logger.error(f'Failed to read {url}: {e}')
+    return None
+
+
+def _total_size(response: httpx.Response, complete_size: Optional[int]) -> Optional[int]:
+    """Size of the whole resource behind a (possibly ranged) response.
+
+    ``complete_size`` is the number of bytes received if the body was read to
+    the end, used when the server reports no size.
+    """
+    if response.status_code == 206:
+        total = response.headers.get('content-range', '').rpartition('/')[2]
+        return int(total) if total.isdigit() else None
+    declared = response.headers.get('content-length', '')
+    return int(declared) if declared.isdigit() else complete_size
+
+
+async def fetch_head(url: str, max_bytes: int) -> Optional[Tuple[bytes, Optional[int]]]:
+    """Fetch the first bytes of a resource without downloading the rest.
+
+    Sends a ranged GET and closes the connection once ``max_bytes`` have
+    arrived, so servers that ignore ``Range`` still transfer little more than
+    the requested prefix. Local site builds are read from disk.
+
+    Args:
+        url: The URL to fetch.
+        max_bytes: Number of leading bytes wanted.
+
+    Returns:
+        ``(head, total_size)`` where ``total_size`` is the full size in bytes
+        if the server reported it, or None if the fetch failed.
+    """
+    if atlas_url_to_site_path(url) is not None:
+        return await asyncio.to_thread(_read_file_head, url, max_bytes)
+
+    client = await _get_client()
+    try:
+        async with client.stream(
+            'GET',
+            url,
+            headers={'Range': f'bytes=0-{max_bytes - 1}'},
+            extensions={'trace': _pool_stats.tracer()},
+        ) as response:
+            if response.status_code >= 400:
+                logger.debug(f'Failed to fetch {url} — status {response.status_code}')
+                return None
+            head = bytearray()
+            complete_size: Optional[int] = None
+            async for chunk in response.aiter_bytes():
+                head += chunk
+                if len(head) >= max_bytes:
+                    break
+            else:
+                complete_size = len(head)
+            return bytes(head[:max_bytes]), _total_size(response, complete_size)
+    except httpx.HTTPError as e:
+        logger.debug(f'HTTP error fetching {url}: {e}')
+        return None
+
+
+async def _race_candidates(url: str) -> Optional[Tuple[str, str]]:
+    """Fetch all candidate URL patterns for an unknown page concurrently.
+
+    The first candidate to return a page wins; the others are cancelled and
+    the winning URL and pattern are remembered by the resolver.
+    """
+    resolver = get_url_resolver()
+    candidates = resolver.candidates(url)
+
+    async def _probe(pattern: str, candidate: str) -> Optional[Tuple[str, str, str]]:
+        html = await fetch_url(candidate, missing_ok=True)
+        return None if html is None else (pattern, candidate, html)
+
+    tasks = [asyncio.ensure_future(_probe(pattern, c)) for pattern, c in candidates]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result is not None:
+                pattern, candidate, html = result
+                resolver.learn(url, pattern, candidate)
+                return html, candidate
+    finally:
+        for task in tasks:
+            task.cancel()
+    return None
+
+
+class _PageFetch:
+    """An in-flight origin fetch of one page, shared by every caller waiting on it."""
+
+    def __init__(self, task: 'asyncio.Future[Optional[Tuple[str, str]]]'):
+        """Track a fetch task with no waiters yet."""
+        self.task = task
+        self.waiters = 0
+        # Set once a caller gave up at its deadline; the fetch then finishes as
+        # a background refresh instead of being cancelled with its last waiter.
+        self.detached = False
+
+
+# In-flight page fetches by page key
+_page_fetches: Dict[str, _PageFetch] = {}
+
+
+async def _fetch_page_from_origin(url: str) -> Optional[Tuple[str, str]]:
+    """Fetch a page by its canonical URL (or by probing) and cache it."""
+    resolver = get_url_resolver()
+    canonical = resolver.lookup(url)
+    if canonical is not None:
+        html = await fetch_url(canonical)
+        if html is not None:
+            get_page_cache().put(url, html, canonical)
+            return html, canonical
+        # The table is stale (e.g. the page moved) — fall back to probing
+        resolver.forget(url)
+
+    fetched = await _race_candidates(url)
+    if fetched is not None:
+        get_page_cache().put(url, *fetched)
+    return fetched
+
+
+def _start_page_fetch(url: str) -> _PageFetch:
+    """Join the in-flight fetch of a page, or start one."""
+    key = page_key(url)
+    flight = _page_fetches.get(key)
+    if flight is None or flight.task.done():
+        flight = _PageFetch(asyncio.ensure_future(_fetch_page_from_origin(url)))
+        _page_fetches[key] = flight
+
+        def _forget(_task: asyncio.Future) -> None:
+            if _page_fetches.get(key) is flight:
+                del _page_fetches[key]
+
+        flight.task.add_done_callback(_forget)
+    return flight
+
+
+async def _await_page_fetch(
+    flight: _PageFetch, deadline: Optional[float] = None
+) -> Optional[Tuple[str, str]]:
+    """Wait for a shared page fetch, at most ``deadline`` seconds.
+
+    If the caller is cancelled and nobody else needs the result, the fetch is
+    cancelled too. On a deadline the fetch is left running so it refreshes the
+    cache in the background.
+
+    Raises:
+        asyncio.TimeoutError: If the deadline passed first.
+    """
+    flight.waiters += 1
+    try:
+        return await asyncio.wait_for(asyncio.shield(flight.task), deadline)
+    except asyncio.TimeoutError:
+        flight.detached = True
+        raise
+    except asyncio.CancelledError:
+        if flight.waiters == 1 and not flight.detached:
+            flight.task.cancel()
+        raise
+    finally:
+        flight.waiters -= 1
+
+
+async def fetch_atlas_page(url: str) -> Optional[Tuple[str, str]]:
+    """Fetch an Atlas page by any of its URL forms.
+
+    Known pages (from the search index, llms.txt or an earlier probe) are
+    fetched from their canonical HTML URL in one request. Unknown URLs race
+    every MkDocs deployment pattern — directory style, ``.html`` (file-style
+    builds, e.g. with the offline plugin) and ``index.html`` — concurrently.
+    Successful fetches are kept in the shared page cache; concurrent callers
+    for one page share a single fetch.
+
+    Args:
+        url: The Atlas page URL (``.md``, ``.html`` or directory style).
+
+    Returns:
+        ``(html, fetched_url)``, or None if no pattern could be fetched. When
+        the origin fails, an expired cached copy is returned if there is one.
+    """
+    cache = get_page_cache()
+    entry = cache.get_entry(url)
+    if entry is not None and cache.is_fresh(entry):
+        return entry.html, entry.fetched_url
+
+    fetched = await _await_page_fetch(_start_page_fetch(url))
+    if fetched is None and entry is not None:
+        return entry.html, entry.fetched_url
+    return fetched
+
+
+async def fetch_atlas_page_within(
+    url: str, deadline: float
+) -> Optional[Tuple[str, str, Optional[float]]]:
+    """Fetch an Atlas page, answering from a stale copy if the origin is slow.
+
+    Fresh cached pages are returned immediately. Otherwise the page is
+    fetched; if that takes longer than ``deadline`` seconds (or fails) and an
+    expired copy is cached, the copy is returned and the fetch carries on in
+    the background to refresh the cache.
+
+    Args:
+        url: The Atlas page URL (``.md``, ``.html`` or directory style).
+        deadline: Seconds to wait for the origin (``<= 0`` waits for the
+            request timeout).
+
+    Returns:
+        ``(html, fetched_url, stale_age)`` where ``stale_age`` is the age in
+        seconds of a stale copy, or None for a fresh page. None if the page
+        could not be fetched and nothing is cached.
+
+    Raises:
+        asyncio.TimeoutError: If the deadline passed with nothing cached; the
+            fetch continues in the background, so a retry is usually fast.
+    """
+    cache = get_page_cache()
+    entry = cache.get_entry(url)
+    if entry is not None and cache.is_fresh(entry):
+        return entry.html, entry.fetched_url, None
+
+    try:
+        fetched = await _await_page_fetch(
+            _start_page_fetch(url), deadline if deadline > 0 else None
+        )
+    except asyncio.TimeoutError:
+        if entry is None:
+            raise
+        logger.info(f'Serving stale copy of {url}; refreshing in the background')
+        return entry.html, entry.fetched_url, entry.age
+
+    if fetched is not None:
+        return fetched[0], fetched[1], None
+    if entry is not None:
+        return entry.html, entry.fetched_url, entry.age
+    return None
+
+
+def staleness_note(age: float) -> str:
+    """Return the note appended to answers served from a stale cached copy."""
+    minutes = max(1, round(age / 60))
+    return (
+        f'\n\n---\nNote: The Atlas site did not respond in time; this is a cached copy '
+        f'from about {minutes} minute(s) ago. A refresh is running in the background.'
+    )
+
+
+def deadline_error(url: str, deadline: float) -> str:
+    """Return the error for a page that missed the tool deadline with nothing cached."""
+    return (
+        f'Error: {url} did not respond within {deadline:g}s. It is still being fetched '
+        f'in the background — retry shortly.'
+    )
+
+
+async def fetch_urls_concurrent(
+    urls: List[str], max_concurrent: int = 5, deadline: Optional[float] = None
+) -> List[Optional[str]]:
     """Fetch multiple URLs concurrently with a concurrency limit.
 
+    Cancelling the caller cancels every outstanding request.
+
     Args:
         urls: List of URLs to fetch.
         max_concurrent: Maximum concurrent requests.
+        deadline: Seconds to wait overall; requests still running then are
+            cancelled and count as failed.
 
     Returns:
         List of response texts (None for failed fetches), in same order as input URLs.
     """
+    if not urls:
+        return []
     semaphore = asyncio.Semaphore(max_concurrent)
 
     async def _fetch_one(url: str) -> Optional[str]:
         async with semaphore:
             return await fetch_url(url)
 
-    return await asyncio.gather(*[_fetch_one(url) for url in urls])
+    tasks = [asyncio.ensure_future(_fetch_one(url)) for url in urls]
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        if pending:
+            logger.warning(f'{len(pending)} of {len(urls)} fetches missed the deadline')
+    finally:
+        for task in tasks:
+            task.cancel()
+    return [
+        task.result() if task.done() and not task.cancelled() and not task.exception() else None
+        for task in tasks
+    ]
 
 
 async def close_client() -> None:
-    """Close the shared HTTP client. Call during server shutdown."""
-    global _client
-    if _client and not _client.is_closed:
-        await _client.aclose()
-        _client = None
+    """Close every shared HTTP client. Call during server shutdown.
+
+    Each client is closed on its own event loop: the running loop's directly,
+    another running loop's through ``run_coroutine_threadsafe``. Clients of
+    loops that are stopped or closed cannot be closed any more (their
+    transports belong to that loop) and are only dropped.
+    """
+    for flight in list(_page_fetches.values()):
+        flight.task.cancel()
+    logger.info(f'HTTP pool stats: {pool_stats()}')
+    current = asyncio.get_running_loop()
+    for loop, client in list(_clients.items()):
+        del _clients[loop]
+        if client.is_closed:
+            continue
+        if loop is current:
+            await client.aclose()
+        elif loop.is_running():
+            closing = asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            try:
+                await asyncio.wait_for(asyncio.wrap_future(closing), _CLOSE_TIMEOUT)
+            except (asyncio.TimeoutError, RuntimeError) as e:
+                logger.warning(f'Could not close the HTTP client of another event loop: {e}')
+        else:
+            logger.debug('Dropping the HTTP client of a stopped event loop')
@@ -5,28 +5,100 @@
 
 Follows the same pattern as the AWS Documentation MCP server — extracts the
 main content area, strips navigation/footer elements, and converts to markdown.
+
+Each page is parsed once: markdownify walks the already-parsed content tree
+(``MarkdownConverter.convert_soup``) instead of re-parsing serialized HTML,
+and callers that need several views of a page (markdown and diagrams) share
+one parse through ``parse_html``.
+
+The BeautifulSoup tree builder is chosen by ``config.html_parser``: ``auto``
+uses lxml when it is installed (the ``lxml`` extra) and the standard
+library's ``html.parser`` otherwise. Both produce identical markdown for
+Atlas pages.
 """
 
-from typing import List
+import copy
+import importlib.util
+from functools import lru_cache
+from typing import List, Tuple, Union
+from urllib.parse import urljoin
 
 import markdownify
 from bs4 import BeautifulSoup, Tag
+from loguru import logger
 
+from ..config import config
 
-def html_to_markdown(html: str) -> str:
-    """Convert HTML content to clean Markdown.
+PARSER_BACKENDS = ('html.parser', 'lxml')
+
+# Images narrower than this (in pixels) are icons or decorations, not diagrams
+MIN_DIAGRAM_WIDTH = 100
+
+_MARKDOWN_OPTIONS = {
+    'heading_style': markdownify.ATX,
+    'autolinks': True,
+    'escape_asterisks': True,
+    'escape_underscores': True,
+    'newline_style': 'SPACES',
+}
 
-    Args:
-        html: Raw HTML content.
+
+# Page chrome removed from the main content (MkDocs Material theme)
+_CHROME_TAGS = frozenset({'nav', 'header', 'footer', 'script', 'style', 'noscript'})
+_CHROME_CLASSES = frozenset({
+    'md-header',
+    'md-footer',
+    'md-sidebar',
+    'md-tabs',
+    'md-search',
+    'md-top',
+    'headerlink',
+})
+
+
+@lru_cache(maxsize=None)
+def _backend_available(backend: str) -> bool:
+    """Return True if a parser backend can be used."""
+    return backend == 'html.parser' or importlib.util.find_spec(backend) is not None
+
+
+def parser_backend() -> str:
+    """Return the BeautifulSoup tree builder to use, per ``config.html_parser``.
 
     Returns:
-        Cleaned markdown text.
+        ``'lxml'`` or ``'html.parser'``. An unknown or unavailable configured
+        backend falls back to ``html.parser`` with a warning.
     """
-    if not html:
-        return ''
+    wanted = config.html_parser
+    if wanted == 'auto':
+        return 'lxml' if _backend_available('lxml') else 'html.parser'
+    if wanted in PARSER_BACKENDS and _backend_available(wanted):
+        return wanted
+    logger.warning(f'HTML parser {wanted!r} is not available; using html.parser')
+    return 'html.parser'
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse a page into a tree for the ``*_from_soup`` helpers.
+
+    MkDocs Material pages carry the whole site navigation around a single
+    ``<article>``; building a tree for that navigation is most of the cost of
+    a parse, and none of it is content. When the page has an ``<article>``
+    only that element is parsed.
+    """
+    start = html.find('<article')
+    end = html.rfind('</article>')
+    if start != -1 and end > start:
+        html = html[start:end + len('</article>')]
+    return BeautifulSoup(html, parser_backend())
 
-    soup = BeautifulSoup(html, 'html.parser')
 
+def select_main_content(soup: Union[BeautifulSoup, Tag]) -> Tag:
+    """Return the main content element of a parsed page, stripped of page chrome.
+
+    The page chrome is removed in place, so extract anything else needed from
+    the tree (e.g. diagrams) first.
+    """
     # Find main content area (MkDocs Material theme selectors)
     main_content = None
     content_selectors = [
@@ -46,41 +118,75 @@ def html_to_markdown(html: str) -> str:
     if not main_content:
         main_content = soup.body if soup.body else soup
 
-    # Remove navigation and non-content elements
-    remove_selectors = [
-        'nav',
-        'header',
-        'footer',
-        '.md-header',
-        '.md-footer',
-        '.md-sidebar',
-        '.md-tabs',
-        '.md-search',
-        '.md-top',
-        '.headerlink',
-        'script',
-        'style',
-        'noscript',
-    ]
-    for selector in remove_selectors:
-        for element in main_content.select(selector):
-            element.decompose()
-
-    content = markdownify.markdownify(
-        str(main_content),
-        heading_style=markdownify.ATX,
-        autolinks=True,
-        escape_asterisks=True,
-        escape_underscores=True,
-        newline_style='SPACES',
-    )
+    # Remove navigation and non-content elements, in one walk of the tree
+    for element in main_content.find_all(_is_chrome):
+        element.decompose()
+
+    return main_content
+
+
+def _is_chrome(tag: Tag) -> bool:
+    """Return True for navigation and other non-content elements."""
+    return tag.name in _CHROME_TAGS or not _CHROME_CLASSES.isdisjoint(tag.get('class') or ())
 
+
+def soup_to_markdown(element: Union[BeautifulSoup, Tag]) -> str:
+    """Convert a parsed element to markdown in a single walk of its tree."""
+    content = markdownify.MarkdownConverter(**_MARKDOWN_OPTIONS).convert_soup(element)
     if not content:
         return ''
-
     return content.strip()
 
 
+def html_to_markdown(html: str) -> str:
+    """Convert HTML content to clean Markdown.
+
+    Args:
+        html: Raw HTML content.
+
+    Returns:
+        Cleaned markdown text.
+    """
+    if not html:
+        return ''
+
+    return soup_to_markdown(select_main_content(parse_html(html)))
+
+
+def html_to_text(html: str) -> Tuple[str, str]:
+    """Extract the title and plain text of a page, as MkDocs search indexes it.
+
+    Args:
+        html: Raw HTML content.
+
+    Returns:
+        ``(title, text)``; the title is the first H1, or empty if there is none.
+    """
+    if not html:
+        return '', ''
+    main_content = select_main_content(parse_html(html))
+    h1 = main_content.find('h1')
+    title = h1.get_text(' ', strip=True) if h1 else ''
+    return title, main_content.get_text(' ', strip=True)
+
+
+def normalize_heading(title: str) -> str:
+    """Normalize a heading title for matching.
+
+    Strips the pilcrow (¶) MkDocs appends to headings, collapses whitespace,
+    lowercases, and folds common variations (TL;DR vs TL:DR, en/em dashes).
+
+    Args:
+        title: The heading or requested section title.
+
+    Returns:
+        The normalized matching key.
+    """
+    cleaned = title.strip().replace('¶', '').strip()
+    key = ' '.join(cleaned.lower().split())
+    return key.replace(';', ':').replace('–', '-').replace('—', '-')
+
+
 def extract_sections(html: str, section_titles: List[str]) -> str:
     """Extract specific sections from HTML by heading title.
 
@@ -97,22 +203,19 @@ def extract_sections(html: str, section_titles: List[str]) -> str:
     if not html or not section_titles:
         raise ValueError('No content or section titles provided')
 
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = parse_html(html)
 
     # Normalize requested titles
     normalized_titles = {}
     for title in section_titles:
-        # Strip pilcrow (¶) and other anchor markers that MkDocs appends to headings
         cleaned = title.strip().replace('¶', '').strip()
-        # Normalize common variations (TL;DR vs TL:DR)
-        key = ' '.join(cleaned.lower().split())
-        key = key.replace(';', ':').replace('–', '-').replace('—', '-')
-        normalized_titles[key] = cleaned
+        normalized_titles[normalize_heading(title)] = cleaned
 
     # Find all headings (h2, h3, h4)
     headings = soup.find_all(['h2', 'h3', 'h4'])
     available_sections = []
-    matched_html = []
+    # Matched sections are copied into a fragment tree and converted in one walk
+    fragment = BeautifulSoup('', parser_backend())
     found = set()
 
     for heading in headings:
@@ -121,8 +224,7 @@ def extract_sections(html: str, section_titles: List[str]) -> str:
         heading_clean = heading_text.replace('¶', '').strip()
         available_sections.append(heading_clean)
 
-        normalized = ' '.join(heading_clean.lower().split())
-        normalized = normalized.replace(';', ':').replace('–', '-').replace('—', '-')
+        normalized = normalize_heading(heading_clean)
         if normalized in normalized_titles:
             section_content = [heading]
             heading_level = int(heading.name[1])  # h2 -> 2, h3 -> 3
@@ -134,8 +236,9 @@ def extract_sections(html: str, section_titles: List[str]) -> str:
                         break
                 section_content.append(sibling)
 
-            section_html = ''.join(str(elem) for elem in section_content)
-            matched_html.append(section_html)
+            # Copies, since overlapping sections (an h3 inside a matched h2) share elements
+            for elem in section_content:
+                fragment.append(copy.copy(elem))
             found.add(normalized_titles[normalized])
 
     if not found:
@@ -151,18 +254,19 @@ def extract_sections(html: str, section_titles: List[str]) -> str:
             'Use read_topic to get the full document.'
         )
 
-    result_html = ''.join(matched_html)
-
     # Note missing sections
     if len(found) < len(section_titles):
         missing = [t.strip() for t in section_titles if t.strip() not in found]
         missing_list = ', '.join(f'"{t}"' for t in missing)
-        result_html += (
-            f'\n\n<p><strong>Note</strong>: '
-            f'Sections not found: {missing_list}</p>'
-        )
+        note = fragment.new_tag('p')
+        label = fragment.new_tag('strong')
+        label.string = 'Note'
+        note.append(label)
+        note.append(f': Sections not found: {missing_list}')
+        fragment.append('\n\n')
+        fragment.append(note)
 
-    return html_to_markdown(result_html)
+    return soup_to_markdown(select_main_content(fragment))
 
 
 def extract_diagrams(html: str, page_url: str) -> list:
@@ -173,12 +277,16 @@ def extract_diagrams(html: str, page_url: str) -> list:
         page_url: URL of the page (for resolving relative image paths).
 
     Returns:
-        List of dicts with title, image_url, context, page_url.
+        List of dicts with title, image_url, context, and the title and anchor
+        of the section the image is in (``section``, ``anchor``).
     """
     if not html:
         return []
+    return diagrams_from_soup(parse_html(html), page_url)
+
 
-    soup = BeautifulSoup(html, 'html.parser')
+def diagrams_from_soup(soup: Union[BeautifulSoup, Tag], page_url: str) -> list:
+    """Extract diagram/image references from a parsed page (see ``extract_diagrams``)."""
     diagrams = []
 
     for img in soup.find_all('img'):
@@ -202,18 +310,12 @@ def extract_diagrams(html: str, page_url: str) -> list:
 
         width = img.get('width', '')
         width_str = width if isinstance(width, str) else str(width[0]) if width else ''
-        if width_str and width_str.isdigit() and int(width_str) < 100:
+        if width_str and width_str.isdigit() and int(width_str) < MIN_DIAGRAM_WIDTH:
             continue
 
-        # Resolve relative URLs
-        if src_str.startswith('./') or not src_str.startswith('http'):
-            # Build absolute URL from page URL
-            base = page_url.rsplit('/', 1)[0]
-            if src_str.startswith('./'):
-                src_str = src_str[2:]
-            image_url = f'{base}/{src_str}'
-        else:
-            image_url = src_str
+        # Resolve relative URLs against the page, folding ./ and ../ segments (as the
+        # content_pack_hook does at build time)
+        image_url = urljoin(page_url, src_str)
 
         # Get surrounding context (caption or nearby text)
         context = ''
@@ -228,10 +330,16 @@ def extract_diagrams(html: str, page_url: str) -> list:
                 if next_elem:
                     context = next_elem.get_text(strip=True)[:200]
 
+        # Section the image appears in
+        heading = img.find_previous(['h1', 'h2', 'h3', 'h4'])
+        section = heading.get_text(strip=True).replace('¶', '').strip() if heading else ''
+
         diagrams.append({
             'title': alt_str,
             'image_url': image_url,
             'context': context,
+            'section': section,
+            'anchor': heading.get('id', '') if heading else '',
         })
 
     return diagrams
@@ -0,0 +1,178 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Image metadata from the first bytes of an image.
+
+Diagrams are listed with their format, pixel dimensions and byte size so
+clients can decide whether to show one without downloading it. PNG, GIF and
+WebP store their dimensions in a fixed header; JPEG stores them in the first
+SOF segment, after any EXIF data; SVG in the root element's ``width`` and
+``height`` or ``viewBox``. A ranged GET for the first few kilobytes (or a
+local file read for a site build) is enough for all of them.
+
+The format is sniffed from the bytes, not the file extension: some Atlas
+images named ``.jpg`` are PNGs.
+"""
+
+import re
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from .fetcher import fetch_head
+
+# Bytes read first; enough unless a JPEG has large EXIF data or an SVG a long prologue
+PROBE_BYTES = 4096
+
+# Bytes read when the first read was not enough
+MAX_PROBE_BYTES = 64 * 1024
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# JPEG start-of-frame markers (all except DHT, JPG and DAC)
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_SVG_TAG_RE = re.compile(rb'<svg\b[^>]*>', re.IGNORECASE)
+_SVG_LENGTH_RE = r'\s*([0-9]*\.?[0-9]+)\s*(px)?\s*$'
+
+ImageInfo = Tuple[str, Optional[int], Optional[int]]
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Walk JPEG segments up to the first SOF and return ``(width, height)``."""
+    offset = 2
+    while offset + 9 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # fill byte
+            offset += 1
+            continue
+        if marker in _JPEG_SOF:
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        (length,) = struct.unpack('>H', data[offset + 2:offset + 4])
+        offset += 2 + length
+    return None
+
+
+def _svg_attribute(tag: str, name: str) -> Optional[str]:
+    """Return an attribute value of an SVG start tag."""
+    match = re.search(rf'\s{name}\s*=\s*["\']([^"\']*)["\']', tag)
+    return match.group(1) if match else None
+
+
+def _svg_length(value: Optional[str]) -> Optional[int]:
+    """Convert an absolute SVG length (``"640"``, ``"640px"``) to pixels."""
+    match = re.match(_SVG_LENGTH_RE, value or '')
+    return round(float(match.group(1))) if match else None
+
+
+def _svg_size(data: bytes) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """Return the ``(width, height)`` of an SVG's root element, if found."""
+    match = _SVG_TAG_RE.search(data)
+    if match is None:
+        return None
+    tag = match.group(0).decode('utf-8', errors='replace')
+    width = _svg_length(_svg_attribute(tag, 'width'))
+    height = _svg_length(_svg_attribute(tag, 'height'))
+    view_box = (_svg_attribute(tag, 'viewBox') or '').replace(',', ' ').split()
+    if (width is None or height is None) and len(view_box) == 4:
+        try:
+            width = width or round(float(view_box[2]))
+            height = height or round(float(view_box[3]))
+        except ValueError:
+            pass
+    return width, height
+
+
+def _webp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Return the ``(width, height)`` of a WebP image from its first chunk."""
+    chunk = data[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        bits = int.from_bytes(data[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        return (
+            int.from_bytes(data[24:27], 'little') + 1,
+            int.from_bytes(data[27:30], 'little') + 1,
+        )
+    return None
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    """Identify an image format from its leading bytes."""
+    if data.startswith(_PNG_SIGNATURE):
+        return 'png'
+    if data.startswith(b'\xff\xd8'):
+        return 'jpeg'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    if b'<svg' in data[:MAX_PROBE_BYTES].lower():
+        return 'svg'
+    return None
+
+
+def parse_image_header(data: bytes) -> Optional[ImageInfo]:
+    """Read an image's format and dimensions from its leading bytes.
+
+    Args:
+        data: The first bytes of the image.
+
+    Returns:
+        ``(format, width, height)``, or None if the format is unknown or the
+        dimensions lie beyond ``data``. SVG dimensions are None when the
+        image only has relative sizes.
+    """
+    image_format = sniff_format(data)
+    size: Optional[Tuple[Optional[int], Optional[int]]] = None
+    if image_format == 'png' and len(data) >= 24 and data[12:16] == b'IHDR':
+        size = struct.unpack('>II', data[16:24])
+    elif image_format == 'jpeg':
+        size = _jpeg_size(data)
+    elif image_format == 'gif' and len(data) >= 10:
+        size = struct.unpack('<HH', data[6:10])
+    elif image_format == 'webp' and len(data) >= 30:
+        size = _webp_size(data)
+    elif image_format == 'svg':
+        size = _svg_size(data)
+    if image_format is None or size is None:
+        return None
+    return image_format, size[0], size[1]
+
+
+async def probe_image(url: str) -> Optional[Dict[str, Any]]:
+    """Fetch an image's metadata from its first bytes.
+
+    Reads ``PROBE_BYTES``, and up to ``MAX_PROBE_BYTES`` only when the
+    dimensions lie further in (JPEGs with large EXIF data, SVGs with long
+    prologues).
+
+    Args:
+        url: URL of the image.
+
+    Returns:
+        ``format``, ``width``, ``height`` and ``bytes`` (the full file size,
+        None if the server did not report it), or None if the image could not
+        be fetched or recognized.
+    """
+    fetched = await fetch_head(url, PROBE_BYTES)
+    if fetched is None:
+        return None
+    head, size = fetched
+    info = parse_image_header(head)
+    if info is None and len(head) >= PROBE_BYTES:
+        fetched = await fetch_head(url, MAX_PROBE_BYTES)
+        if fetched is None:
+            return None
+        head, size = fetched
+        info = parse_image_header(head)
+    if info is None:
+        logger.debug(f'Could not read image metadata from {url}')
+        return None
+    image_format, width, height = info
+    return {'format': image_format, 'width': width, 'height': height, 'bytes': size}
@@ -0,0 +1,240 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Incremental JSON decoding for large documents.
+
+The Atlas search_index.json is a single object whose ``docs`` array holds the
+full text of every page. Rather than buffering the whole body and handing it
+to ``json.loads``, the parser here is fed text chunks as they arrive and emits
+each array element as soon as it is complete, so only one element (plus the
+unconsumed tail of the current chunk) is held in memory at a time.
+"""
+
+import json
+import re
+from typing import Any, List
+
+_WHITESPACE = ' \t\n\r'
+# Characters that matter when finding the end of a string, object or array
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_STRUCTURE_RE = re.compile(r'["{}\[\]]')
+
+# Parser states
+_START = 'start'  # expecting the opening '{' of the top-level object
+_KEY = 'key'  # expecting a member name or '}'
+_COLON = 'colon'  # expecting ':' after a member name
+_VALUE = 'value'  # expecting a member value to skip
+_MEMBER_SEP = 'member_sep'  # expecting ',' or '}' after a member value
+_ITEM = 'item'  # expecting an array element or ']'
+_ITEM_SEP = 'item_sep'  # expecting ',' or ']' after an element
+_DONE = 'done'  # the target array has been fully consumed
+
+
+class JsonArrayStream:
+    """Push parser that yields the elements of one top-level array member.
+
+    Example:
+        ``{"config": {...}, "docs": [{...}, {...}]}`` with ``key='docs'``
+        yields each object in ``docs`` in order.
+    """
+
+    def __init__(self, key: str):
+        """Initialize a parser for the array stored under ``key``."""
+        self._key = key
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._state = _START
+        self._in_target = False
+        # Scan progress through the value at self._pos, kept between chunks
+        self._scan = 0
+        self._depth = 0
+        self._in_string = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the target array has been fully consumed."""
+        return self._state == _DONE
+
+    def feed(self, text: str) -> List[Any]:
+        """Feed a chunk of decoded text.
+
+        Args:
+            text: The next chunk of the JSON document.
+
+        Returns:
+            Array elements completed by this chunk, in document order.
+
+        Raises:
+            ValueError: If the document structure is not an object containing
+                the target array.
+        """
+        if self._state == _DONE:
+            return []
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        items: List[Any] = []
+        while self._step(items):
+            pass
+        return items
+
+    def close(self) -> None:
+        """Signal end of input.
+
+        Raises:
+            ValueError: If the target array was missing or truncated.
+        """
+        if self._state != _DONE:
+            raise ValueError(f'JSON ended before the "{self._key}" array was complete')
+
+    def _skip_ws(self) -> bool:
+        """Advance past whitespace; return True if a non-space char is available."""
+        buf = self._buf
+        pos = self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buf)
+
+    def _value_end(self) -> int:
+        """Find the end of the string, object or array at the current position.
+
+        Scanning resumes where the previous chunk left off, so a large value is
+        scanned once in total rather than once per chunk.
+
+        Returns:
+            The offset just past the value, or -1 if it is not complete yet.
+        """
+        buf = self._buf
+        pos = self._pos + self._scan
+        depth, in_string = self._depth, self._in_string
+        while True:
+            pattern = _STRING_SPECIAL_RE if in_string else _STRUCTURE_RE
+            match = pattern.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            pos = match.start()
+            char = buf[pos]
+            if in_string:
+                if char == '\\':
+                    if pos + 1 >= len(buf):
+                        # The escaped character is in the next chunk
+                        break
+                    pos += 2
+                    continue
+                in_string = False
+                if depth == 0:
+                    return pos + 1
+            elif char == '"':
+                in_string = True
+            elif char in '{[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            pos += 1
+        self._scan = pos - self._pos
+        self._depth, self._in_string = depth, in_string
+        return -1
+
+    def _decode_value(self) -> tuple:
+        """Decode the value at the current position.
+
+        A string, object or array is decoded straight away if it is already
+        complete; otherwise its end is scanned for as chunks arrive and it is
+        decoded once, when complete. Numbers and literals are short and simply
+        retried.
+
+        Returns:
+            ``(True, value)`` if a complete value was decoded, else ``(False, None)``
+            when more input is needed.
+        """
+        if self._buf[self._pos] in '"{[':
+            if self._scan == 0:
+                try:
+                    value, end = self._decoder.raw_decode(self._buf, self._pos)
+                    self._pos = end
+                    return True, value
+                except json.JSONDecodeError:
+                    pass
+            if self._value_end() < 0:
+                return False, None
+        self._scan = self._depth = 0
+        self._in_string = False
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as e:
+            if self._buf[self._pos] in '"{[':
+                raise ValueError(f'Invalid JSON value: {e}') from e
+            return False, None
+        # A bare number or literal at the end of the buffer may continue in the next chunk
+        if end == len(self._buf) and self._buf[end - 1] not in '}]"':
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _step(self, items: List[Any]) -> bool:
+        """Advance the state machine by one token; return False when input is exhausted."""
+        if not self._skip_ws():
+            return False
+        char = self._buf[self._pos]
+        state = self._state
+
+        if state == _START:
+            if char != '{':
+                raise ValueError('Expected a JSON object')
+            self._pos += 1
+            self._state = _KEY
+        elif state == _KEY:
+            if char == '}':
+                raise ValueError(f'JSON object has no "{self._key}" array')
+            ok, name = self._decode_value()
+            if not ok:
+                return False
+            self._in_target = name == self._key
+            self._state = _COLON
+        elif state == _COLON:
+            if char != ':':
+                raise ValueError('Expected ":" after object key')
+            self._pos += 1
+            self._state = _VALUE
+        elif state == _VALUE:
+            if self._in_target:
+                if char != '[':
+                    raise ValueError(f'"{self._key}" is not an array')
+                self._pos += 1
+                self._state = _ITEM
+            else:
+                ok, _ = self._decode_value()
+                if not ok:
+                    return False
+                self._state = _MEMBER_SEP
+        elif state == _MEMBER_SEP:
+            if char != ',':
+                raise ValueError(f'JSON object has no "{self._key}" array')
+            self._pos += 1
+            self._state = _KEY
+        elif state == _ITEM:
+            if char == ']':
+                self._pos += 1
+                self._state = _DONE
+                return False
+            ok, value = self._decode_value()
+            if not ok:
+                return False
+            items.append(value)
+            self._state = _ITEM_SEP
+        elif state == _ITEM_SEP:
+            if char == ']':
+                self._pos += 1
+                self._state = _DONE
+                return False
+            if char != ',':
+                raise ValueError('Expected "," between array elements')
+            self._pos += 1
+            self._state = _ITEM
+        else:
+            return False
+        return True
@@ -0,0 +1,77 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Event-loop lag instrumentation.
+
+A task sleeps for a fixed interval and measures how late it wakes up. Any
+delay past the interval is time the loop spent running something else
+without yielding — synchronous parsing, a large ``json.loads``, blocking I/O.
+Lag above a threshold is logged as it happens; totals are logged at shutdown.
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+from loguru import logger
+
+from ..config import config
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag at a fixed interval."""
+
+    def __init__(self, interval: float, warn_threshold: float):
+        """Initialize a monitor.
+
+        Args:
+            interval: Seconds between samples.
+            warn_threshold: Lag in seconds at which a sample is logged as a warning.
+        """
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.samples = 0
+        self.slow_samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    def record(self, lag: float) -> None:
+        """Record one lag sample in seconds."""
+        self.samples += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+        if lag >= self.warn_threshold:
+            self.slow_samples += 1
+            logger.warning(f'Event loop was blocked for {lag * 1000:.0f} ms')
+
+    async def run(self) -> None:
+        """Sample forever; cancel the task to stop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - start - self.interval))
+
+    def stats(self) -> Dict[str, float]:
+        """Return lag statistics in milliseconds."""
+        mean = self.total_lag / self.samples if self.samples else 0.0
+        return {
+            'samples': self.samples,
+            'slow_samples': self.slow_samples,
+            'last_ms': round(self.last_lag * 1000, 1),
+            'mean_ms': round(mean * 1000, 1),
+            'max_ms': round(self.max_lag * 1000, 1),
+        }
+
+
+# Global singleton
+_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor:
+    """Get the global event-loop lag monitor singleton."""
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopLagMonitor(config.loop_lag_interval, config.loop_lag_warn)
+    return _monitor
@@ -0,0 +1,143 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""In-memory cache of fetched Atlas pages.
+
+Pages are keyed by ``page_key`` so every URL form of a page (``.md``,
+``.html``, directory style) shares one entry. The cache is a bounded LRU.
+Entries remember when they were fetched so callers can serve them while
+fresh (younger than ``ttl``) and fall back to them when a refresh is slow or
+fails (stale-while-revalidate). HTML is held compressed (see
+``compression``) and the cache is bounded by compressed bytes as well as by
+entry count.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from ..config import config
+from .compression import get_codec
+from .url_utils import page_key
+
+
+class CachedPage:
+    """A cached page (compressed) and the time it was fetched."""
+
+    def __init__(self, html: str, fetched_url: str, fetched_at: float):
+        """Initialize a cache entry (``fetched_at`` is a ``time.monotonic()`` value)."""
+        self.blob = get_codec('html').compress(html)
+        self.fetched_url = fetched_url
+        self.fetched_at = fetched_at
+
+    @property
+    def html(self) -> str:
+        """The page HTML, decompressed on access."""
+        return get_codec('html').decompress(self.blob)
+
+    @property
+    def size(self) -> int:
+        """Compressed size in bytes."""
+        return len(self.blob)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the page was fetched."""
+        return time.monotonic() - self.fetched_at
+
+
+class PageCache:
+    """Bounded LRU cache of fetched page HTML."""
+
+    def __init__(
+        self, max_entries: int, ttl: float = float('inf'), max_bytes: float = float('inf')
+    ):
+        """Initialize an empty cache holding at most ``max_entries`` pages.
+
+        Args:
+            max_entries: Maximum number of cached pages.
+            ttl: Seconds an entry stays fresh.
+            max_bytes: Maximum total compressed size of the cached pages.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, CachedPage]' = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Total compressed size of the cached pages."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        """Return the number of cached pages."""
+        return len(self._entries)
+
+    def get(self, url: str) -> Optional[Tuple[str, str]]:
+        """Look up a page.
+
+        Args:
+            url: Any URL form of an Atlas page.
+
+        Returns:
+            ``(html, fetched_url)`` regardless of age, or None on a miss.
+        """
+        entry = self.get_entry(url)
+        return None if entry is None else (entry.html, entry.fetched_url)
+
+    def get_entry(self, url: str) -> Optional[CachedPage]:
+        """Look up a page with its fetch time; see ``is_fresh``."""
+        key = page_key(url)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry: CachedPage) -> bool:
+        """Return True if an entry is younger than the cache TTL."""
+        return entry.age < self.ttl
+
+    def put(self, url: str, html: str, fetched_url: str) -> None:
+        """Store a fetched page, evicting the least recently used entry if full."""
+        if self.max_entries <= 0:
+            return
+        key = page_key(url)
+        self._drop(key)
+        entry = CachedPage(html, fetched_url, time.monotonic())
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or (
+            self._bytes > self.max_bytes and len(self._entries) > 1
+        ):
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        """Remove one entry, keeping the byte count in step."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, urls: Iterable[str]) -> None:
+        """Drop the given pages from the cache."""
+        for url in urls:
+            self._drop(page_key(url))
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+# Global singleton
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+    """Get the global page cache singleton."""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache(
+            config.page_cache_size, ttl=config.page_ttl, max_bytes=config.page_cache_bytes
+        )
+    return _page_cache
@@ -0,0 +1,227 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Converted page content and markdown section outlines.
+
+A ``PageContent`` holds a page already converted to markdown together with
+its outline: the character span, matching key and anchor of every h2–h4
+section. Sections are looked up by key and sliced out of the markdown without
+re-parsing the HTML or re-normalizing headings.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+from bs4 import Tag
+
+from ..models import PageContent, PageSection
+from .html_converter import (
+    diagrams_from_soup,
+    normalize_heading,
+    parse_html,
+    select_main_content,
+    soup_to_markdown,
+)
+
+_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.*?)[ \t]*#*[ \t]*$')
+_FENCE_RE = re.compile(r'^[ \t]*(`{3,}|~{3,})')
+_ESCAPE_RE = re.compile(r'\\(.)')
+_LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_EMPHASIS_RE = re.compile(r'(?<!\\)[*`]')
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_SPACE_RE = re.compile(r'[-\s]+')
+
+# Heading levels that form the section outline (matches extract_sections)
+_SECTION_LEVELS = (2, 3, 4)
+
+
+def _heading_text(markdown: str) -> str:
+    """Reduce inline heading markdown to the plain text shown on the page."""
+    text = _LINK_RE.sub(r'\1', markdown)
+    text = _EMPHASIS_RE.sub('', text)
+    return _ESCAPE_RE.sub(r'\1', text).replace('¶', '').strip()
+
+
+def slugify_heading(title: str) -> str:
+    """Return the anchor MkDocs generates for a heading without an explicit id."""
+    text = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode('ascii')
+    text = _SLUG_STRIP_RE.sub('', text).strip().lower()
+    return _SLUG_SPACE_RE.sub('-', text)
+
+
+def markdown_outline(markdown: str) -> List[PageSection]:
+    """Build the h2–h4 section outline of a markdown document.
+
+    Headings inside fenced code blocks are ignored. A section runs from its
+    heading line to the next heading of the same or a higher level.
+
+    Args:
+        markdown: ATX-style markdown, as produced by ``html_to_markdown``.
+
+    Returns:
+        Sections in document order, with character offsets into ``markdown``
+        and anchors derived from the heading text (see ``build_page_content``
+        for the page's real heading ids).
+    """
+    headings = []  # (level, title, offset)
+    fence = None
+    offset = 0
+    for line in markdown.splitlines(keepends=True):
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker[0] * 3
+            elif marker.startswith(fence):
+                fence = None
+        elif fence is None:
+            match = _HEADING_RE.match(line.rstrip('\r\n'))
+            if match:
+                headings.append((len(match.group(1)), _heading_text(match.group(2)), offset))
+        offset += len(line)
+
+    sections = []
+    for i, (level, title, start) in enumerate(headings):
+        if level not in _SECTION_LEVELS:
+            continue
+        end = len(markdown)
+        for next_level, _, next_start in headings[i + 1:]:
+            if next_level <= level:
+                end = next_start
+                break
+        sections.append(PageSection(
+            title=title,
+            level=level,
+            start=start,
+            end=end,
+            key=normalize_heading(title),
+            anchor=slugify_heading(title),
+        ))
+    return sections
+
+
+def _heading_ids(main_content: Tag) -> List[Tuple[int, str, str]]:
+    """Return ``(level, key, id)`` for the h2–h4 headings of a page's content."""
+    return [
+        (int(heading.name[1]), normalize_heading(heading.get_text()), heading['id'])
+        for heading in main_content.find_all(['h2', 'h3', 'h4'])
+        if heading.get('id')
+    ]
+
+
+def _apply_heading_ids(sections: List[PageSection], ids: List[Tuple[int, str, str]]) -> None:
+    """Replace derived anchors with the page's heading ids, matched in document order."""
+    position = 0
+    for section in sections:
+        for i in range(position, len(ids)):
+            level, key, anchor = ids[i]
+            if level == section.level and key == section.key:
+                section.anchor = anchor
+                position = i + 1
+                break
+
+
+def build_page_content(html: str, url: str, title: str = '') -> PageContent:
+    """Convert a fetched Atlas page into a ``PageContent``.
+
+    Args:
+        html: Raw HTML of the page.
+        url: URL the page was requested as (used for relative image paths).
+        title: Optional page title.
+
+    Returns:
+        The converted page with its section outline and diagrams.
+    """
+    soup = parse_html(html)
+    # Diagrams first: selecting the main content strips page chrome in place
+    diagrams = diagrams_from_soup(soup, url)
+    main_content = select_main_content(soup)
+    heading_ids = _heading_ids(main_content)
+    markdown = soup_to_markdown(main_content)
+    sections = markdown_outline(markdown)
+    _apply_heading_ids(sections, heading_ids)
+    return PageContent(
+        url=url,
+        title=title,
+        markdown=markdown,
+        sections=sections,
+        diagrams=diagrams,
+    )
+
+
+def section_lookup(page: PageContent) -> Dict[str, List[PageSection]]:
+    """Map matching keys and anchors to a page's sections.
+
+    Headings can repeat within a page, so each key maps to every section with
+    that title, in document order.
+    """
+    lookup: Dict[str, List[PageSection]] = {}
+    for section in page.sections:
+        # Outlines from older snapshots carry no precomputed key
+        key = section.key or normalize_heading(section.title)
+        lookup.setdefault(key, []).append(section)
+        if section.anchor and section.anchor != key:
+            lookup.setdefault(section.anchor, []).append(section)
+    return lookup
+
+
+def read_page_sections(page: PageContent, section_titles: List[str]) -> str:
+    """Slice the requested sections out of a converted page.
+
+    Behaves like ``extract_sections`` but works on the converted markdown.
+    A requested title matches a section by normalized heading text or by its
+    anchor (with or without the leading ``#``).
+
+    Args:
+        page: The converted page.
+        section_titles: List of section titles to extract.
+
+    Returns:
+        Markdown content containing only the requested sections.
+
+    Raises:
+        ValueError: If no matching sections are found.
+    """
+    if not page.markdown or not section_titles:
+        raise ValueError('No content or section titles provided')
+
+    lookup = section_lookup(page)
+    selected: Dict[int, PageSection] = {}
+    found = set()
+    for title in section_titles:
+        cleaned = title.strip().replace('¶', '').strip()
+        sections = lookup.get(normalize_heading(title)) or lookup.get(cleaned.lstrip('#'))
+        if sections:
+            found.add(cleaned)
+            for section in sections:
+                selected[section.start] = section
+
+    # Document order, as if the headings had been scanned
+    matched = [
+        page.markdown[section.start:section.end].strip()
+        for _, section in sorted(selected.items())
+    ]
+
+    if not found:
+        section_list = ', '.join(f'"{t}"' for t in section_titles)
+        if page.sections:
+            available = ', '.join(f'"{s.title}"' for s in page.sections)
+            raise ValueError(
+                f'No matching sections found: {section_list}. '
+                f'Available sections: {available}'
+            )
+        raise ValueError(
+            'This document does not contain subsections. '
+            'Use read_topic to get the full document.'
+        )
+
+    result = '\n\n'.join(matched)
+
+    # Note missing sections
+    if len(found) < len(section_titles):
+        missing = [t.strip() for t in section_titles if t.strip() not in found]
+        missing_list = ', '.join(f'"{t}"' for t in missing)
+        result += f'\n\n**Note**: Sections not found: {missing_list}'
+
+    return result
@@ -0,0 +1,140 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Structure-aware pagination of converted markdown.
+
+``read_topic`` pages through a topic's markdown. Cutting at a raw character
+offset splits sentences, tables and code blocks, and the caller then re-reads
+to recover the split context. Pages here end at the best boundary within the
+budget: before a heading, else between paragraphs, else at a line end inside
+code or after a sentence or word in prose. Code fences and tables are never
+split unless a single one is larger than the whole budget.
+
+Budgets are given in characters or estimated tokens (about four characters
+per token for English markdown). The position to continue from is returned as
+an opaque cursor that also records the budget and a hash of the markdown it
+indexes into; a cursor for an older version of the page is rejected instead
+of silently skipping or repeating content.
+"""
+
+import base64
+import hashlib
+import re
+from typing import List, Tuple
+
+# Rough average for English prose and markdown syntax
+CHARS_PER_TOKEN = 4
+
+_FENCE_RE = re.compile(r'^[ \t]*(`{3,}|~{3,})')
+_HEADING_RE = re.compile(r'^#{1,6}[ \t]')
+_SENTENCE_END_RE = re.compile(r'[.!?:][)\]"\']?\s')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def content_version(markdown: str) -> str:
+    """Return a short hash identifying a version of a page's markdown."""
+    return hashlib.blake2b(markdown.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def encode_cursor(version: str, offset: int, budget: int) -> str:
+    """Encode a continuation point as an opaque cursor.
+
+    Args:
+        version: ``content_version`` of the markdown.
+        offset: Character offset of the next page.
+        budget: Character budget per page.
+    """
+    raw = f'{version}:{offset}:{budget}'.encode('ascii')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int, int]:
+    """Decode a cursor from ``encode_cursor``.
+
+    Returns:
+        ``(version, offset, budget)``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor.strip() + '=' * (-len(cursor.strip()) % 4)
+        version, offset, budget = base64.urlsafe_b64decode(padded).decode('ascii').split(':')
+        return version, int(offset), int(budget)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor!r}') from e
+
+
+def block_boundaries(markdown: str) -> Tuple[List[int], List[int]]:
+    """Find the offsets where a page may start.
+
+    Returns:
+        ``(headings, paragraphs)``: offsets of heading lines, and of the first
+        line after a blank line, outside code fences. Table rows are never
+        separated by blank lines, so tables are never split either.
+    """
+    headings: List[int] = []
+    paragraphs: List[int] = []
+    fence = None
+    after_blank = False
+    offset = 0
+    for line in markdown.splitlines(keepends=True):
+        fence_match = _FENCE_RE.match(line)
+        if fence is not None:
+            if fence_match and fence_match.group(1).startswith(fence):
+                fence = None
+        elif not line.strip():
+            after_blank = True
+        else:
+            if _HEADING_RE.match(line):
+                headings.append(offset)
+            elif after_blank:
+                paragraphs.append(offset)
+            after_blank = False
+            if fence_match:
+                fence = fence_match.group(1)[0] * 3
+        offset += len(line)
+    return headings, paragraphs
+
+
+def page_end(markdown: str, start: int, budget: int) -> int:
+    """Choose where a page starting at ``start`` should end.
+
+    Args:
+        markdown: The full markdown.
+        start: Offset of the page start.
+        budget: Maximum characters in the page.
+
+    Returns:
+        The end offset: the whole remainder if it fits, else the last heading
+        in the second half of the budget, else the last paragraph break, else
+        the last line end inside a code block, or sentence or word end in
+        prose, else ``start + budget``.
+    """
+    limit = start + max(1, budget)
+    if limit >= len(markdown):
+        return len(markdown)
+
+    headings, paragraphs = block_boundaries(markdown)
+    in_window = [h for h in headings if start + budget // 2 <= h <= limit]
+    if in_window:
+        return in_window[-1]
+    in_window = [p for p in paragraphs if start < p <= limit]
+    if in_window:
+        return in_window[-1]
+
+    window = markdown[start:limit]
+    in_fence = sum(1 for line in markdown[:limit].splitlines() if _FENCE_RE.match(line)) % 2
+    if in_fence and '\n' in window:
+        return start + window.rfind('\n') + 1
+    sentence_ends = [m.end() for m in _SENTENCE_END_RE.finditer(window)]
+    if sentence_ends:
+        return start + sentence_ends[-1]
+    space = max(window.rfind(' '), window.rfind('\n'))
+    if space > 0:
+        return start + space + 1
+    return limit
@@ -0,0 +1,91 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Connection pool statistics for the shared HTTP clients.
+
+Counts come from httpx's ``trace`` request extension: a request that emits a
+TCP connect event opened a new connection, any other request reused a pooled
+(or, with HTTP/2, multiplexed) one. Open and idle connection counts are read
+from the clients' connection pools when stats are requested. httpx exposes no
+public pool API, so they are only reported for the httpcore major version
+whose pool layout is known; with any other version they are left out.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpcore
+import httpx
+
+TraceCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# httpcore versions whose AsyncConnectionPool keeps a ``connections`` list
+_KNOWN_POOL_LAYOUT = ('1.',)
+
+
+def _pool_connections(client: httpx.AsyncClient) -> Optional[List[Any]]:
+    """Return the connections in a client's pool, or None if they cannot be read safely."""
+    if not httpcore.__version__.startswith(_KNOWN_POOL_LAYOUT):
+        return None
+    pool = getattr(getattr(client, '_transport', None), '_pool', None)
+    connections = getattr(pool, 'connections', None)
+    return list(connections) if isinstance(connections, list) else None
+
+
+class PoolStats:
+    """Counters for requests and connections across the shared HTTP clients."""
+
+    def __init__(self):
+        """Initialize zeroed counters."""
+        self.requests = 0
+        self.http2_requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+    def tracer(self) -> TraceCallback:
+        """Return a ``trace`` extension callback for one request."""
+        opened = False
+
+        async def _trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal opened
+            if event == 'connection.connect_tcp.complete':
+                opened = True
+                self.connections_opened += 1
+            elif event in (
+                'http11.send_request_headers.started',
+                'http2.send_request_headers.started',
+            ):
+                self.requests += 1
+                if event.startswith('http2.'):
+                    self.http2_requests += 1
+                if not opened:
+                    self.connections_reused += 1
+
+        return _trace
+
+    def snapshot(self, clients: Iterable[httpx.AsyncClient]) -> Dict[str, int]:
+        """Return the counters plus current open and idle connections.
+
+        ``open_connections`` and ``idle_connections`` are omitted when a
+        client's pool cannot be inspected (see the module docstring).
+
+        Args:
+            clients: The live clients whose pools to inspect.
+        """
+        stats = {
+            'requests': self.requests,
+            'http2_requests': self.http2_requests,
+            'connections_opened': self.connections_opened,
+            'connections_reused': self.connections_reused,
+        }
+        open_connections = idle_connections = 0
+        for client in clients:
+            connections = _pool_connections(client)
+            if connections is None:
+                return stats
+            for connection in connections:
+                open_connections += 1
+                if connection.is_idle():
+                    idle_connections += 1
+        stats['open_connections'] = open_connections
+        stats['idle_connections'] = idle_connections
+        return stats
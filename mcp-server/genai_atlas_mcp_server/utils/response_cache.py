@@ -0,0 +1,209 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Cache of finished tool responses.
+
+``search_atlas``, ``get_reference_example`` and ``list_topics`` answer from
+the in-memory indexes, so their output only changes when an index does. Yet
+every call rebuilt the result dicts, and FastMCP then serialized each one to
+JSON text and validated the structured copy against the tool's output schema.
+
+Tools registered through ``cached_tool`` keep their ready ``CallToolResult``
+(the JSON text FastMCP would have produced, and the structured content) keyed
+by tool, normalized arguments and the version of the index they read. A
+repeated call returns the stored result as-is. Index versions change whenever
+an index is reloaded or a page in it is re-indexed, so stale entries are never
+served; each tool's entries for an older version are dropped as soon as one
+for a newer version is stored.
+
+The JSON text is encoded with ``orjson`` (installed with the ``orjson``
+extra) when available, else with ``pydantic_core`` as FastMCP does. The
+structured content follows FastMCP's rules for the tool's return annotation
+(see ``_output_wrapping``); the tests check that cached and plain tools
+answer alike.
+"""
+
+import functools
+import inspect
+import types
+import typing
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pydantic_core
+from mcp.types import CallToolResult, TextContent
+
+from ..config import config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the optional extra
+    orjson = None
+
+# (tool name, normalized arguments, index version)
+CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...], Hashable]
+
+
+def dumps(value: Any) -> str:
+    """Serialize a value to indented JSON text, as FastMCP does for tool results."""
+    if orjson is not None:
+        return orjson.dumps(
+            value, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return pydantic_core.to_json(value, fallback=str, indent=2).decode('utf-8')
+
+
+def _text_content(value: Any) -> List[TextContent]:
+    """Return the unstructured content FastMCP sends for a tool's return value."""
+    if value is None:
+        return []
+    items = value if isinstance(value, (list, tuple)) else [value]
+    return [
+        TextContent(type='text', text=item if isinstance(item, str) else dumps(item))
+        for item in items
+    ]
+
+
+def _output_wrapping(fn: Callable[..., Any]) -> Optional[bool]:
+    """Return how FastMCP structures a tool's result, from its return annotation.
+
+    Returns:
+        None if the tool has no structured output (no annotation, or a plain
+        class such as ``dict``), False if its result is sent as is (a
+        ``dict[str, ...]``), True if it is wrapped as ``{"result": value}``
+        (lists, unions, ``typing`` aliases and scalars).
+
+    Raises:
+        TypeError: If the tool returns a model, typed dict or annotated class,
+            whose structured content this cache does not build.
+    """
+    annotation = inspect.signature(fn, eval_str=True).return_annotation
+    if annotation is inspect.Signature.empty:
+        return None
+    if isinstance(annotation, types.GenericAlias):
+        return not (
+            typing.get_origin(annotation) is dict and typing.get_args(annotation)[:1] == (str,)
+        )
+    if isinstance(annotation, type):
+        if annotation in (str, int, float, bool, bytes, type(None)):
+            return True
+        if typing.is_typeddict(annotation) or typing.get_type_hints(annotation):
+            raise TypeError(f'cached_tool cannot cache {fn.__name__}: it returns {annotation!r}')
+        return None
+    return True
+
+
+def _normalize(value: Any) -> Any:
+    """Return a hashable form of an argument; whitespace in strings is collapsed."""
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _normalize(item)) for key, item in value.items()))
+    return value
+
+
+class ResponseCache:
+    """Bounded LRU cache of tool results."""
+
+    def __init__(self, max_entries: int):
+        """Initialize an empty cache holding at most ``max_entries`` results."""
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[CacheKey, CallToolResult]' = OrderedDict()
+        # Latest index version each tool has stored results for
+        self._versions: Dict[str, Hashable] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[CallToolResult]:
+        """Look up a result, counting the hit or miss."""
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: CacheKey, result: CallToolResult) -> None:
+        """Store a result, dropping the tool's results for older index versions."""
+        if self.max_entries <= 0:
+            return
+        tool, _, version = key
+        if tool in self._versions and self._versions[tool] != version:
+            for stale in [k for k in self._entries if k[0] == tool and k[2] != version]:
+                del self._entries[stale]
+        self._versions[tool] = version
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+        self._versions.clear()
+
+
+def cached_tool(
+    fn: Callable[..., Awaitable[Any]], version: Callable[[], Optional[Hashable]]
+) -> Callable[..., Awaitable[CallToolResult]]:
+    """Wrap a tool so its responses are cached until its index changes.
+
+    The wrapper keeps the tool's name, docstring and signature, so FastMCP
+    derives the same input and output schemas from it; it returns the
+    finished ``CallToolResult`` instead of the raw value.
+
+    Args:
+        fn: An async tool whose result depends only on its arguments and one
+            index.
+        version: Returns the index's current version, or None while the index
+            is not loaded (or about to be reloaded); results are then neither
+            looked up nor stored.
+    """
+    wrap_output = _output_wrapping(fn)
+    signature = inspect.signature(fn)
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> CallToolResult:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple((arg, _normalize(value)) for arg, value in bound.arguments.items())
+        cache = get_response_cache()
+
+        before = version()
+        if before is not None:
+            cached = cache.get((name, arguments, before))
+            if cached is not None:
+                return cached
+
+        value = await fn(*args, **kwargs)
+        structured = None
+        if wrap_output is not None:
+            structured = {'result': value} if wrap_output else value
+        result = CallToolResult(content=_text_content(value), structuredContent=structured)
+
+        # Only store results that were computed from a single index version
+        after = version()
+        if after is not None and before in (None, after):
+            cache.put((name, arguments, after), result)
+        return result
+
+    return wrapper
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the singleton response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(config.response_cache_size)
+    return _response_cache
@@ -3,43 +3,152 @@
 
 """Search index built from the MkDocs search_index.json.
 
-Loads the pre-built search index from the deployed Atlas site and provides
-keyword-based search with TF-IDF-style scoring.
+Streams the pre-built search index from the deployed Atlas site and provides
+keyword-based search with TF-IDF-style scoring. The per-heading entries of the
+same file also populate the corpus-wide ``SectionIndex``. If search_index.json
+cannot be loaded, both are built from the llms-full.txt corpus instead, when
+``ATLAS_CORPUS`` is on.
+
+Site builds also publish search/atlas_search.json (``hooks/search_artifact_hook.py``):
+the same pages already merged and tokenized, with postings and the section
+outline. When present it is loaded instead, so the server does no tokenizing
+at start-up.
 """
 
 import asyncio
+import json
 import math
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
 from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 
 from ..config import config
 from ..models import SearchResult
-from .fetcher import fetch_json
+from .compression import get_codec
+from .corpus import get_corpus
+from .fetcher import fetch_stream
+from .json_stream import JsonArrayStream
+from .section_index import IndexedSection, SectionIndex, sections_from_page
+from .url_resolver import get_url_resolver
+from .url_utils import atlas_relative_path, page_key
+from .workers import run_cpu_bound
+
+# Layout of search/atlas_search.json this server reads, and the tokenization it
+# must have been built with (both kept in sync with hooks/search_artifact_hook.py)
+ARTIFACT_FORMAT = 1
+_TOKEN_PATTERN = r'[a-z0-9]+'
+_TITLE_WEIGHT = 2
 
 
 class SearchDoc:
-    """A document in the search index."""
+    """A document in the search index.
 
-    def __init__(self, location: str, title: str, text: str):
+    The page text is only needed for result snippets, so it is held
+    compressed; token counts are computed once when the text is set, unless
+    they are given (from the prebuilt search artifact).
+    """
+
+    def __init__(
+        self,
+        location: str,
+        title: str,
+        text: str,
+        token_counts: Optional[Dict[str, int]] = None,
+        length: int = 0,
+    ):
         """Initialize a search document."""
         self.location = location
         self.title = title
-        self.text = text
         self.url = f'{config.base_url}/{location}'
-        # Pre-compute lowercase searchable text
-        self.searchable = f'{title} {title} {text}'.lower()  # title weighted 2x
-        self.tokens = _tokenize(self.searchable)
-        self.token_counts: Dict[str, int] = defaultdict(int)
-        for token in self.tokens:
-            self.token_counts[token] += 1
+        if token_counts is None:
+            self.text = text
+        else:
+            self._text_blob = get_codec('search').compress(text)
+            self.token_counts = token_counts
+            self.length = length
+
+    @property
+    def text(self) -> str:
+        """The page text, decompressed on access."""
+        return get_codec('search').decompress(self._text_blob)
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._text_blob = get_codec('search').compress(value)
+        tokens = _tokenize(' '.join([self.title] * _TITLE_WEIGHT + [value]))
+        self.token_counts: Dict[str, int] = Counter(tokens)
+        self.length = len(tokens)
 
 
 def _tokenize(text: str) -> List[str]:
     """Tokenize text into lowercase words."""
-    return re.findall(r'[a-z0-9]+', text.lower())
+    return re.findall(_TOKEN_PATTERN, text.lower())
+
+
+# A document of the search artifact: location, title, text, token counts and length
+ArtifactDoc = Tuple[str, str, str, Dict[str, int], int]
+# A section of the search artifact: page URL, anchor, title and text
+ArtifactSection = Tuple[str, str, str, str]
+
+
+def parse_artifact(
+    content: str,
+) -> Tuple[List[ArtifactDoc], Dict[str, int], List[ArtifactSection], Optional[str]]:
+    """Parse and check the documents, document frequencies and sections of a search artifact.
+
+    Runs in the worker pool, so it returns plain data: compressed text only
+    decodes in the process that compressed it (see ``compression``).
+
+    Args:
+        content: JSON text of search/atlas_search.json.
+
+    Returns:
+        The documents, the number of documents each token is in, the sections
+        and the build id of the artifact.
+
+    Raises:
+        ValueError: If the artifact is malformed or was built for another
+            server version.
+    """
+    artifact = json.loads(content)
+    try:
+        tokenizer = {'pattern': _TOKEN_PATTERN, 'title_weight': _TITLE_WEIGHT}
+        if artifact.get('format') != ARTIFACT_FORMAT or artifact.get('tokenizer') != tokenizer:
+            raise ValueError('built for another server version')
+        docs = artifact['docs']
+        vocabulary, postings_lists = artifact['vocabulary'], artifact['postings']
+        if len(vocabulary) != len(postings_lists):
+            raise ValueError('vocabulary and postings differ in length')
+
+        # Invert the postings into per-document term counts
+        doc_counts: List[Dict[str, int]] = [{} for _ in docs]
+        doc_freq: Dict[str, int] = defaultdict(int)
+        for token, postings in zip(vocabulary, postings_lists):
+            if len(postings) % 2:
+                raise ValueError(f'odd postings for {token!r}')
+            doc_freq[token] = len(postings) // 2
+            for i in range(0, len(postings), 2):
+                if postings[i] < 0:
+                    raise IndexError(postings[i])
+                doc_counts[postings[i]][token] = postings[i + 1]
+
+        search_docs = [
+            (doc['location'], doc['title'], doc['text'], counts, doc['length'])
+            for doc, counts in zip(docs, doc_counts)
+        ]
+        sections = []
+        for doc_id, anchor, title, start, end in artifact['sections']:
+            if doc_id < 0:
+                raise IndexError(doc_id)
+            doc = docs[doc_id]
+            sections.append(
+                (f"{config.base_url}/{doc['location']}", anchor, title, doc['text'][start:end])
+            )
+    except (AttributeError, KeyError, IndexError, TypeError, ValueError) as e:
+        raise ValueError(f'malformed search artifact: {e!r}') from e
+    return search_docs, doc_freq, sections, artifact.get('build')
 
 
 class AtlasSearchIndex:
@@ -49,7 +158,9 @@ class AtlasSearchIndex:
         """Initialize an empty search index."""
         self._docs: List[SearchDoc] = []
         self._doc_freq: Dict[str, int] = defaultdict(int)
+        self.sections = SectionIndex()
         self._loaded = False
+        self._version = 0
         self._lock = asyncio.Lock()
 
     async def ensure_loaded(self) -> None:
@@ -61,51 +172,237 @@ class AtlasSearchIndex:
                 return
             await self._load()
 
+    @property
+    def version(self) -> Optional[int]:
+        """A number that changes whenever the indexed content does (None until loaded)."""
+        return self._version if self._loaded else None
+
     async def _load(self) -> None:
         """Internal load logic — must be called under self._lock."""
         logger.info('Loading Atlas search index...')
-        data = await fetch_json(config.search_index_url)
-        if data is None:
+        # search_index.json streams alongside the artifact request, so a site without the
+        # artifact costs no extra round trip; it is dropped once the artifact starts arriving
+        artifact_chunks: List[str] = []
+        artifact_arrived = asyncio.Event()
+
+        def _on_artifact_chunk(text: str) -> None:
+            artifact_chunks.append(text)
+            artifact_arrived.set()
+
+        artifact = asyncio.create_task(
+            fetch_stream(config.search_artifact_url, _on_artifact_chunk, missing_ok=True)
+        )
+        streamed = asyncio.create_task(self._stream_search_index())
+        arrived = asyncio.create_task(artifact_arrived.wait())
+        try:
+            await asyncio.wait({artifact, arrived}, return_when=asyncio.FIRST_COMPLETED)
+            if artifact_arrived.is_set():
+                streamed.cancel()
+            if await artifact and await self._load_artifact(''.join(artifact_chunks)):
+                return
+            if artifact_arrived.is_set():
+                # The artifact was unusable after all
+                streamed = asyncio.create_task(self._stream_search_index())
+            result = await streamed
+        finally:
+            for task in (artifact, streamed, arrived):
+                task.cancel()
+
+        if result is None and config.corpus:
+            pages: Dict[str, Tuple[str, List[str]]] = {}
+            sections = SectionIndex()
+            if await self._add_corpus(pages, sections):
+                result = pages, sections
+
+        if result is None:
             logger.error('Failed to load search index')
+            self._docs = []
             return
 
-        docs_data = data.get('docs', [])
-        seen_locations: Dict[str, SearchDoc] = {}
+        pages, sections = result
+        docs = [
+            SearchDoc(location=location, title=title, text=' '.join(parts))
+            for location, (title, parts) in pages.items()
+        ]
+        # Build document frequency index
+        doc_freq: Dict[str, int] = defaultdict(int)
+        for doc in docs:
+            for token in doc.token_counts:
+                doc_freq[token] += 1
+        self._docs, self._doc_freq = docs, doc_freq
+        self._finish_load(sections)
+
+    async def _stream_search_index(
+        self,
+    ) -> Optional[Tuple[Dict[str, Tuple[str, List[str]]], SectionIndex]]:
+        """Stream search_index.json into pages and sections (see ``_add_doc``).
+
+        Returns:
+            ``(pages, sections)``, or None if the file could not be loaded.
+        """
+        pages: Dict[str, Tuple[str, List[str]]] = {}
+        sections = SectionIndex()
+        parser = JsonArrayStream('docs')
+
+        def _on_chunk(text: str) -> None:
+            for doc in parser.feed(text):
+                self._add_doc(doc, pages, sections)
+
+        try:
+            loaded = await fetch_stream(config.search_index_url, _on_chunk)
+            if loaded:
+                parser.close()
+        except ValueError as e:
+            logger.error(f'Error parsing search index: {e}')
+            loaded = False
+        return (pages, sections) if loaded else None
+
+    async def _load_artifact(self, content: str) -> bool:
+        """Load the index from the prebuilt search artifact, if it is compatible.
+
+        The artifact is parsed in the worker pool, and the documents and
+        sections, which hold their text compressed, are built here. The index
+        only changes once the whole artifact has been read.
+
+        Returns:
+            Whether the index was loaded from it.
+        """
+        try:
+            docs, doc_freq, parsed, build = await run_cpu_bound(parse_artifact, content)
+        except ValueError as e:
+            logger.warning(f'Ignoring search artifact: {e}')
+            return False
+        sections = SectionIndex()
+        for page_url, anchor, title, text in parsed:
+            sections.add(IndexedSection(page_url, anchor, title, text))
+        self._docs = [SearchDoc(*doc) for doc in docs]
+        self._doc_freq = doc_freq
+        logger.info(f'Using the prebuilt search artifact of build {build}')
+        self._finish_load(sections)
+        return True
+
+    def _finish_load(self, sections: SectionIndex) -> None:
+        """Publish freshly loaded documents and sections."""
+        self.sections = sections
+        # Locations are deployed paths — teach the resolver the canonical URLs
+        resolver = get_url_resolver()
+        for doc in self._docs:
+            resolver.register(doc.url)
 
-        for doc in docs_data:
-            location = doc.get('location', '')
-            title = doc.get('title', '')
-            text = doc.get('text', '')
+        self._loaded = True
+        self._version += 1
+        logger.info(
+            f'Loaded {len(self._docs)} documents and {len(sections)} sections into search index'
+        )
 
-            if not location or not title or title in ('', 'Home'):
-                continue
+    def _add_doc(
+        self, doc: dict, pages: Dict[str, Tuple[str, List[str]]], sections: SectionIndex
+    ) -> None:
+        """Collect one search_index.json entry, merging anchor sections into their page.
 
-            # Deduplicate by base page — merge anchor sections into the main page
-            base_location = location.split('#')[0]
-            if base_location in seen_locations and '#' in location:
-                existing = seen_locations[base_location]
-                existing.text += f' {text}'
-                existing.searchable = (
-                    f'{existing.title} {existing.title} {existing.text}'.lower()
-                )
-                existing.tokens = _tokenize(existing.searchable)
-                existing.token_counts = defaultdict(int)
-                for token in existing.tokens:
-                    existing.token_counts[token] += 1
-                continue
+        Args:
+            doc: The search_index.json entry.
+            pages: Base location -> ``(title, text parts)``, in index order.
+            sections: Section index that receives each anchor entry.
+        """
+        location = doc.get('location', '')
+        title = doc.get('title', '')
+        text = doc.get('text', '')
 
-            new_doc = SearchDoc(location=base_location, title=title, text=text)
-            seen_locations[base_location] = new_doc
-            self._docs.append(new_doc)
+        if not location or not title or title in ('', 'Home'):
+            return
 
-        # Build document frequency index
+        # Deduplicate by base page — merge anchor sections into the main page
+        base_location, _, anchor = location.partition('#')
+        if anchor:
+            sections.add(
+                IndexedSection(f'{config.base_url}/{base_location}', anchor, title, text)
+            )
+        if base_location in pages and '#' in location:
+            pages[base_location][1].append(text)
+            return
+
+        pages[base_location] = (title, [text])
+
+    async def _add_corpus(
+        self, pages: Dict[str, Tuple[str, List[str]]], sections: SectionIndex
+    ) -> bool:
+        """Collect every page of the llms-full.txt corpus and its sections.
+
+        Returns:
+            Whether the corpus had any pages.
+        """
+        corpus = get_corpus()
+        await corpus.ensure_loaded()
+        for page in corpus.pages():
+            location = atlas_relative_path(page.url) or page_key(page.url)
+            pages[location] = (page.title, [page.markdown])
+            for section in sections_from_page(page, page.url):
+                sections.add(section)
+        if pages:
+            logger.warning('search_index.json unavailable; indexing the llms-full.txt corpus')
+        return bool(pages)
+
+    def _find_doc(self, url: str) -> Optional[SearchDoc]:
+        """Find the indexed document for any URL form of a page."""
+        key = page_key(url)
         for doc in self._docs:
-            unique_tokens = set(doc.tokens)
-            for token in unique_tokens:
-                self._doc_freq[token] += 1
+            if page_key(doc.url) == key:
+                return doc
+        return None
+
+    def _count_doc(self, doc: SearchDoc, delta: int) -> None:
+        """Add (+1) or remove (-1) a document's tokens from the document frequencies."""
+        for token in doc.token_counts:
+            self._doc_freq[token] += delta
+            if self._doc_freq[token] <= 0:
+                del self._doc_freq[token]
+
+    def upsert_page(
+        self,
+        url: str,
+        title: str,
+        text: str,
+        sections: Optional[List[IndexedSection]] = None,
+    ) -> None:
+        """Re-index one page with fresh text, adding it if it is new.
 
-        self._loaded = True
-        logger.info(f'Loaded {len(self._docs)} documents into search index')
+        Args:
+            url: Any URL form of the page.
+            title: Page title (kept from the existing entry when empty).
+            text: Full page text.
+            sections: The page's sections, replacing those in the section index.
+        """
+        if not self._loaded:
+            # The pending full load will pick up the current text
+            return
+        existing = self._find_doc(url)
+        if existing is not None:
+            self._count_doc(existing, -1)
+            self._docs.remove(existing)
+            title = title or existing.title
+            location = existing.location
+        else:
+            location = atlas_relative_path(url) or page_key(url)
+
+        new_doc = SearchDoc(location=location, title=title or location, text=text)
+        self._docs.append(new_doc)
+        self._count_doc(new_doc, +1)
+        get_url_resolver().register(new_doc.url)
+        if sections is not None:
+            self.sections.replace_page(new_doc.url, sections)
+        self._version += 1
+
+    def remove_page(self, url: str) -> None:
+        """Drop a page that no longer exists from the index."""
+        if not self._loaded:
+            return
+        existing = self._find_doc(url)
+        if existing is not None:
+            self._count_doc(existing, -1)
+            self._docs.remove(existing)
+        self.sections.remove_page(url)
+        self._version += 1
 
     def search(self, query: str, max_results: int = 5) -> List[SearchResult]:
         """Search the index using TF-IDF scoring.
@@ -128,13 +425,13 @@ class AtlasSearchIndex:
         scored: List[Tuple[float, SearchDoc]] = []
 
         # Average document length for BM25-style normalization
-        avg_doc_len = sum(len(d.tokens) for d in self._docs) / num_docs if num_docs else 1
+        avg_doc_len = sum(d.length for d in self._docs) / num_docs if num_docs else 1
         k1 = 1.2  # term frequency saturation
         b = 0.75  # length normalization factor
 
         for doc in self._docs:
             score = 0.0
-            doc_len = len(doc.tokens) if doc.tokens else 1
+            doc_len = doc.length or 1
             for token in query_tokens:
                 tf = doc.token_counts.get(token, 0)
                 if tf == 0:
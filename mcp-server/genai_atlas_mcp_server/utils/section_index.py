@@ -0,0 +1,140 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Corpus-wide index of page sections.
+
+MkDocs' search_index.json has an entry for every heading on the site: the
+heading's anchor, its title and the page text up to the next heading. The
+search index merges those entries into their pages for ranking; this index
+keeps them apart, keyed by page and normalized heading, so one section (e.g.
+"TL;DR") can be read from many pages without fetching or converting them.
+
+Sections from search_index.json hold HTML and stop at their first
+subheading. Pages re-indexed by the change detector are replaced with their
+converted markdown sections, which include subsections.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from ..models import PageContent
+from .compression import get_codec
+from .html_converter import normalize_heading
+from .url_utils import page_key
+
+
+class IndexedSection:
+    """One section of one page, with its text held compressed."""
+
+    __slots__ = ('page_url', 'anchor', 'title', 'key', 'is_html', '_blob')
+
+    def __init__(self, page_url: str, anchor: str, title: str, text: str, is_html: bool = True):
+        """Initialize a section.
+
+        Args:
+            page_url: URL of the page the section is on.
+            anchor: The heading's id on the page.
+            title: Heading title.
+            text: Section body without its heading, as HTML or markdown.
+            is_html: Whether ``text`` is HTML (from search_index.json).
+        """
+        self.page_url = page_url
+        self.anchor = anchor
+        self.title = title
+        self.key = normalize_heading(title)
+        self.is_html = is_html
+        self._blob = get_codec('sections').compress(text)
+
+    @property
+    def url(self) -> str:
+        """Link to the section on its page."""
+        return f'{self.page_url}#{self.anchor}' if self.anchor else self.page_url
+
+    @property
+    def text(self) -> str:
+        """The section body, decompressed on access."""
+        return get_codec('sections').decompress(self._blob)
+
+
+def sections_from_page(page: PageContent, url: str) -> List[IndexedSection]:
+    """Build index entries from a converted page's outline.
+
+    Args:
+        page: The converted page.
+        url: URL to record the sections under.
+    """
+    sections = []
+    for section in page.sections:
+        # The slice starts with the heading line; index entries hold the body only
+        _, _, body = page.markdown[section.start:section.end].partition('\n')
+        sections.append(
+            IndexedSection(url, section.anchor, section.title, body.strip(), is_html=False)
+        )
+    return sections
+
+
+class SectionIndex:
+    """Sections of every page, by page key and normalized heading."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._pages: Dict[str, Dict[str, List[IndexedSection]]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed sections."""
+        return sum(
+            len(sections) for headings in self._pages.values() for sections in headings.values()
+        )
+
+    def add(self, section: IndexedSection) -> None:
+        """Add a section after those already indexed for its page."""
+        headings = self._pages.setdefault(page_key(section.page_url), {})
+        headings.setdefault(section.key, []).append(section)
+
+    def replace_page(self, url: str, sections: Iterable[IndexedSection]) -> None:
+        """Replace all of a page's sections."""
+        self.remove_page(url)
+        for section in sections:
+            self.add(section)
+
+    def remove_page(self, url: str) -> None:
+        """Drop a page's sections."""
+        self._pages.pop(page_key(url), None)
+
+    def get(self, url: str, heading: str) -> List[IndexedSection]:
+        """Return a page's sections with the given heading, in document order.
+
+        Args:
+            url: Any URL form of the page.
+            heading: Section title or anchor, matched like ``read_sections``
+                matches it.
+        """
+        return _match(self._pages.get(page_key(url), {}), heading)
+
+    def pages_with(self, heading: str) -> List[str]:
+        """Return the URLs of all pages that have a section with the given heading."""
+        urls = []
+        for headings in self._pages.values():
+            found = _match(headings, heading)
+            if found:
+                urls.append(found[0].page_url)
+        return urls
+
+    def common_headings(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return the headings found on the most pages, with their page counts."""
+        counts: Counter = Counter()
+        titles: Dict[str, str] = {}
+        for headings in self._pages.values():
+            for key, sections in headings.items():
+                counts[key] += 1
+                titles.setdefault(key, sections[0].title)
+        return [(titles[key], count) for key, count in counts.most_common(limit)]
+
+
+def _match(headings: Dict[str, List[IndexedSection]], heading: str) -> List[IndexedSection]:
+    """Look a heading up by normalized title, falling back to anchors."""
+    found = headings.get(normalize_heading(heading))
+    if found:
+        return found
+    anchor = heading.strip().lstrip('#')
+    return [s for sections in headings.values() for s in sections if s.anchor == anchor]
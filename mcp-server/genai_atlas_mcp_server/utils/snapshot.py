@@ -0,0 +1,205 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Single-file site snapshots.
+
+A snapshot is a ZIP archive holding every Atlas page already converted to
+markdown, with its section outline and diagrams. Each page is a separately
+compressed member named after its page key, so any page can be read by URL
+without touching the rest of the archive. ``manifest.json`` lists the pages.
+
+Build one with ``genai-atlas-mcp-server snapshot atlas.zip`` and serve from
+it with ``genai-atlas-mcp-server --snapshot atlas.zip``.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+from typing import Dict, List, Optional
+
+from loguru import logger
+from pydantic import ValidationError
+
+from .. import __version__
+from ..config import config
+from ..models import PageContent
+from .fetcher import fetch_atlas_page
+from .page_content import build_page_content
+from .search_index import get_search_index
+from .topic_index import get_topic_index
+from .url_utils import page_key
+from .workers import run_cpu_bound
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+
+
+def _member_name(key: str) -> str:
+    """Return the archive member name for a page key."""
+    return f'pages/{key or "index"}.json'
+
+
+class Snapshot:
+    """Read-only random access to a site snapshot archive."""
+
+    def __init__(self, path: str):
+        """Open a snapshot archive.
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported format.
+        """
+        self.path = path
+        try:
+            self._zip = zipfile.ZipFile(path)
+            manifest = json.loads(self._zip.read(MANIFEST_NAME))
+        except (OSError, KeyError, zipfile.BadZipFile, json.JSONDecodeError) as e:
+            raise ValueError(f'Not a valid Atlas snapshot: {path} ({e})') from e
+        if manifest.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError(f'Unsupported snapshot format: {manifest.get("format")}')
+        self.manifest = manifest
+        self._pages: Dict[str, Dict[str, str]] = manifest.get('pages', {})
+
+    def __len__(self) -> int:
+        """Return the number of pages in the snapshot."""
+        return len(self._pages)
+
+    def urls(self) -> List[str]:
+        """Return the URL of every page in the snapshot."""
+        return [info['url'] for info in self._pages.values()]
+
+    def __contains__(self, url: str) -> bool:
+        """Whether the snapshot holds the page a URL points to."""
+        return page_key(url) in self._pages
+
+    async def get(self, url: str) -> Optional[PageContent]:
+        """Read the converted page for a URL.
+
+        The member is read, decompressed and parsed in a thread, off the
+        event loop; ``ZipFile`` serializes reads of the archive itself.
+
+        Args:
+            url: Any URL form of an Atlas page.
+
+        Returns:
+            The converted page, or None if it is not in the snapshot.
+        """
+        key = page_key(url)
+        if key not in self._pages:
+            return None
+        return await asyncio.to_thread(self._read, key, url)
+
+    def _read(self, key: str, url: str) -> Optional[PageContent]:
+        """Read and parse one page member (blocking)."""
+        try:
+            return PageContent.model_validate_json(self._zip.read(_member_name(key)))
+        except (
+            KeyError, ValidationError, zipfile.BadZipFile, zlib.error, json.JSONDecodeError
+        ) as e:
+            logger.error(f'Corrupt snapshot entry for {url}: {e}')
+            return None
+
+    def close(self) -> None:
+        """Close the underlying archive."""
+        self._zip.close()
+
+
+async def _crawl_urls() -> List[str]:
+    """Collect every page URL listed in search_index.json and llms.txt, deduplicated."""
+    search_index = get_search_index()
+    topic_index = get_topic_index()
+    await asyncio.gather(search_index.ensure_loaded(), topic_index.ensure_loaded())
+
+    urls: Dict[str, str] = {}
+    for doc in search_index.get_all_docs():
+        urls.setdefault(page_key(doc.url), doc.url)
+    for topic in topic_index.list_topics():
+        urls.setdefault(page_key(topic.url), topic.url)
+    return list(urls.values())
+
+
+async def build_snapshot(output: str, max_concurrent: Optional[int] = None) -> int:
+    """Crawl the Atlas and write a snapshot archive.
+
+    The archive is written to a temporary file next to ``output`` and moved
+    into place once complete, so an interrupted run never leaves a partial
+    archive at ``output``.
+
+    Args:
+        output: Path of the archive to write.
+        max_concurrent: Maximum concurrent page fetches
+            (default: ``config.max_concurrent_fetches``).
+
+    Returns:
+        Number of pages written.
+    """
+    urls = await _crawl_urls()
+    semaphore = asyncio.Semaphore(max_concurrent or config.max_concurrent_fetches)
+    titles = {page_key(doc.url): doc.title for doc in get_search_index().get_all_docs()}
+
+    async def _convert_one(url: str) -> Optional[PageContent]:
+        async with semaphore:
+            fetched = await fetch_atlas_page(url)
+        if fetched is None:
+            logger.warning(f'Skipping {url} — fetch failed')
+            return None
+        html, fetched_url = fetched
+        return await run_cpu_bound(
+            build_page_content, html, fetched_url, titles.get(page_key(url), '')
+        )
+
+    logger.info(f'Snapshotting {len(urls)} pages...')
+    pages = await asyncio.gather(*[_convert_one(url) for url in urls])
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'generator': f'genai-atlas-mcp/{__version__}',
+        'created': int(time.time()),
+        'base_url': config.base_url,
+        'pages': {},
+    }
+    fd, partial = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(output)), prefix='.snapshot-', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f, zipfile.ZipFile(
+            f, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9
+        ) as zf:
+            for page in pages:
+                if page is None:
+                    continue
+                key = page_key(page.url)
+                zf.writestr(_member_name(key), page.model_dump_json())
+                manifest['pages'][key] = {'url': page.url, 'title': page.title}
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest))
+        # mkstemp creates the file private to its owner
+        os.chmod(partial, 0o644)
+        os.replace(partial, output)
+    except BaseException:
+        os.unlink(partial)
+        raise
+
+    count = len(manifest['pages'])
+    logger.info(f'Wrote {count} pages to {output}')
+    return count
+
+
+# Global singleton, opened lazily from config.snapshot_path
+_snapshot: Optional[Snapshot] = None
+_snapshot_failed = False
+
+
+def get_snapshot() -> Optional[Snapshot]:
+    """Get the configured snapshot, or None when not serving from one."""
+    global _snapshot, _snapshot_failed
+    if _snapshot is None and config.snapshot_path and not _snapshot_failed:
+        try:
+            _snapshot = Snapshot(config.snapshot_path)
+            logger.info(f'Serving {len(_snapshot)} pages from snapshot {config.snapshot_path}')
+        except ValueError as e:
+            logger.error(str(e))
+            _snapshot_failed = True
+    return _snapshot
@@ -3,19 +3,29 @@
 
 """Topic index built from the Atlas llms.txt file.
 
-Parses the llms.txt to build a structured topic hierarchy for browsing.
+Parses the llms.txt to build a structured topic hierarchy for browsing, and
+the site navigation exported by the site build into a topic tree (see
+``topic_tree``).
+Topics are grouped by section, and looked up by page key, normalized title
+or page name in hash maps. Anything else is matched fuzzily through a
+trigram index over titles and page paths, ranked by similarity.
 """
 
 import asyncio
 import re
-from typing import Dict, List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 
 from ..config import config
 from ..models import TopicEntry
+from .content_pack import pack_file_url
 from .fetcher import fetch_url
-from .url_utils import resolve_atlas_url
+from .topic_tree import TopicTree, directory_outline, parse_nav
+from .url_resolver import get_url_resolver
+from .url_utils import page_key, resolve_atlas_url
+from .workers import run_cpu_bound
 
 # Section mapping based on URL path prefixes
 SECTION_MAP: Dict[str, str] = {
@@ -30,6 +40,10 @@ SECTION_MAP: Dict[str, str] = {
 }
 
 
+# Fuzzy matches scoring below this trigram similarity are dropped
+MIN_TOPIC_SIMILARITY = 0.3
+
+
 def _classify_section(url: str) -> Optional[str]:
     """Classify a topic URL into a section name."""
     for prefix, section in SECTION_MAP.items():
@@ -38,50 +52,184 @@ def _classify_section(url: str) -> Optional[str]:
     return None
 
 
+def _normalize(text: str) -> str:
+    """Lowercase text and reduce it to words separated by single spaces."""
+    return ' '.join(re.findall(r'[a-z0-9]+', text.lower()))
+
+
+def _page_name(key: str) -> str:
+    """Return the words of a page's last path segment, without its numbering.
+
+    ``topics/2_0_x/2_1_key_primitives/2_1_7_rag/2_1_7_rag`` becomes ``rag``.
+    """
+    segment = key.rsplit('/', 1)[-1]
+    return re.sub(r'^[0-9_-]+', '', segment).replace('_', ' ').replace('-', ' ').strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Return the character trigrams of normalized text, padded at word starts and ends."""
+    grams: Set[str] = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _build_tree(
+    nav: Optional[str],
+    base_url: str,
+    pages: List[Tuple[str, str]],
+    index_urls: List[str],
+) -> TopicTree:
+    """Build the topic tree from the exported site navigation, else from llms.txt paths."""
+    outline = parse_nav(nav, f'{base_url}/') if nav else []
+    if not outline:
+        logger.warning('No site navigation found; building the topic tree from llms.txt paths')
+        outline = directory_outline(pages, index_urls, group_titles=SECTION_MAP)
+    sections = {page_key(url): _classify_section(url) for _, _, url in outline if url}
+    return TopicTree(outline, sections)
+
+
 class TopicIndex:
     """Index of all Atlas topics from llms.txt."""
 
     def __init__(self):
         """Initialize an empty topic index."""
         self._topics: List[TopicEntry] = []
+        # Topic positions by section, page key, normalized title and page name
+        self._sections: Dict[str, List[int]] = {}
+        self._by_key: Dict[str, int] = {}
+        self._by_title: Dict[str, int] = {}
+        self._by_name: Dict[str, int] = {}
+        # Trigram -> positions of the topics whose title or page path contains it
+        self._postings: Dict[str, List[int]] = {}
+        self._gram_counts: List[int] = []
+        self._match_text: List[str] = []
+        self._tree = TopicTree([])
+        # (title, url) of every llms.txt link, section index pages included
+        self._pages: List[Tuple[str, str]] = []
         self._loaded = False
+        self._stale = False
+        self._version = 0
         self._lock = asyncio.Lock()
 
     async def ensure_loaded(self) -> None:
-        """Load topics from llms.txt if not already loaded."""
-        if self._loaded:
+        """Load topics from llms.txt if not already loaded (or marked stale)."""
+        if self._loaded and not self._stale:
             return
         async with self._lock:
-            if self._loaded:
+            if self._loaded and not self._stale:
                 return
             await self._load()
 
+    def mark_stale(self) -> None:
+        """Reload llms.txt on next use; current topics stay available until then."""
+        self._stale = True
+
+    @property
+    def version(self) -> Optional[int]:
+        """A number that changes on every reload (None until loaded, or while stale)."""
+        return self._version if self._loaded and not self._stale else None
+
     async def _load(self) -> None:
         """Internal load logic — must be called under self._lock."""
         logger.info('Loading Atlas topic index from llms.txt...')
-        content = await fetch_url(config.llms_txt_url)
+        # The topic tree is built from the navigation the site build exports
+        content, nav = await asyncio.gather(
+            fetch_url(config.llms_txt_url), fetch_url(pack_file_url('nav.json'), missing_ok=True)
+        )
         if content is None:
             logger.error('Failed to load llms.txt')
             return
 
-        # Parse markdown links: - [Title](URL)
-        pattern = re.compile(r'-\s+\[([^\]]+)\]\(([^)]+)\)')
+        # Parse markdown links: - [Title](URL) or - [Title](URL): description, one per
+        # line; some Atlas paths contain (unnested) parentheses
+        pattern = re.compile(
+            r'^[ \t]*-[ \t]+\[([^\]]+)\]\(((?:[^()\n]|\([^()\n]*\))+?)\)(?:[ \t]*:.*)?\s*$',
+            re.MULTILINE,
+        )
+        topics: List[TopicEntry] = []
+        links: List[Tuple[str, str]] = []
+        index_urls: List[str] = []
+        pages: List[Tuple[str, str]] = []
         for match in pattern.finditer(content):
             title = match.group(1).strip()
             url = match.group(2).strip()
+            pages.append((title, url))
 
             # Skip generic "Index" entries
             if title == 'Index':
+                index_urls.append(url)
                 continue
+            links.append((title, url))
 
             # Resolve .md URLs to deployed HTML paths for direct usability
             resolved_url = resolve_atlas_url(url)
+            get_url_resolver().register_llms_link(url)
 
             section = _classify_section(url)
-            self._topics.append(TopicEntry(title=title, url=resolved_url, section=section))
+            topics.append(TopicEntry(title=title, url=resolved_url, section=section))
 
+        self._index_topics(topics)
+        self._pages = pages
+        self._tree = await run_cpu_bound(
+            _build_tree, nav, config.base_url, links, index_urls
+        )
         self._loaded = True
-        logger.info(f'Loaded {len(self._topics)} topics from llms.txt')
+        self._stale = False
+        self._version += 1
+        logger.info(
+            f'Loaded {len(self._topics)} topics from llms.txt '
+            f'and a topic tree of {len(self._tree)} nodes'
+        )
+
+    @property
+    def tree(self) -> TopicTree:
+        """The topic tree (empty until loaded)."""
+        return self._tree
+
+    @property
+    def pages(self) -> List[Tuple[str, str]]:
+        """``(title, url)`` of every llms.txt link in order, with ``.md`` URLs."""
+        return self._pages
+
+    def _index_topics(self, topics: List[TopicEntry]) -> None:
+        """Replace the topics and rebuild the section groups and lookup tables."""
+        sections: Dict[str, List[int]] = defaultdict(list)
+        by_key: Dict[str, int] = {}
+        by_title: Dict[str, int] = {}
+        names: Dict[str, List[int]] = defaultdict(list)
+        postings: Dict[str, List[int]] = defaultdict(list)
+        gram_counts: List[int] = []
+        match_text: List[str] = []
+        for position, topic in enumerate(topics):
+            if topic.section:
+                sections[topic.section].append(position)
+            key = page_key(topic.url)
+            by_key.setdefault(key, position)
+            title = _normalize(topic.title)
+            by_title.setdefault(title, position)
+            name = _normalize(_page_name(key))
+            if name:
+                names[name].append(position)
+            # The parent directory often names the topic better than the file
+            parent = _normalize(_page_name(key.rsplit('/', 1)[0])) if '/' in key else ''
+            words = name if parent == name else f'{parent} {name}'
+            grams = _trigrams(f'{title} {words}')
+            for gram in grams:
+                postings[gram].append(position)
+            gram_counts.append(len(grams))
+            match_text.append(f'{title} {words} {key.replace("_", " ")}')
+
+        self._topics = topics
+        self._sections = dict(sections)
+        self._by_key = by_key
+        self._by_title = by_title
+        # Page names shared by several topics are ambiguous; they are matched fuzzily
+        self._by_name = {name: found[0] for name, found in names.items() if len(found) == 1}
+        self._postings = dict(postings)
+        self._gram_counts = gram_counts
+        self._match_text = match_text
 
     def list_topics(self, section: Optional[str] = None) -> List[TopicEntry]:
         """List all topics, optionally filtered by section.
@@ -94,26 +242,74 @@ class TopicIndex:
         """
         if section:
             section_lower = section.lower()
-            return [
-                t for t in self._topics
-                if t.section and section_lower in t.section.lower()
+            groups = [
+                positions for name, positions in self._sections.items()
+                if section_lower in name.lower()
             ]
+            if len(groups) == 1:
+                return [self._topics[p] for p in groups[0]]
+            return [self._topics[p] for p in sorted(p for g in groups for p in g)]
         return self._topics
 
     def find_topic(self, path_or_title: str) -> Optional[TopicEntry]:
-        """Find a topic by path fragment or title.
+        """Find a topic by URL, path fragment or title.
+
+        URLs in any form (``.md``, ``.html``, directory style), exact titles
+        and page names (``rag`` for ``.../2_1_7_rag/2_1_7_rag.md``) are
+        looked up directly; anything else returns the best fuzzy match.
 
         Args:
-            path_or_title: A URL path fragment or title to search for.
+            path_or_title: A URL, URL path fragment or title to search for.
 
         Returns:
             The matching TopicEntry, or None.
         """
-        query = path_or_title.lower()
-        for topic in self._topics:
-            if query in topic.url.lower() or query in topic.title.lower():
-                return topic
-        return None
+        query = path_or_title.strip()
+        if not query:
+            return None
+        for table, key in (
+            (self._by_key, page_key(query)),
+            (self._by_title, _normalize(query)),
+            (self._by_name, _normalize(_page_name(page_key(query)))),
+        ):
+            position = table.get(key)
+            if position is not None:
+                return self._topics[position]
+        matches = self.match_topics(query, max_results=1)
+        return matches[0][0] if matches else None
+
+    def match_topics(self, query: str, max_results: int = 5) -> List[Tuple[TopicEntry, float]]:
+        """Rank topics by similarity of their title and page path to a query.
+
+        Scores are the trigram similarity (Dice coefficient) of the query and
+        the topic's title and the names of its page and directory, plus 1
+        when the query appears in the title or URL path verbatim.
+
+        Args:
+            query: Partial or misspelled title or path fragment.
+            max_results: Maximum topics to return.
+
+        Returns:
+            ``(topic, score)`` pairs, best first.
+        """
+        text = _normalize(query.replace('_', ' '))
+        grams = _trigrams(text)
+        if not grams:
+            return []
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                shared[position] += 1
+
+        scored = []
+        for position, count in shared.items():
+            score = 2 * count / (len(grams) + self._gram_counts[position])
+            if text in self._match_text[position]:
+                score += 1.0
+            if score >= MIN_TOPIC_SIMILARITY:
+                scored.append((score, position))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(self._topics[position], score) for score, position in scored[:max_results]]
 
 
 # Global singleton
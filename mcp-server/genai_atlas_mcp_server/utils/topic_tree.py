@@ -0,0 +1,258 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hierarchical tree of Atlas topics.
+
+The tree mirrors the site navigation: the ``nav`` of mkdocs.yml, exported at
+site build time by the ``content_pack_hook`` MkDocs hook as
+``content-pack/nav.json``, so it needs no access to the repository. On sites
+built without the hook, the tree is rebuilt from the directory structure of
+the llms.txt URLs.
+
+Every node gets a stable id (a hash of its page path), its parent and
+children, its depth and the breadcrumb of its ancestors' titles. Nodes are
+held in pre-order, so a subtree is one contiguous slice.
+"""
+
+import hashlib
+import json
+import posixpath
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+from loguru import logger
+
+from ..models import TopicNode
+from .content_pack import PACK_FORMAT
+from .html_converter import normalize_heading
+from .url_utils import page_key, resolve_atlas_url
+
+# (depth, title, url) of each navigation entry, in document order
+Outline = List[Tuple[int, str, Optional[str]]]
+
+
+def node_id(key: str) -> str:
+    """Return the stable id of the node for a page key or directory."""
+    return 't' + hashlib.blake2b(key.encode('utf-8'), digest_size=4).hexdigest()
+
+
+def _humanize(segment: str) -> str:
+    """Turn a directory name (``2_1_key_primitives``) into a title (``Key Primitives``)."""
+    words = re.sub(r'^[0-9_.-]+', '', segment).replace('_', ' ').replace('-', ' ')
+    return words.strip().title() or segment
+
+
+def parse_nav(text: str, base_url: str) -> Outline:
+    """Parse the site navigation exported at build time.
+
+    Args:
+        text: JSON of ``content-pack/nav.json``: the navigation outline, as
+            ``[depth, title, url]`` entries with URLs relative to the site root
+            (None for sections without an index page).
+        base_url: URL the navigation links are relative to (the site root).
+
+    Returns:
+        The outline with absolute URLs; empty if the text is not a valid
+        navigation file.
+    """
+    try:
+        data = json.loads(text)
+        if data.get('format') != PACK_FORMAT:
+            raise ValueError(f'unsupported format {data.get("format")}')
+        outline: Outline = []
+        for depth, title, url in data['nav']:
+            if not isinstance(depth, int) or not isinstance(title, str):
+                raise ValueError(f'invalid entry {[depth, title, url]}')
+            outline.append((depth, title, urljoin(base_url, url) if url else None))
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f'Invalid site navigation: {e}')
+        return []
+    return outline
+
+
+def directory_outline(
+    pages: Sequence[Tuple[str, str]],
+    index_urls: Sequence[str],
+    group_titles: Optional[Dict[str, str]] = None,
+) -> Outline:
+    """Build an outline from the directory structure of page URLs.
+
+    Directories become group nodes, titled after the directory and linked to
+    its index page when there is one. Directories holding a single page are
+    folded into that page.
+
+    Args:
+        pages: ``(title, url)`` of every page, in order, with URLs as in
+            llms.txt (``.md``).
+        index_urls: URLs of directory index pages without a title of their own.
+        group_titles: Optional titles by directory name prefix, for
+            directories without a titled index page.
+    """
+    group_titles = group_titles or {}
+    index_by_dir = {page_key(url): resolve_atlas_url(url) for url in index_urls}
+    keys = [page_key(url) for _, url in pages]
+    pages_per_dir = Counter(posixpath.dirname(key) for key in keys)
+    tree: Dict[str, List[str]] = {'': []}
+    titles: Dict[str, Tuple[str, Optional[str]]] = {}
+    for (title, url), key in zip(pages, keys):
+        parts = key.split('/')
+        # Atlas pages usually sit alone in a directory named after them; an
+        # index page already stands for its directory
+        is_index = posixpath.basename(url.split('#', 1)[0]) in ('index.md', 'index.html')
+        if len(parts) > 1 and not is_index and pages_per_dir[posixpath.dirname(key)] == 1:
+            parts = parts[:-1]
+        parent = ''
+        for i in range(1, len(parts)):
+            directory = '/'.join(parts[:i])
+            if directory not in tree:
+                tree[directory] = []
+                tree[parent].append(directory)
+                name = parts[i - 1]
+                group_title = next(
+                    (t for prefix, t in group_titles.items() if name.startswith(prefix)),
+                    _humanize(name),
+                )
+                titles[directory] = (group_title, index_by_dir.get(directory))
+            parent = directory
+        node = '/'.join(parts)
+        if node not in titles:
+            tree.setdefault(node, [])
+            tree[parent].append(node)
+        titles[node] = (title, resolve_atlas_url(url))
+
+    outline: Outline = []
+
+    def _walk(directory: str, depth: int) -> None:
+        for child in tree.get(directory, []):
+            title, url = titles[child]
+            outline.append((depth, title, url))
+            _walk(child, depth + 1)
+
+    # Skip the directories every page shares (e.g. "topics")
+    root = ''
+    while len(tree[root]) == 1 and tree.get(tree[root][0]) and titles[tree[root][0]][1] is None:
+        root = tree[root][0]
+    _walk(root, 0)
+    return outline
+
+
+class TopicTree:
+    """The topic hierarchy, in pre-order."""
+
+    def __init__(self, outline: Outline, sections: Optional[Dict[str, Optional[str]]] = None):
+        """Build the tree from an outline.
+
+        Args:
+            outline: ``(depth, title, url)`` entries in pre-order.
+            sections: Optional section name by page key, inherited by group
+                nodes from their first page.
+        """
+        sections = sections or {}
+        self._nodes: List[TopicNode] = []
+        self._ends: List[int] = []
+        self._by_id: Dict[str, int] = {}
+        self._by_key: Dict[str, int] = {}
+        self._by_title: Dict[str, int] = {}
+
+        # (outline depth, node) of the open ancestors
+        ancestors: List[Tuple[int, TopicNode]] = []
+        for depth, title, url in outline:
+            while ancestors and ancestors[-1][0] >= depth:
+                ancestors.pop()
+            parent = ancestors[-1][1] if ancestors else None
+            node = TopicNode(
+                id='',
+                title=title,
+                url=url,
+                section=sections.get(page_key(url)) if url else None,
+                depth=len(ancestors),
+                breadcrumbs=[*parent.breadcrumbs, parent.title] if parent else [],
+            )
+            self._nodes.append(node)
+            ancestors.append((depth, node))
+
+        self._ends = [len(self._nodes)] * len(self._nodes)
+        open_nodes: List[int] = []
+        for position, node in enumerate(self._nodes):
+            while open_nodes and self._nodes[open_nodes[-1]].depth >= node.depth:
+                self._ends[open_nodes.pop()] = position
+            open_nodes.append(position)
+
+        # Ids, bottom-up: groups without a page are keyed by their pages' common directory
+        keys: List[str] = [''] * len(self._nodes)
+        for position in range(len(self._nodes) - 1, -1, -1):
+            node = self._nodes[position]
+            if node.url:
+                keys[position] = page_key(node.url)
+                continue
+            inner = [keys[p] for p in range(position + 1, self._ends[position]) if keys[p]]
+            common = posixpath.commonpath(inner) if inner else ''
+            keys[position] = common or f'nav:{normalize_heading(node.title)}'
+            if node.section is None:
+                node.section = next(
+                    (self._nodes[p].section for p in range(position + 1, self._ends[position])
+                     if self._nodes[p].section),
+                    None,
+                )
+        for position, node in enumerate(self._nodes):
+            base = node.id = node_id(keys[position])
+            suffix = 1
+            while node.id in self._by_id:
+                suffix += 1
+                node.id = f'{base}-{suffix}'
+            self._by_id[node.id] = position
+            if node.url:
+                self._by_key.setdefault(keys[position], position)
+            self._by_title.setdefault(normalize_heading(node.title), position)
+
+        stack = []
+        for node in self._nodes:
+            while stack and stack[-1].depth >= node.depth:
+                stack.pop()
+            if stack:
+                node.parent = stack[-1].id
+                stack[-1].children.append(node.id)
+            stack.append(node)
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self._nodes)
+
+    def get(self, ref: str) -> Optional[TopicNode]:
+        """Look a node up by id, page URL or path, or title.
+
+        Args:
+            ref: A node id, any URL form of its page, or its exact title
+                (case-insensitive).
+        """
+        ref = ref.strip()
+        for table, key in (
+            (self._by_id, ref),
+            (self._by_key, page_key(ref)),
+            (self._by_title, normalize_heading(ref)),
+        ):
+            position = table.get(key)
+            if position is not None:
+                return self._nodes[position]
+        return None
+
+    def descendants(
+        self, root: Optional[TopicNode] = None, depth: Optional[int] = None
+    ) -> List[TopicNode]:
+        """Return the nodes below ``root`` (the whole tree if None), in pre-order.
+
+        Args:
+            root: Node whose subtree to list; not itself included.
+            depth: Optional number of levels to descend (1 lists children only).
+        """
+        if root is None:
+            start, end, base = 0, len(self._nodes), -1
+        else:
+            start = self._by_id[root.id] + 1
+            end, base = self._ends[start - 1], root.depth
+        nodes = self._nodes[start:end]
+        if depth is not None:
+            nodes = [node for node in nodes if node.depth - base <= depth]
+        return nodes
@@ -0,0 +1,101 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Canonical URL resolution for Atlas pages.
+
+Agents pass page URLs in many forms (``.md`` links from llms.txt, directory
+style, ``.html``). Probing each MkDocs deployment pattern in turn costs a
+round trip per miss, so the resolver keeps a table from page key to the
+canonical deployed HTML URL:
+
+- ``search_index.json`` locations are deployed paths and are registered as-is.
+- llms.txt links point at the ``.md`` copy the llmstxt plugin writes next to
+  each HTML file, so the canonical URL is the same path with ``.html``.
+- For URLs in neither index, the caller races all candidate patterns and
+  reports the winner, which is remembered along with which pattern won.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .url_utils import page_key, resolve_atlas_url, try_html_fallback_url
+
+# Candidate patterns, in the default probing order
+PATTERN_RESOLVED = 'resolved'
+PATTERN_HTML = 'html'
+PATTERN_INDEX = 'index'
+
+
+class UrlResolver:
+    """Table of page key -> canonical HTML URL, learned from the indexes and from probes."""
+
+    def __init__(self):
+        """Initialize an empty resolution table."""
+        self._canonical: Dict[str, str] = {}
+        self._pattern_wins: Counter = Counter()
+
+    def __len__(self) -> int:
+        """Return the number of known pages."""
+        return len(self._canonical)
+
+    def register(self, html_url: str) -> None:
+        """Register a known deployed HTML URL (e.g. a search_index.json location)."""
+        self._canonical[page_key(html_url)] = html_url.split('#', 1)[0]
+
+    def register_llms_link(self, md_url: str) -> None:
+        """Register an llms.txt link; its HTML page sits at the same path with ``.html``."""
+        if md_url.endswith('.md'):
+            self._canonical.setdefault(page_key(md_url), md_url[: -len('.md')] + '.html')
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Return the canonical HTML URL for any form of a page URL, if known."""
+        return self._canonical.get(page_key(url))
+
+    def forget(self, url: str) -> None:
+        """Drop a mapping that turned out to be stale."""
+        self._canonical.pop(page_key(url), None)
+
+    def candidates(self, url: str) -> List[Tuple[str, str]]:
+        """Return ``(pattern, url)`` candidates for an unknown URL.
+
+        Patterns that have won before are tried first.
+        """
+        resolved_url = resolve_atlas_url(url)
+        html_url = try_html_fallback_url(url)
+        if html_url is None and resolved_url.endswith('/'):
+            html_url = resolved_url.rstrip('/') + '.html'
+        by_pattern = {PATTERN_RESOLVED: resolved_url}
+        if html_url:
+            by_pattern[PATTERN_HTML] = html_url
+        if not resolved_url.endswith('.html'):
+            by_pattern[PATTERN_INDEX] = resolved_url.rstrip('/') + '/index.html'
+
+        default_order = [PATTERN_RESOLVED, PATTERN_HTML, PATTERN_INDEX]
+        order = sorted(
+            by_pattern, key=lambda p: (-self._pattern_wins[p], default_order.index(p))
+        )
+        seen = set()
+        result = []
+        for pattern in order:
+            candidate = by_pattern[pattern]
+            if candidate not in seen:
+                seen.add(candidate)
+                result.append((pattern, candidate))
+        return result
+
+    def learn(self, url: str, pattern: str, html_url: str) -> None:
+        """Remember the URL that answered for ``url`` and which pattern produced it."""
+        self._canonical[page_key(url)] = html_url
+        self._pattern_wins[pattern] += 1
+
+
+# Global singleton
+_resolver: Optional[UrlResolver] = None
+
+
+def get_url_resolver() -> UrlResolver:
+    """Get the global URL resolver singleton."""
+    global _resolver
+    if _resolver is None:
+        _resolver = UrlResolver()
+    return _resolver
@@ -3,9 +3,12 @@
 
 """URL validation and resolution utilities for the GenAI Atlas MCP Server."""
 
+import functools
+import os
 import re
+from pathlib import Path
 from typing import Optional
-from urllib.parse import urlparse
+from urllib.parse import unquote, urlparse
 
 from ..config import config
 
@@ -14,6 +17,89 @@ _ALLOWED_DOMAINS = frozenset({
     'awslabs.github.io',
 })
 
+# Public location of the Atlas — mapped onto the local site build when one is configured
+ATLAS_PUBLIC_URL = 'https://awslabs.github.io/generative-ai-atlas'
+
+
+@functools.lru_cache(maxsize=4)
+def _resolve_dir(path: str) -> Path:
+    """Resolve a directory path (a filesystem lookup, so cached)."""
+    return Path(path).expanduser().resolve()
+
+
+def _site_root() -> Optional[Path]:
+    """Return the resolved local site directory, if one is configured."""
+    if not config.site_dir:
+        return None
+    return _resolve_dir(config.site_dir)
+
+
+def _within(path: Path, root: Path) -> bool:
+    """Whether a path is a directory or anything below it."""
+    return path == root or root in path.parents
+
+
+def atlas_url_to_site_path(url: str) -> Optional[Path]:
+    """Map an Atlas URL onto a path in the local MkDocs site build, without disk access.
+
+    Both ``file://`` URLs inside the site directory and public Atlas URLs
+    (under ``config.base_url`` or the awslabs.github.io site) are mapped.
+    ``..`` segments are folded lexically; symlinks and directories are left
+    to ``atlas_url_to_local_path``.
+
+    Args:
+        url: The URL to map.
+
+    Returns:
+        The path, or None if no site directory is configured or the URL does
+        not point into it.
+    """
+    root = _site_root()
+    if root is None:
+        return None
+
+    parsed = urlparse(url)
+    if parsed.scheme == 'file':
+        candidate = Path(os.path.normpath(unquote(parsed.path)))
+        # The URL may name the site directory as configured, before symlinks are resolved
+        configured = Path(os.path.abspath(os.path.expanduser(config.site_dir)))
+        return candidate if _within(candidate, root) or _within(candidate, configured) else None
+
+    bare = url.split('#', 1)[0].split('?', 1)[0]
+    for prefix in (config.base_url.rstrip('/'), ATLAS_PUBLIC_URL):
+        if bare == prefix or bare.startswith(prefix + '/'):
+            relative = unquote(bare[len(prefix):]).lstrip('/')
+            candidate = Path(os.path.normpath(root / relative))
+            return candidate if _within(candidate, root) else None
+    return None
+
+
+def atlas_url_to_local_path(url: str) -> Optional[Path]:
+    """Map an Atlas URL onto a file in the local MkDocs site build.
+
+    As ``atlas_url_to_site_path``, with symlinks resolved; directory paths
+    map to their ``index.html``. Blocking (filesystem lookups): call it from
+    the worker thread that reads the file.
+
+    Args:
+        url: The URL to map.
+
+    Returns:
+        The local file path, or None if no site directory is configured or the
+        URL does not point into it.
+    """
+    root = _site_root()
+    candidate = atlas_url_to_site_path(url)
+    if root is None or candidate is None:
+        return None
+    candidate = candidate.resolve()
+    # Never serve files outside the site directory (e.g. via symlinks)
+    if not _within(candidate, root):
+        return None
+    if candidate.is_dir():
+        candidate = candidate / 'index.html'
+    return candidate
+
 
 def validate_atlas_url(url: str) -> Optional[str]:
     """Validate that a URL belongs to the Atlas site.
@@ -29,6 +115,14 @@ def validate_atlas_url(url: str) -> Optional[str]:
     except Exception:
         return f'Error: Invalid URL format: {url}'
 
+    if parsed.scheme == 'file':
+        if atlas_url_to_site_path(url) is None:
+            return (
+                f'Error: file:// URLs must point into the local Atlas site build '
+                f'({config.site_dir or "not configured"}): {url}'
+            )
+        return None
+
     if not parsed.scheme or not parsed.netloc:
         return f'Error: URL must be a full URL with scheme and domain: {url}'
 
@@ -86,3 +180,48 @@ def try_html_fallback_url(url: str) -> Optional[str]:
     if url.endswith('.md'):
         return re.sub(r'\.md$', '.html', url)
     return None
+
+
+def atlas_relative_path(url: str) -> Optional[str]:
+    """Return the path of an Atlas URL relative to the site root.
+
+    Args:
+        url: An Atlas URL (public, ``config.base_url`` or ``file://``).
+
+    Returns:
+        The unquoted relative path without fragment or query, or None if the
+        URL is not under a known Atlas root.
+    """
+    bare = url.split('#', 1)[0].split('?', 1)[0]
+    root = _site_root()
+    prefixes = [config.base_url.rstrip('/'), ATLAS_PUBLIC_URL]
+    if root is not None:
+        prefixes.append(root.as_uri())
+    for prefix in prefixes:
+        if bare == prefix or bare.startswith(prefix + '/'):
+            return unquote(bare[len(prefix):]).lstrip('/')
+    return None
+
+
+def page_key(url: str) -> str:
+    """Return a canonical key for the Atlas page a URL points to.
+
+    All the forms MkDocs and llms.txt use for one page — ``foo/bar.md``,
+    ``foo/bar.html``, ``foo/bar/`` and ``foo/bar/index.html`` — map to the
+    same key (``foo/bar``), relative to the site root.
+
+    Args:
+        url: An Atlas URL (public, ``config.base_url`` or ``file://``).
+
+    Returns:
+        The page key.
+    """
+    path = atlas_relative_path(url)
+    if path is None:
+        path = unquote(url.split('#', 1)[0].split('?', 1)[0])
+    path = path.strip('/')
+    for suffix in ('index.html', 'index.md', '.html', '.md'):
+        if path.endswith(suffix):
+            path = path[: -len(suffix)]
+            break
+    return path.strip('/')
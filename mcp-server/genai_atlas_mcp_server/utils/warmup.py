@@ -0,0 +1,51 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Background warm-up of the Atlas indexes at server start.
+
+Both indexes, the content pack index and the llms-full.txt corpus otherwise
+load lazily on the first tool call that needs them, one after the other.
+Warm-up loads them concurrently while the MCP handshake proceeds; a tool call
+that arrives mid-load simply waits on the index lock instead of starting a
+second download.
+"""
+
+import asyncio
+
+from loguru import logger
+
+from ..config import config
+from .content_pack import get_content_pack
+from .corpus import get_corpus
+from .fetcher import fetch_atlas_page
+from .search_index import get_search_index
+from .topic_index import get_topic_index
+
+
+async def warm_up(prefetch: int = 0) -> None:
+    """Load the indexes, the content pack and the corpus concurrently, then prefetch pages.
+
+    Args:
+        prefetch: Number of topic pages to prefetch into the page cache, in
+            llms.txt order (the curated reading order of the Atlas).
+    """
+    logger.info('Warming up Atlas indexes...')
+    loads = [get_search_index().ensure_loaded(), get_topic_index().ensure_loaded()]
+    if config.content_pack:
+        loads.append(get_content_pack().ensure_loaded())
+    if config.corpus:
+        loads.append(get_corpus().ensure_loaded())
+    await asyncio.gather(*loads)
+
+    if prefetch <= 0:
+        return
+
+    urls = [topic.url for topic in get_topic_index().list_topics()[:prefetch]]
+    semaphore = asyncio.Semaphore(config.max_concurrent_fetches)
+
+    async def _prefetch_one(url: str) -> None:
+        async with semaphore:
+            await fetch_atlas_page(url)
+
+    await asyncio.gather(*[_prefetch_one(url) for url in urls])
+    logger.info(f'Prefetched {len(urls)} topic pages')
@@ -0,0 +1,199 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Worker pool for CPU-bound page conversion.
+
+Parsing a page with BeautifulSoup and converting it with markdownify is tens
+of milliseconds of pure Python. Run inside a tool handler it stalls every
+other request and HTTP read on the event loop, so concurrent users serialize
+behind each other's parsing. ``run_cpu_bound`` hands that work to a pool and
+awaits the result instead.
+
+Worker threads (the default) keep the loop responsive, since the interpreter
+switches away from a converting thread every few milliseconds, but all
+conversions still share one core. Worker processes convert in parallel at the
+cost of pickling the HTML in and the result out; functions sent to them must
+be module-level and importable.
+
+Submissions are bounded: at most ``workers + max_queued`` jobs are handed to
+the pool at once. Further callers wait on the event loop for a slot, rather
+than piling up in the executor's unbounded queue.
+"""
+
+import asyncio
+import multiprocessing
+import time
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from loguru import logger
+
+from ..config import config
+
+T = TypeVar('T')
+
+EXECUTOR_KINDS = ('thread', 'process')
+
+
+class WorkerPool:
+    """Runs CPU-bound functions off the event loop with bounded queueing."""
+
+    def __init__(self, workers: int, kind: str = 'thread', max_queued: int = 32):
+        """Initialize a pool; the executor itself is started on first use.
+
+        Args:
+            workers: Number of worker threads or processes. ``0`` runs every
+                job inline on the event loop.
+            kind: ``'thread'`` or ``'process'``.
+            max_queued: Jobs that may wait in the executor for a free worker.
+        """
+        if kind not in EXECUTOR_KINDS:
+            logger.warning(f'Unknown worker kind {kind!r}; using threads')
+            kind = 'thread'
+        self.workers = max(0, workers)
+        self.kind = kind
+        self.max_queued = max(0, max_queued)
+        self._executor: Optional[Executor] = None
+        # asyncio primitives belong to one loop; keep a semaphore per loop
+        self._slots: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = (
+            weakref.WeakKeyDictionary()
+        )
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_wait = 0.0
+
+    def _get_executor(self) -> Executor:
+        """Return the executor, starting it if needed."""
+        if self._executor is None:
+            if self.kind == 'process':
+                # spawn, not fork: the server process runs threads (executor, logging)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='atlas-convert'
+                )
+        return self._executor
+
+    def _slots_for(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        """Return the submission semaphore for a loop."""
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.workers + self.max_queued)
+        return slots
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the pool and return its result.
+
+        Waits for a submission slot when the pool is saturated. Cancelling the
+        caller drops a job that has not started; a running job finishes in the
+        background and keeps its slot until it does.
+
+        Raises:
+            Whatever ``fn`` raises.
+        """
+        if self.workers == 0:
+            return fn(*args)
+
+        loop = asyncio.get_running_loop()
+        slots = self._slots_for(loop)
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.max_wait = max(self.max_wait, time.perf_counter() - start)
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        self.submitted += 1
+        self.in_flight += 1
+
+        def _done(future: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._finished, future, slots)
+            except RuntimeError:  # loop already closed
+                pass
+
+        future.add_done_callback(_done)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _finished(self, future: Future, slots: asyncio.Semaphore) -> None:
+        """Release a job's slot and record its outcome (runs on the loop)."""
+        slots.release()
+        self.in_flight -= 1
+        if future.cancelled():
+            return
+        if future.exception() is None:
+            self.completed += 1
+            return
+        self.failed += 1
+        if isinstance(future.exception(), BrokenProcessPool):
+            logger.warning('Conversion worker process died; restarting the pool')
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool configuration and job counters."""
+        return {
+            'kind': self.kind,
+            'workers': self.workers,
+            'max_queued': self.max_queued,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'max_wait_ms': round(self.max_wait * 1000, 1),
+        }
+
+    def close(self) -> None:
+        """Stop the workers, dropping jobs that have not started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global singleton
+_worker_pool: Optional[WorkerPool] = None
+
+
+def get_worker_pool() -> WorkerPool:
+    """Get the global conversion worker pool singleton."""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = WorkerPool(
+            config.convert_workers, kind=config.convert_executor, max_queued=config.convert_queue
+        )
+    return _worker_pool
+
+
+async def run_cpu_bound(fn: Callable[..., T], *args: Any) -> T:
+    """Run a CPU-bound function in the global worker pool.
+
+    Args:
+        fn: Function to run; module-level when the pool uses processes.
+        *args: Positional arguments for ``fn`` (picklable for processes).
+
+    Returns:
+        The function's result.
+    """
+    return await get_worker_pool().run(fn, *args)
+
+
+def close_worker_pool() -> None:
+    """Shut down the global worker pool. Call during server shutdown."""
+    global _worker_pool
+    if _worker_pool is not None:
+        logger.info(f'Conversion pool stats: {_worker_pool.stats()}')
+        _worker_pool.close()
+        _worker_pool = None
@@ -0,0 +1,149 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for sitemap-driven change detection."""
+
+import asyncio
+
+import pytest
+
+from genai_atlas_mcp_server.utils import (
+    change_detector,
+    page_cache,
+    search_index,
+    topic_index,
+    url_resolver,
+)
+from genai_atlas_mcp_server.utils.change_detector import ChangeDetector, parse_sitemap
+from genai_atlas_mcp_server.utils.search_index import AtlasSearchIndex, SearchDoc
+from genai_atlas_mcp_server.utils.url_resolver import UrlResolver
+
+BASE = 'https://awslabs.github.io/generative-ai-atlas'
+
+
+def _sitemap(entries):
+    urls = ''.join(
+        f'<url><loc>{BASE}/{path}</loc><lastmod>{lastmod}</lastmod></url>'
+        for path, lastmod in entries.items()
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+    )
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Fresh singletons plus a fake sitemap and pages."""
+    state = {
+        'sitemap': _sitemap({'topics/a.html': '2025-01-01', 'topics/b.html': '2025-01-02'}),
+        'pages': {
+            f'{BASE}/topics/a.html': '<article><h1>Alpha</h1><p>old words</p></article>',
+            f'{BASE}/topics/b.html': '<article><h1>Beta</h1><p>beta words</p></article>',
+        },
+        'fetched': [],
+    }
+
+    async def _fetch_url(url, missing_ok=False):
+        return state['sitemap']
+
+    async def _fetch_atlas_page(url):
+        state['fetched'].append(url)
+        html = state['pages'].get(url)
+        return None if html is None else (html, url)
+
+    monkeypatch.setattr(change_detector, 'fetch_url', _fetch_url)
+    monkeypatch.setattr(change_detector, 'fetch_atlas_page', _fetch_atlas_page)
+    monkeypatch.setattr(url_resolver, '_resolver', UrlResolver())
+    monkeypatch.setattr(page_cache, '_page_cache', page_cache.PageCache(8))
+    monkeypatch.setattr(topic_index, '_topic_index', topic_index.TopicIndex())
+
+    index = AtlasSearchIndex()
+    index._docs = [
+        SearchDoc(location='topics/a.html', title='Alpha', text='old words'),
+        SearchDoc(location='topics/b.html', title='Beta', text='beta words'),
+    ]
+    for doc in index._docs:
+        index._count_doc(doc, +1)
+    index._loaded = True
+    monkeypatch.setattr(search_index, '_index', index)
+    return state
+
+
+def test_parse_sitemap_keys_by_page():
+    """Entries are keyed by page key with their lastmod date."""
+    entries = parse_sitemap(_sitemap({'topics/a.html': '2025-01-01'}))
+    assert entries == {'topics/a': {'loc': f'{BASE}/topics/a.html', 'lastmod': '2025-01-01'}}
+
+
+def test_parse_sitemap_rejects_malformed_xml():
+    """Malformed sitemaps raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_sitemap('<urlset>')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('lastmod', ['2025-01-01', ''])
+async def test_sitemap_without_page_dates_stops_polling(site, lastmod):
+    """Uniform (build date) or missing lastmod values cannot tell changes apart."""
+    site['sitemap'] = _sitemap({'topics/a.html': lastmod, 'topics/b.html': lastmod})
+    detector = ChangeDetector()
+    assert await detector.poll() is None
+    assert detector.disabled
+    # run() returns instead of polling forever
+    await asyncio.wait_for(detector.run(3600), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_first_poll_is_baseline(site):
+    """The first poll records state without reporting changes."""
+    assert await ChangeDetector().poll() is None
+
+
+@pytest.mark.asyncio
+async def test_only_changed_pages_are_refreshed(site):
+    """A lastmod bump re-fetches and re-indexes just that page."""
+    detector = ChangeDetector()
+    await detector.poll()
+    cache = page_cache.get_page_cache()
+    cache.put(f'{BASE}/topics/a.html', '<old/>', f'{BASE}/topics/a.html')
+    cache.put(f'{BASE}/topics/b.html', '<b/>', f'{BASE}/topics/b.html')
+
+    site['sitemap'] = _sitemap({'topics/a.html': '2025-02-01', 'topics/b.html': '2025-01-02'})
+    site['pages'][f'{BASE}/topics/a.html'] = (
+        '<article><h1>Alpha</h1><p>fresh guardrails</p></article>'
+    )
+    changes = await detector.poll()
+    assert changes.changed == [f'{BASE}/topics/a.html']
+    assert not changes.added and not changes.removed
+
+    await detector.apply(changes)
+    assert site['fetched'] == [f'{BASE}/topics/a.html']
+    assert cache.get(f'{BASE}/topics/a.html') is None
+    assert cache.get(f'{BASE}/topics/b.html') is not None
+
+    index = search_index.get_search_index()
+    assert [r.title for r in index.search('guardrails')] == ['Alpha']
+    assert index.search('old') == []
+    assert index._doc_freq['words'] == 1
+
+
+@pytest.mark.asyncio
+async def test_added_and_removed_pages(site):
+    """New pages are indexed, removed pages dropped, and topics marked stale."""
+    detector = ChangeDetector()
+    await detector.poll()
+    topics = topic_index.get_topic_index()
+    topics._loaded = True
+
+    site['sitemap'] = _sitemap({'topics/a.html': '2025-01-01', 'topics/c.html': '2025-03-01'})
+    site['pages'][f'{BASE}/topics/c.html'] = '<article><h1>Gamma</h1><p>agents</p></article>'
+    changes = await detector.poll()
+    assert changes.added == [f'{BASE}/topics/c.html']
+    assert changes.removed == [f'{BASE}/topics/b.html']
+
+    await detector.apply(changes)
+    index = search_index.get_search_index()
+    assert [r.title for r in index.search('agents')] == ['Gamma']
+    assert index.search('beta') == []
+    assert topics._stale
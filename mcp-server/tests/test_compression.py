@@ -0,0 +1,77 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for compressed cache storage."""
+
+import pytest
+
+from genai_atlas_mcp_server.utils import compression
+from genai_atlas_mcp_server.utils.compression import TextCodec
+from genai_atlas_mcp_server.utils.page_cache import PageCache
+
+BOILERPLATE = ''.join(f'<li><a href="/topics/page_{i}.html">Page {i}</a></li>' for i in range(300))
+
+
+def _page(n: int) -> str:
+    return f'<nav>{BOILERPLATE}</nav><article><h1>Topic {n}</h1><p>Body {n} é</p></article>'
+
+
+@pytest.mark.parametrize('use_zstd', [False, True])
+def test_round_trip_and_dictionary(use_zstd):
+    """Blobs round-trip before and after priming; the dictionary removes boilerplate."""
+    if use_zstd and compression.zstandard is None:
+        pytest.skip('zstandard not installed')
+    codec = TextCodec(use_zstd=use_zstd)
+    first = codec.compress(_page(0))
+    assert codec.primed
+
+    blobs = [codec.compress(_page(n)) for n in range(1, 5)]
+    assert codec.decompress(first) == _page(0)
+    assert [codec.decompress(b) for b in blobs] == [_page(n) for n in range(1, 5)]
+    assert max(map(len, blobs)) < len(first)
+
+
+def test_short_text_stored_raw():
+    """Tiny texts are not worth compressing and do not prime the dictionary."""
+    codec = TextCodec()
+    assert codec.decompress(codec.compress('short')) == 'short'
+    assert not codec.primed
+
+
+def test_corrupt_blob_raises_value_error():
+    """Corrupt blobs surface as ValueError."""
+    codec = TextCodec(use_zstd=False)
+    blob = codec.compress(_page(0))
+    with pytest.raises(ValueError):
+        codec.decompress(blob[:1] + b'garbage')
+
+
+@pytest.mark.parametrize('use_zstd', [False, True])
+def test_blob_from_another_dictionary_raises_value_error(use_zstd):
+    """A dictionary blob only decodes with the dictionary it was compressed with."""
+    if use_zstd and compression.zstandard is None:
+        pytest.skip('zstandard not installed')
+    writer, reader, fresh = (TextCodec(use_zstd=use_zstd) for _ in range(3))
+    writer.compress(_page(0))
+    reader.compress(_page(9))
+    blob = writer.compress(_page(1))
+    assert writer.decompress(blob) == _page(1)
+    for codec in (reader, fresh):
+        with pytest.raises(ValueError, match='another dictionary'):
+            codec.decompress(blob)
+
+
+def test_page_cache_byte_budget():
+    """The cache evicts by compressed size and decompresses on access."""
+    cache = PageCache(max_entries=100)
+    for n in range(2):
+        cache.put(f'https://example.com/{n}.html', _page(n), f'https://example.com/{n}.html')
+    one_page = cache.get_entry('https://example.com/1.html').size
+    assert one_page < len(_page(1))
+
+    cache = PageCache(max_entries=100, max_bytes=one_page * 2.5)
+    for n in range(10):
+        cache.put(f'https://example.com/{n}.html', _page(n), f'https://example.com/{n}.html')
+    assert 2 <= len(cache) < 10
+    assert cache.size_bytes <= one_page * 2.5
+    assert cache.get('https://example.com/9.html')[0] == _page(9)
@@ -0,0 +1,115 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the converted-page cache."""
+
+import pytest
+
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.tools.list_sections import list_sections
+from genai_atlas_mcp_server.tools.read_sections import read_sections
+from genai_atlas_mcp_server.tools.read_topic import read_topic
+from genai_atlas_mcp_server.utils import content_cache
+from genai_atlas_mcp_server.utils.content_cache import ContentCache, convert_page
+
+URL = 'https://awslabs.github.io/generative-ai-atlas/topics/rag/rag.html'
+HTML = (
+    '<article><h1>RAG</h1><h2>TL;DR</h2><p>'
+    + 'Retrieval first. ' * 200
+    + '</p><h2>Architecture</h2><p>Index, retrieve, generate.</p></article>'
+)
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    """Fresh cache, a fake site serving ``HTML`` and a count of conversions."""
+    state = {'html': HTML, 'count': 0}
+    real_build = content_cache.build_page_content
+
+    def _build(html, url, title=''):
+        state['count'] += 1
+        return real_build(html, url, title)
+
+    async def _fetch(url, deadline):
+        return state['html'], URL, None
+
+    monkeypatch.setattr(content_cache, '_content_cache', ContentCache(8))
+    monkeypatch.setattr(content_cache, 'build_page_content', _build)
+    monkeypatch.setattr(content_cache, 'fetch_atlas_page_within', _fetch)
+    monkeypatch.setattr(content_cache, 'get_snapshot', lambda: None)
+    monkeypatch.setattr(config, 'corpus', False)
+    monkeypatch.setattr(config, 'content_pack', False)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_converts_once_per_html_version(conversions):
+    """Identical HTML reuses the conversion; changed HTML is reconverted."""
+    first = await convert_page(HTML, URL)
+    assert await convert_page(HTML, URL) == first
+    assert conversions['count'] == 1
+
+    updated = await convert_page(HTML.replace('generate', 'answer'), URL)
+    assert 'answer' in updated.markdown
+    assert conversions['count'] == 2
+
+
+@pytest.mark.asyncio
+async def test_pagination_and_sections_reuse_conversion(conversions):
+    """Paging through a topic and reading its sections converts the page once."""
+    start = 0
+    chunks = []
+    while True:
+        result = await read_topic(URL, max_length=1000, start_index=start)
+        chunks.append(result)
+        if 'start_index=' not in result:
+            break
+        start = int(result.rsplit('start_index=', 1)[1].split()[0])
+    assert len(chunks) > 3
+
+    sections = await read_sections(URL, ['Architecture'])
+    assert 'Index, retrieve, generate.' in sections
+    assert conversions['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_sections_shares_the_conversion(conversions):
+    """list_sections returns the outline and read_sections reuses the same conversion."""
+    outline = await list_sections(URL)
+    assert '- TL;DR — #tldr (' in outline
+    assert '- Architecture — #architecture (' in outline
+    assert 'Retrieval first.' not in outline
+
+    sections = await read_sections(URL, ['#architecture'])
+    assert 'Index, retrieve, generate.' in sections
+    assert conversions['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_topic_cursor_pages(conversions):
+    """Cursors walk the whole topic at a token budget, cutting at sentence boundaries."""
+    result = await read_topic(URL, max_tokens=300)
+    pages = [result]
+    while 'cursor="' in result:
+        cursor = result.split('cursor="', 1)[1].split('"', 1)[0]
+        result = await read_topic(URL, cursor=cursor)
+        pages.append(result)
+    assert len(pages) > 2
+    assert all(len(page.split('\n\n---\n')[0]) < 300 * 4 + 100 for page in pages)
+    assert pages[-1].rstrip().endswith('Index, retrieve, generate.')
+    # The long TL;DR paragraph is split between sentences, never inside one
+    for page in pages[1:]:
+        assert page.startswith(f'Atlas topic from {URL}:\n\nRetrieval first.')
+    assert conversions['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_topic_rejects_stale_cursor(conversions):
+    """A cursor for an older version of the page is refused, not misapplied."""
+    first = await read_topic(URL, max_length=1000)
+    cursor = first.split('cursor="', 1)[1].split('"', 1)[0]
+    conversions['html'] = HTML.replace('Retrieval first.', 'Retrieval comes first.')
+    content_cache.get_content_cache().clear()
+
+    assert 'has changed since this cursor was issued' in await read_topic(URL, cursor=cursor)
+    assert 'Invalid cursor' in await read_topic(URL, cursor='garbage')
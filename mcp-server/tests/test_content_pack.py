@@ -0,0 +1,286 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the build-time content pack."""
+
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.utils import content_cache, content_pack, diagram_catalog
+from genai_atlas_mcp_server.utils.content_pack import ContentPack
+from genai_atlas_mcp_server.utils.diagram_catalog import DiagramCatalog
+from genai_atlas_mcp_server.utils.html_converter import extract_diagrams, normalize_heading
+from genai_atlas_mcp_server.utils.page_content import read_page_sections
+
+PACK_HOOK = Path(__file__).resolve().parents[2] / 'hooks' / 'content_pack_hook.py'
+BASE = 'https://awslabs.github.io/generative-ai-atlas'
+
+HTML = (
+    '<h1>RAG</h1><h2 id="architecture-overview">Architecture</h2>'
+    '<figure><img src="../assets/rag.png" alt="Retrieval pipeline"/>'
+    '<figcaption>Index, retrieve, generate</figcaption></figure>'
+    '<p><img src="logo.png" alt="Atlas logo"/></p>'
+)
+
+MARKDOWN = """# Retrieval Augmented Generation
+
+## TL;DR
+
+See [the guide](https://example.com/rag){:target="_blank" rel="noopener noreferrer"}.
+
+```python
+# Not a heading
+config = {:not_an_attribute_list}
+```
+
+## Architecture
+
+### Index
+
+Index, retrieve, generate.
+
+![Retrieval pipeline](./assets/rag%20pipeline.png)
+See [agents](../agents/agents.md?#overview) and [notes](notes.txt).
+
+```text
+[kept](./relative.md)
+```
+
+## Contributors
+"""
+
+
+def _toc_entry(level, title, anchor, children=()):
+    return SimpleNamespace(level=level, title=title, id=anchor, children=list(children))
+
+
+TOC = [
+    _toc_entry(1, 'Retrieval Augmented Generation', 'retrieval-augmented-generation', [
+        _toc_entry(2, 'TL;DR', 'tldr'),
+        _toc_entry(2, 'Architecture', 'architecture-overview', [
+            _toc_entry(3, 'Index', 'index'),
+        ]),
+        _toc_entry(2, 'Contributors', 'contributors'),
+    ]),
+]
+
+
+class _Files:
+    """MkDocs build files by source path, as get_file_from_path looks them up."""
+
+    def __init__(self, urls):
+        self.urls = urls
+
+    def get_file_from_path(self, path):
+        url = self.urls.get(path)
+        return SimpleNamespace(url=url) if url is not None else None
+
+
+FILES = _Files({
+    'topics/agents/agents.md': 'topics/agents/agents.html',
+    'topics/rag/assets/rag pipeline.png': 'topics/rag/assets/rag%20pipeline.png',
+})
+
+
+@pytest.fixture
+def hook():
+    """The content pack hook module."""
+    if not PACK_HOOK.exists():
+        pytest.skip('hooks/ is not part of this checkout')
+    spec = importlib.util.spec_from_file_location('content_pack_hook', PACK_HOOK)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def site(hook, tmp_path, monkeypatch):
+    """A local site build holding the pack of one page."""
+    page = SimpleNamespace(
+        url='topics/rag/rag.html',
+        title='RAG',
+        markdown=MARKDOWN,
+        toc=TOC,
+        file=SimpleNamespace(src_uri='topics/rag/rag.md'),
+    )
+    hook.on_pre_build({})
+    hook.on_page_content(HTML, page, {'site_url': BASE}, FILES)
+    hook.on_post_build({'site_dir': str(tmp_path)})
+
+    monkeypatch.setattr(config, 'site_dir', str(tmp_path))
+    monkeypatch.setattr(config, 'content_pack_url', f'{BASE}/content-pack/index.json')
+    return tmp_path
+
+
+def test_hook_cleans_markdown_and_outlines_sections(hook):
+    """Attribute lists are removed outside code; sections carry the page's anchors."""
+    markdown = hook.clean_markdown(MARKDOWN)
+    assert '[the guide](https://example.com/rag).' in markdown
+    assert '{:not_an_attribute_list}' in markdown
+
+    sections = hook.build_sections(markdown, TOC)
+    assert [(s['title'], s['level'], s['anchor']) for s in sections] == [
+        ('TL;DR', 2, 'tldr'),
+        ('Architecture', 2, 'architecture-overview'),
+        ('Index', 3, 'index'),
+        ('Contributors', 2, 'contributors'),
+    ]
+    architecture = markdown[sections[1]['start']:sections[1]['end']]
+    assert architecture.startswith('## Architecture\n')
+    assert architecture.rstrip().endswith('[kept](./relative.md)\n```')
+
+
+def test_hook_makes_links_absolute(hook):
+    """Relative targets resolve against the source file; code and absolute URLs are kept."""
+    markdown = hook.absolute_links(
+        MARKDOWN, 'topics/rag/rag.html', 'topics/rag/rag.md', FILES, BASE
+    )
+    assert f'![Retrieval pipeline]({BASE}/topics/rag/assets/rag%20pipeline.png)' in markdown
+    assert f'[agents]({BASE}/topics/agents/agents.html#overview)' in markdown
+    assert f'[notes]({BASE}/topics/rag/notes.txt)' in markdown
+    assert '[kept](./relative.md)' in markdown
+    assert '(https://example.com/rag)' in markdown
+
+    assert hook.link_url('mailto:atlas@example.com', 'a/b.html', site_url=BASE) == (
+        'mailto:atlas@example.com'
+    )
+    html = '<img src="img/a.png" alt="A"> <a href="#top">top</a>'
+    assert hook.absolute_links(html, 'a/b.html', site_url=BASE) == (
+        f'<img src="{BASE}/a/img/a.png" alt="A"> <a href="#top">top</a>'
+    )
+    assert hook.absolute_links('[r]: ../c.md "C"\n', 'a/b/c.html') == '[r]: a/c.md "C"\n'
+
+
+@pytest.mark.parametrize(
+    'html',
+    [
+        HTML,
+        '<h2 id="a">A<a class="headerlink" href="#a">¶</a></h2><figure>'
+        '<img src="./x.png" alt="Pipe"><figcaption>Index, <b>retrieve</b>  and\n go'
+        '</figcaption></figure>',
+        '<h2 id="b">B <code>x</code></h2><div><img src="../y.png" alt="Arch"></div>'
+        '<h3>Between</h3><p>After the <em>div</em> text</p>',
+        '<p><em>Figure 2</em> <img src="z.png" alt="Flow"></p>',
+        '<p><img src="z.png" alt="Flow"> trailing</p><p>next</p>',
+        '<div class="c"><p>Before</p><img src="w.png" alt="Before img"></div>',
+        '<img src="https://cdn.example.com/a.png" alt="Remote" width="50">'
+        '<img src="https://cdn.example.com/b.png" alt="Remote b" width="500">',
+        '<h4>Deep</h4><div><div><img src="q.png" alt="Nested"></div></div>'
+        f'<center>{"Long caption " * 30}</center>',
+        '<figure><img src="a.png" alt="One"><img src="b.png" alt="Two">'
+        '<figcaption>Both</figcaption></figure><p>Sibling</p>',
+        '<div><img src="a.png" alt="Empty caption"><p> </p></div><p>Not used</p>',
+        '<h1>T</h1><img src="top.png" alt="Top level"><p>Page text</p>',
+    ],
+)
+def test_hook_diagrams_match_server(hook, html):
+    """The build-time diagrams equal what the server extracts from the same HTML."""
+    expected = extract_diagrams(html, f'{BASE}/topics/rag/rag.html')
+    diagrams = hook.extract_diagrams(html, 'topics/rag/rag.html')
+    for diagram in diagrams:
+        if not diagram['image_url'].startswith('https://'):
+            diagram['image_url'] = f'{BASE}/{diagram["image_url"]}'
+    assert diagrams == expected
+
+
+@pytest.mark.asyncio
+async def test_pack_pages_are_read_by_url(site):
+    """The index is loaded once; a page file is fetched on first read and then kept."""
+    pack = ContentPack()
+    await pack.ensure_loaded()
+    assert len(pack) == 1
+    assert f'{BASE}/topics/rag/rag.md' in pack
+
+    page = await pack.get(f'{BASE}/topics/rag/rag.md')
+    assert page.url == f'{BASE}/topics/rag/rag.html'
+    assert page.title == 'RAG'
+    assert page.sections[0].key == normalize_heading('TL;DR')
+    sections = read_page_sections(page, ['#architecture-overview'])
+    assert sections.startswith('## Architecture')
+    assert 'Index, retrieve, generate.' in sections
+    assert f'[agents]({BASE}/topics/agents/agents.html#overview)' in sections
+    assert sections.rstrip().endswith('```')
+
+    (site / 'content-pack' / 'pages' / 'topics' / 'rag' / 'rag.json').unlink()
+    assert await pack.get(f'{BASE}/topics/rag/rag.html') == page
+    pack.invalidate([f'{BASE}/topics/rag/rag.html'])
+    assert await pack.get(f'{BASE}/topics/rag/rag.html') is None
+
+
+@pytest.mark.asyncio
+async def test_page_content_served_from_pack(site, monkeypatch):
+    """Pages in the pack are neither fetched as HTML nor looked up in the corpus."""
+
+    async def _no_fetch(url, deadline):
+        raise AssertionError(f'fetched {url}')
+
+    monkeypatch.setattr(content_pack, '_content_pack', ContentPack())
+    monkeypatch.setattr(content_cache, 'get_snapshot', lambda: None)
+    monkeypatch.setattr(content_cache, 'fetch_atlas_page_within', _no_fetch)
+    monkeypatch.setattr(content_cache, 'get_corpus', lambda: pytest.fail('corpus used'))
+    monkeypatch.setattr(config, 'content_pack', True)
+    page, stale_age = await content_cache.get_page_content(
+        f'{BASE}/topics/rag/rag.html', deadline=1
+    )
+    assert page.title == 'RAG'
+    assert stale_age is None
+
+
+@pytest.mark.asyncio
+async def test_site_without_pack(tmp_path, monkeypatch):
+    """Without a pack on the site, pages fall through to the other sources."""
+    monkeypatch.setattr(config, 'site_dir', str(tmp_path))
+    monkeypatch.setattr(config, 'content_pack_url', f'{BASE}/content-pack/index.json')
+    pack = ContentPack()
+    await pack.ensure_loaded()
+    assert not pack.loaded
+    assert await pack.get(f'{BASE}/topics/rag/rag.html') is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'index',
+    [
+        '[]',
+        '"index"',
+        '{"format": 1, "pages": []}',
+        '{"format": 1, "pages": {"rag": "pages/rag.json"}}',
+        '{"format": 1, "pages": {"rag": {"url": "rag.html"}}}',
+    ],
+)
+async def test_invalid_pack_index(tmp_path, monkeypatch, index):
+    """An index that is not an object of page entries leaves the pack unloaded."""
+    (tmp_path / 'content-pack').mkdir()
+    (tmp_path / 'content-pack' / 'index.json').write_text(index)
+    monkeypatch.setattr(config, 'site_dir', str(tmp_path))
+    monkeypatch.setattr(config, 'content_pack_url', f'{BASE}/content-pack/index.json')
+    pack = ContentPack()
+    await pack.ensure_loaded()
+    assert not pack.loaded
+    assert await pack.get(f'{BASE}/rag.html') is None
+
+
+@pytest.mark.asyncio
+async def test_diagram_catalog_built_from_pack(site, monkeypatch):
+    """The diagram catalog is read from the pack's diagram file, without crawling pages."""
+
+    async def _no_fetch(url):
+        raise AssertionError(f'fetched {url}')
+
+    monkeypatch.setattr(diagram_catalog, 'get_snapshot', lambda: None)
+    monkeypatch.setattr(diagram_catalog, 'fetch_atlas_page', _no_fetch)
+    monkeypatch.setattr(config, 'content_pack', True)
+    catalog = DiagramCatalog()
+    await catalog.ensure_loaded()
+
+    (diagram,) = catalog.search('retrieval')
+    assert diagram.image_url == f'{BASE}/topics/assets/rag.png'
+    assert diagram.context == 'Index, retrieve, generate'
+    assert diagram.section == 'Architecture'
+    assert diagram.anchor == 'architecture-overview'
+    assert diagram.page_url == f'{BASE}/topics/rag/rag.html'
+    assert diagram.page_title == 'RAG'
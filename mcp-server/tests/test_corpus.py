@@ -0,0 +1,188 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the llms-full.txt corpus."""
+
+from unittest.mock import patch
+
+import pytest
+
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.utils import content_cache, corpus
+from genai_atlas_mcp_server.utils.corpus import Corpus, CorpusSplitter, align_pages
+from genai_atlas_mcp_server.utils.search_index import AtlasSearchIndex
+from genai_atlas_mcp_server.utils.topic_index import TopicIndex
+
+SITE = 'https://awslabs.github.io/generative-ai-atlas/topics'
+RAG_DIR = f'{SITE}/2_3_3_RAG(retrieval Augmented Generation)'
+
+LLMS_TXT = f"""# Generative AI Atlas
+
+## Topic Documentation
+
+- [Terminology]({SITE}/1_1_core/core_concepts.md)
+- [Index]({RAG_DIR}/index.md)
+- [Ingest Pipelines]({RAG_DIR}/2_3_3-1-ingestion_pipelines/2_3_3-1-ingestion_pipelines.md): Chunking (and embedding)
+- [Agents]({SITE}/2_1_10_agents/2_1_10_agents.md)
+"""
+
+LLMS_FULL_TXT = """# Generative AI Atlas
+
+> Foundational knowledge and practical guidance.
+
+# Topic Documentation
+
+# Core Concepts and Terminology
+
+## TL;DR
+
+Generative AI in brief.
+
+```python
+# Not a heading
+print('hello')
+```
+
+## Contributors
+
+# Retrieval Augmented Generation
+
+An overview of the RAG patterns.
+
+# Ingestion, chunking and embedding
+
+## Chunking
+
+Split documents into chunks.
+
+# Contributors
+
+Stray heading, still part of the ingestion page.
+
+# Agents: Autonomous Problem-Solving Systems
+
+## TL;DR
+
+Agents plan and act.
+"""
+
+
+def test_splitter_skips_code_blocks_across_chunks():
+    """Headings are found at their offsets however the text is chunked."""
+    splitter = CorpusSplitter()
+    for i in range(0, len(LLMS_FULL_TXT), 7):
+        splitter.feed(LLMS_FULL_TXT[i:i + 7])
+    text = splitter.close()
+    assert text == LLMS_FULL_TXT
+    titles = [title for _, title in splitter.headings]
+    assert 'Not a heading' not in titles
+    assert len(titles) == 7
+    for offset, title in splitter.headings:
+        assert text[offset:].startswith(f'# {title}')
+
+
+def test_align_pages_absorbs_stray_and_missing_headings():
+    """Pages get the most similar heading in order; extra headings stay unmatched."""
+    headings = ['Generative AI Atlas', 'Topic Documentation', 'Core Concepts and Terminology',
+                'Vector Databases', 'Contributors', 'Agents: Autonomous Problem-Solving Systems']
+    labels = ['Terminology core concepts', 'Vector Databases vector databases', 'Agents agents']
+    assert align_pages(labels, headings) == [2, 3, 5]
+
+    # A page without a heading of its own gets none
+    labels.insert(2, 'Missing page')
+    del headings[4]
+    assert align_pages(labels, headings) == [2, 3, None, 4]
+
+
+def test_align_pages_keeps_similar_neighbours_apart():
+    """A page without a heading does not take the heading of its similarly titled neighbour."""
+    titles = ['Agents', 'Multi-Agent Systems']
+    labels = ['Agents agents', 'Multi-Agent Systems multi agent systems']
+    headings = ['Agents: Autonomous Problem-Solving Systems', 'Multi-Agent Systems']
+    assert align_pages(labels, headings, titles) == [0, 1]
+    assert align_pages(labels, headings[:1], titles) == [0, None]
+    assert align_pages(labels, headings[1:], titles) == [None, 0]
+    # Acronyms are matched to the heading that spells them out
+    assert align_pages(
+        ['RAG rag', 'Fine-tuning fine tuning'],
+        ['Retrieval Augmented Generation (RAG)', 'Fine-Tuning and Model Adaptation'],
+        ['RAG', 'Fine-tuning'],
+    ) == [0, 1]
+
+
+@pytest.fixture
+async def loaded_corpus(monkeypatch):
+    """A corpus loaded from ``LLMS_FULL_TXT``, aligned with ``LLMS_TXT``."""
+    topics = TopicIndex()
+
+    async def _fetch_url(url, missing_ok=False):
+        return LLMS_TXT if url.endswith('llms.txt') else None
+
+    async def _fetch_stream(url, on_chunk, missing_ok=False):
+        for i in range(0, len(LLMS_FULL_TXT), 64):
+            on_chunk(LLMS_FULL_TXT[i:i + 64])
+        return True
+
+    monkeypatch.setattr(corpus, 'get_topic_index', lambda: topics)
+    monkeypatch.setattr(corpus, 'fetch_stream', _fetch_stream)
+    loaded = Corpus()
+    with patch('genai_atlas_mcp_server.utils.topic_index.fetch_url', _fetch_url):
+        await loaded.ensure_loaded()
+    monkeypatch.setattr(corpus, '_corpus', loaded)
+    return loaded
+
+
+@pytest.mark.asyncio
+async def test_corpus_pages_and_sections(loaded_corpus):
+    """Each llms.txt link maps to its slice of the corpus, with a section outline."""
+    assert len(loaded_corpus) == 4
+    page = loaded_corpus.get(f'{SITE}/1_1_core/core_concepts.html')
+    assert page.title == 'Core Concepts and Terminology'
+    assert page.markdown.startswith('# Core Concepts and Terminology\n')
+    assert '# Not a heading' in page.markdown
+    assert [s.title for s in page.sections] == ['TL;DR', 'Contributors']
+
+    # Paths with parentheses survive llms.txt parsing
+    ingest = loaded_corpus.get(
+        f'{RAG_DIR}/2_3_3-1-ingestion_pipelines/2_3_3-1-ingestion_pipelines.md'
+    )
+    assert ingest.title == 'Ingestion, chunking and embedding'
+    assert 'Stray heading' in ingest.markdown
+    assert loaded_corpus.get(f'{RAG_DIR}/').title == 'Retrieval Augmented Generation'
+
+    loaded_corpus.invalidate([f'{SITE}/2_1_10_agents/2_1_10_agents.html'])
+    assert loaded_corpus.get(f'{SITE}/2_1_10_agents/2_1_10_agents.md') is None
+
+
+@pytest.mark.asyncio
+async def test_page_content_served_from_corpus(loaded_corpus, monkeypatch):
+    """Pages in the corpus are not fetched from the site."""
+
+    async def _no_fetch(url, deadline):
+        raise AssertionError(f'fetched {url}')
+
+    monkeypatch.setattr(content_cache, 'get_snapshot', lambda: None)
+    monkeypatch.setattr(content_cache, 'fetch_atlas_page_within', _no_fetch)
+    monkeypatch.setattr(config, 'corpus', True)
+    monkeypatch.setattr(config, 'content_pack', False)
+    page, stale_age = await content_cache.get_page_content(
+        f'{SITE}/2_1_10_agents/2_1_10_agents.html', deadline=1
+    )
+    assert page.title == 'Agents: Autonomous Problem-Solving Systems'
+    assert stale_age is None
+
+
+@pytest.mark.asyncio
+async def test_search_index_falls_back_to_corpus(loaded_corpus, monkeypatch):
+    """Without search_index.json, pages and sections are indexed from the corpus."""
+
+    async def _missing(url, on_chunk, missing_ok=False):
+        return False
+
+    monkeypatch.setattr(config, 'corpus', True)
+    index = AtlasSearchIndex()
+    with patch('genai_atlas_mcp_server.utils.search_index.fetch_stream', _missing):
+        await index.ensure_loaded()
+    assert len(index.get_all_docs()) == 4
+    assert index.search('chunks')[0].title == 'Ingestion, chunking and embedding'
+    assert index.sections.get(f'{SITE}/2_1_10_agents/2_1_10_agents.html', 'TL;DR')
@@ -0,0 +1,166 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the diagram catalog and catalog-backed list_diagrams."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from genai_atlas_mcp_server.tools import list_diagrams as list_diagrams_module
+from genai_atlas_mcp_server.tools.list_diagrams import list_diagrams
+from genai_atlas_mcp_server.utils import diagram_catalog
+from genai_atlas_mcp_server.utils.diagram_catalog import DiagramCatalog
+from genai_atlas_mcp_server.utils.search_index import AtlasSearchIndex, SearchDoc
+
+RAG = 'topics/3_0_architecture/rag/rag.html'
+AGENTS = 'topics/2_0_technical/agents/agents.html'
+
+PAGES = {
+    RAG: (
+        '<article><h1>RAG</h1><h2 id="architecture">Architecture</h2>'
+        '<p><img src="./assets/rag.png" alt="Retrieval pipeline"/></p>'
+        '<h2 id="ingestion">Ingestion</h2>'
+        '<figure><img src="./assets/chunks.png" alt="Figure 2"/>'
+        '<figcaption>Document chunking flow</figcaption></figure></article>'
+    ),
+    AGENTS: (
+        '<article><h1>Agents</h1><h2 id="orchestration">Orchestration</h2>'
+        '<p><img src="./assets/supervisor.png" alt="Supervisor agent"/></p></article>'
+    ),
+}
+
+
+# Probed metadata of the diagram images; the supervisor image is an icon
+IMAGES = {
+    'rag.png': {'format': 'png', 'width': 1200, 'height': 800, 'bytes': 91_000},
+    'chunks.png': {'format': 'svg', 'width': 640, 'height': 480, 'bytes': 12_000},
+    'supervisor.png': {'format': 'png', 'width': 48, 'height': 48, 'bytes': 900},
+}
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """A search index of two pages and a fake site serving ``PAGES``; counts fetches."""
+    index = AtlasSearchIndex()
+    index._docs = [
+        SearchDoc(location=RAG, title='RAG', text='retrieval augmented generation rag'),
+        SearchDoc(location=AGENTS, title='Agents', text='agents tools planning'),
+    ]
+    for doc in index._docs:
+        index._count_doc(doc, +1)
+    index._loaded = True
+    fetches = []
+
+    async def _fetch(url):
+        fetches.append(url)
+        location = url.split('/generative-ai-atlas/', 1)[1]
+        return PAGES[location], url
+
+    async def _probe(url):
+        fetches.append(url)
+        return IMAGES[url.rsplit('/', 1)[1]]
+
+    catalog = DiagramCatalog()
+    monkeypatch.setattr(diagram_catalog, 'probe_image', _probe)
+    monkeypatch.setattr(diagram_catalog, 'get_search_index', lambda: index)
+    monkeypatch.setattr(diagram_catalog, 'fetch_atlas_page', _fetch)
+    monkeypatch.setattr(diagram_catalog, 'get_snapshot', lambda: None)
+    monkeypatch.setattr(diagram_catalog, 'fetch_pack_diagrams', AsyncMock(return_value=None))
+    monkeypatch.setattr(diagram_catalog, '_catalog', catalog)
+    monkeypatch.setattr(list_diagrams_module, 'get_search_index', lambda: index)
+    return catalog, fetches
+
+
+@pytest.mark.asyncio
+async def test_catalog_indexes_every_page(site):
+    """The build fetches each page once and records diagrams with their sections."""
+    catalog, fetches = site
+    await catalog.ensure_loaded()
+    assert len(fetches) == 2
+    assert len(catalog) == 3
+
+    (chunking,) = catalog.search('chunking')
+    assert chunking.title == 'Figure 2'
+    assert chunking.section == 'Ingestion'
+    assert chunking.page_title == 'RAG'
+    assert [e.title for e in catalog.search('supervisor orchestration')] == ['Supervisor agent']
+
+
+@pytest.mark.asyncio
+async def test_replace_and_remove_pages(site):
+    """Updating a page swaps its diagrams in the keyword index."""
+    catalog, _ = site
+    await catalog.ensure_loaded()
+    agents_url = catalog.search('supervisor')[0].page_url
+
+    catalog.replace_page(agents_url, 'Agents', [
+        {'title': 'Swarm topology', 'image_url': 'https://x/swarm.png', 'context': ''},
+    ])
+    assert catalog.search('supervisor') == []
+    assert catalog.search('swarm')[0].page_url == agents_url
+
+    catalog.remove_page(agents_url)
+    assert catalog.search('swarm') == []
+    assert len(catalog) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_diagrams_answers_from_the_catalog(site):
+    """After the build, list_diagrams makes no page fetches."""
+    catalog, fetches = site
+    results = await list_diagrams(topic='retrieval')
+    assert results[0]['title'] == 'Retrieval pipeline'
+    assert results[0]['section'] == 'Architecture'
+    # Diagrams on the best-matching page rank even without a keyword hit
+    assert 'Figure 2' in [r['title'] for r in results]
+    fetches.clear()
+
+    with patch.object(
+        list_diagrams_module, 'fetch_urls_concurrent', new_callable=AsyncMock
+    ) as live_fetch:
+        browsed = await list_diagrams()
+        await list_diagrams(topic='agents')
+    live_fetch.assert_not_called()
+    # Only the supervisor image had not been probed yet
+    assert [url.rsplit('/', 1)[1] for url in fetches] == ['supervisor.png']
+    assert {r['page_title'] for r in browsed} == {'RAG'}
+
+
+@pytest.mark.asyncio
+async def test_list_diagrams_reports_probed_image_metadata(site):
+    """Diagrams carry probed image metadata; images narrower than a diagram are dropped."""
+    catalog, fetches = site
+    results = await list_diagrams(topic='retrieval')
+    assert results[0]['format'] == 'png'
+    assert (results[0]['width'], results[0]['height'], results[0]['bytes']) == (1200, 800, 91_000)
+
+    assert await list_diagrams(topic='supervisor') == []
+    fetches.clear()
+    await list_diagrams(topic='retrieval supervisor')
+    assert fetches == []
+
+    # A changed page's images are probed again
+    rag_url = results[0]['page_url']
+    catalog.replace_page(rag_url, 'RAG', [
+        {'title': 'Retrieval pipeline', 'image_url': results[0]['image_url'], 'context': ''},
+    ])
+    assert catalog.search('retrieval')[0].width is None
+    await list_diagrams(topic='retrieval')
+    assert [url.rsplit('/', 1)[1] for url in fetches] == ['rag.png']
+
+
+@pytest.mark.asyncio
+async def test_list_diagrams_scans_pages_while_catalog_builds(site, monkeypatch):
+    """If the catalog is not ready by the deadline, a few pages are scanned live."""
+    catalog, _ = site
+    monkeypatch.setattr(catalog, 'wait_loaded', AsyncMock(return_value=False))
+    with patch.object(
+        list_diagrams_module,
+        'fetch_urls_concurrent',
+        new_callable=AsyncMock,
+        return_value=[PAGES[RAG]],
+    ) as live_fetch:
+        results = await list_diagrams()
+    live_fetch.assert_called_once()
+    assert [r['title'] for r in results] == ['Retrieval pipeline', 'Figure 2']
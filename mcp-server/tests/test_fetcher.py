@@ -0,0 +1,312 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the HTTP fetcher and incremental JSON parsing."""
+
+import asyncio
+import json
+import threading
+import weakref
+
+import httpx
+import pytest
+
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.utils import fetcher, page_cache, pool_stats, url_resolver
+from genai_atlas_mcp_server.utils.json_stream import JsonArrayStream
+from genai_atlas_mcp_server.utils.pool_stats import PoolStats
+from genai_atlas_mcp_server.utils.url_resolver import UrlResolver
+from genai_atlas_mcp_server.utils.url_utils import atlas_url_to_local_path, validate_atlas_url
+
+
+@pytest.fixture
+def mock_site(monkeypatch):
+    """Route the shared client through an in-memory transport."""
+    pages = {}
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        body = pages.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=body)
+
+    def _create_client():
+        return httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+
+    monkeypatch.setattr(fetcher, '_create_client', _create_client)
+    monkeypatch.setattr(fetcher, '_clients', weakref.WeakKeyDictionary())
+    return pages
+
+
+@pytest.mark.asyncio
+async def test_fetch_url_decodes_multibyte(mock_site):
+    """UTF-8 text is decoded correctly across chunk boundaries."""
+    mock_site['https://example.com/a'] = 'Atlas — généré ✓'.encode('utf-8')
+    assert await fetcher.fetch_url('https://example.com/a') == 'Atlas — généré ✓'
+
+
+@pytest.mark.asyncio
+async def test_fetch_url_not_found(mock_site):
+    """HTTP errors return None."""
+    assert await fetcher.fetch_url('https://example.com/missing') is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_url_rejects_oversized_body(mock_site, monkeypatch):
+    """Bodies larger than max_response_bytes are refused."""
+    monkeypatch.setattr(config, 'max_response_bytes', 10)
+    mock_site['https://example.com/big'] = b'x' * 100
+    assert await fetcher.fetch_url('https://example.com/big') is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_json(mock_site):
+    """fetch_json parses a JSON body."""
+    mock_site['https://example.com/data.json'] = b'{"docs": [1, 2]}'
+    assert await fetcher.fetch_json('https://example.com/data.json') == {'docs': [1, 2]}
+
+
+@pytest.fixture
+def local_site(tmp_path, monkeypatch):
+    """Configure a local site build directory."""
+    page_dir = tmp_path / 'topics' / 'rag'
+    page_dir.mkdir(parents=True)
+    (page_dir / 'rag.html').write_text('<article><h1>RAG</h1></article>', encoding='utf-8')
+    (tmp_path / 'index.html').write_text('<h1>Home</h1>', encoding='utf-8')
+    (tmp_path.parent / 'secret.txt').write_text('secret', encoding='utf-8')
+    monkeypatch.setattr(config, 'site_dir', str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_fetch_url_local_site(local_site):
+    """Public Atlas URLs are served from the local site build."""
+    url = 'https://awslabs.github.io/generative-ai-atlas/topics/rag/rag.html'
+    assert await fetcher.fetch_url(url) == '<article><h1>RAG</h1></article>'
+    assert await fetcher.fetch_url(f'{local_site.as_uri()}/') == '<h1>Home</h1>'
+    assert await fetcher.fetch_url(url.replace('rag.html', 'missing.html')) is None
+
+
+def test_local_path_mapping_stays_inside_site(local_site):
+    """URLs cannot escape the site directory."""
+    assert atlas_url_to_local_path(f'{local_site.as_uri()}/../secret.txt') is None
+    assert atlas_url_to_local_path(
+        'https://awslabs.github.io/generative-ai-atlas/../secret.txt'
+    ) is None
+    assert atlas_url_to_local_path('https://example.com/topics/rag/rag.html') is None
+    assert validate_atlas_url(f'{local_site.as_uri()}/topics/rag/rag.html') is None
+    assert validate_atlas_url('file:///etc/passwd') is not None
+
+    (local_site / 'escape.txt').symlink_to(local_site.parent / 'secret.txt')
+    assert validate_atlas_url(f'{local_site.as_uri()}/escape.txt') is None
+    assert atlas_url_to_local_path(f'{local_site.as_uri()}/escape.txt') is None
+
+
+@pytest.mark.asyncio
+async def test_local_paths_resolved_off_the_loop(local_site, monkeypatch):
+    """Path resolution happens in the worker thread that reads the file."""
+    threads = []
+
+    def _resolve(url):
+        threads.append(threading.current_thread())
+        return atlas_url_to_local_path(url)
+
+    monkeypatch.setattr(fetcher, 'atlas_url_to_local_path', _resolve)
+    url = 'https://awslabs.github.io/generative-ai-atlas/topics/rag/rag.html'
+    assert await fetcher.fetch_url(url) == '<article><h1>RAG</h1></article>'
+    assert (await fetcher.fetch_head(url, 9))[0] == b'<article>'
+    assert await fetcher.fetch_url(f'{local_site.as_uri()}/missing.html') is None
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+
+
+def test_json_array_stream_char_by_char():
+    """Elements are emitted as soon as they complete, regardless of chunking."""
+    data = {
+        'config': {'lang': ['en'], 'separator': '[\\s\\-]+'},
+        'docs': [{'location': 'a.html', 'title': 'A'}, {'text': 'brace } in "string" ]'}, 3],
+    }
+    parser = JsonArrayStream('docs')
+    items = []
+    for char in json.dumps(data, indent=2):
+        items.extend(parser.feed(char))
+    parser.close()
+    assert items == data['docs']
+
+
+def test_json_array_stream_decodes_large_element_once():
+    """A large element split over many chunks is not re-decoded on every chunk."""
+    text = json.dumps({'docs': [{'text': 'word \\"quoted\\" ' * 2000}, {'text': 'b'}]})
+    parser = JsonArrayStream('docs')
+    calls = []
+    raw_decode = parser._decoder.raw_decode
+
+    def _counting(buf, pos):
+        calls.append(pos)
+        return raw_decode(buf, pos)
+
+    parser._decoder.raw_decode = _counting
+    items = []
+    for i in range(0, len(text), 64):
+        items.extend(parser.feed(text[i:i + 64]))
+    parser.close()
+    assert [len(item['text']) for item in items] == [len('word \\"quoted\\" ') * 2000, 1]
+    # The "docs" key, a first try and the final decode of the large element, the small one
+    assert len(calls) == 4
+
+
+def test_json_array_stream_missing_key():
+    """A document without the target array is rejected."""
+    parser = JsonArrayStream('docs')
+    with pytest.raises(ValueError):
+        parser.feed('{"config": {}}')
+
+
+def test_json_array_stream_truncated():
+    """close() fails when the array was not terminated."""
+    parser = JsonArrayStream('docs')
+    assert parser.feed('{"docs": [{"a": 1}, {"b"') == [{'a': 1}]
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+PAGE = 'https://awslabs.github.io/generative-ai-atlas/topics/rag.html'
+
+
+@pytest.fixture
+def slow_origin(monkeypatch):
+    """Origin whose responses wait for ``release``; records started and cancelled fetches."""
+    state = {'release': asyncio.Event(), 'html': '<h1>new</h1>', 'started': 0, 'cancelled': 0}
+
+    async def _fetch_url(url, missing_ok=False):
+        state['started'] += 1
+        try:
+            await state['release'].wait()
+        except asyncio.CancelledError:
+            state['cancelled'] += 1
+            raise
+        return state['html']
+
+    resolver = UrlResolver()
+    resolver.register(PAGE)
+    monkeypatch.setattr(fetcher, 'fetch_url', _fetch_url)
+    monkeypatch.setattr(url_resolver, '_resolver', resolver)
+    monkeypatch.setattr(page_cache, '_page_cache', page_cache.PageCache(8, ttl=60))
+    return state
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_served_past_deadline_then_refreshed(slow_origin):
+    """A slow origin gets the stale copy; the refresh lands in the cache later."""
+    cache = page_cache.get_page_cache()
+    cache.put(PAGE, '<h1>old</h1>', PAGE)
+    cache.get_entry(PAGE).fetched_at -= 120
+
+    html, _, stale_age = await fetcher.fetch_atlas_page_within(PAGE, deadline=0.01)
+    assert html == '<h1>old</h1>'
+    assert stale_age >= 120
+    assert 'cached copy' in fetcher.staleness_note(stale_age)
+
+    slow_origin['release'].set()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert cache.get(PAGE) == ('<h1>new</h1>', PAGE)
+    assert await fetcher.fetch_atlas_page_within(PAGE, deadline=0.01) == (
+        '<h1>new</h1>',
+        PAGE,
+        None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_deadline_without_cached_copy_raises(slow_origin):
+    """With nothing cached the deadline surfaces as a timeout; the fetch continues."""
+    with pytest.raises(asyncio.TimeoutError):
+        await fetcher.fetch_atlas_page_within(PAGE, deadline=0.01)
+    assert slow_origin['cancelled'] == 0
+
+    slow_origin['release'].set()
+    assert await fetcher.fetch_atlas_page(PAGE) == ('<h1>new</h1>', PAGE)
+    assert slow_origin['started'] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_cancels_fetch(slow_origin):
+    """Cancelling the only caller cancels the origin request."""
+    task = asyncio.ensure_future(fetcher.fetch_atlas_page(PAGE))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+    assert slow_origin['cancelled'] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_urls_concurrent_deadline(slow_origin):
+    """Fetches still running at the deadline are cancelled and count as failed."""
+    assert await fetcher.fetch_urls_concurrent(['a', 'b'], deadline=0.01) == [None, None]
+    await asyncio.sleep(0)
+    assert slow_origin['cancelled'] == 2
+
+
+def test_client_per_event_loop(monkeypatch):
+    """Each loop gets its own pooled client; clients of closed loops are dropped."""
+    monkeypatch.setattr(fetcher, '_clients', weakref.WeakKeyDictionary())
+
+    async def _two_lookups():
+        return await fetcher._get_client(), await fetcher._get_client()
+
+    first_a, first_b = asyncio.run(_two_lookups())
+    assert first_a is first_b
+    second, _ = asyncio.run(_two_lookups())
+    assert second is not first_a
+    assert first_a not in fetcher._clients.values()
+
+
+def test_close_client_closes_clients_of_other_loops(monkeypatch):
+    """Clients of other running loops are closed on their own loop."""
+    monkeypatch.setattr(fetcher, '_clients', weakref.WeakKeyDictionary())
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever)
+    thread.start()
+    try:
+        client = asyncio.run_coroutine_threadsafe(fetcher._get_client(), other).result(5)
+
+        async def _shutdown():
+            own = await fetcher._get_client()
+            await fetcher.close_client()
+            return own
+
+        own = asyncio.run(_shutdown())
+        assert own.is_closed and client.is_closed
+        assert len(fetcher._clients) == 0
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
+
+
+def test_pool_stats_skip_unknown_pool_layout(monkeypatch):
+    """Open and idle counts are only read from pools of a known httpcore version."""
+    client = httpx.AsyncClient()
+    assert PoolStats().snapshot([client])['open_connections'] == 0
+    monkeypatch.setattr(pool_stats.httpcore, '__version__', '2.0.0')
+    assert 'open_connections' not in PoolStats().snapshot([client])
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_opened_and_reused():
+    """Requests without a TCP connect event count as connection reuse."""
+    stats = PoolStats()
+    first = stats.tracer()
+    await first('connection.connect_tcp.complete', {})
+    await first('http11.send_request_headers.started', {})
+    second = stats.tracer()
+    await second('http2.send_request_headers.started', {})
+
+    counts = stats.snapshot([])
+    assert counts['requests'] == 2
+    assert counts['http2_requests'] == 1
+    assert counts['connections_opened'] == 1
+    assert counts['connections_reused'] == 1
@@ -3,13 +3,19 @@
 
 """Tests for the HTML converter module."""
 
+import markdownify
 import pytest
 
+from genai_atlas_mcp_server.config import config
 from genai_atlas_mcp_server.utils.html_converter import (
+    PARSER_BACKENDS,
     extract_diagrams,
     extract_sections,
     html_to_markdown,
+    html_to_text,
+    parser_backend,
 )
+from genai_atlas_mcp_server.utils.page_content import build_page_content
 
 
 def test_html_to_markdown_basic():
@@ -85,6 +91,17 @@ def test_extract_diagrams():
     assert len(diagrams) == 1
     assert diagrams[0]['title'] == 'System Architecture'
     assert 'architecture.png' in diagrams[0]['image_url']
+    assert diagrams[0]['section'] == ''
+
+
+def test_extract_diagrams_records_section():
+    """Each diagram records the heading of the section it appears in."""
+    html = (
+        '<article><h1>RAG</h1><h2 id="architecture">Architecture<a class="headerlink">¶</a></h2>'
+        '<p><img src="./assets/rag.png" alt="RAG pipeline"/></p></article>'
+    )
+    (diagram,) = extract_diagrams(html, 'https://example.com/topics/rag.html')
+    assert (diagram['section'], diagram['anchor']) == ('Architecture', 'architecture')
 
 
 def test_extract_diagrams_skips_small_images():
@@ -98,3 +115,172 @@ def test_extract_diagrams_empty():
     """Test empty input."""
     assert extract_diagrams('', 'https://example.com') == []
     assert extract_diagrams(None, 'https://example.com') == []
+
+
+MATERIAL_PAGE = '''
+<html><head><title>RAG</title><script>var x = 1;</script></head><body>
+<header class="md-header"><h2>Add Atlas to your IDE</h2></header>
+<nav class="md-nav"><ul><li><a href="../a.html">A page</a></li></ul></nav>
+<div class="md-content"><article class="md-content__inner md-typeset">
+<h1 id="rag">Retrieval Augmented Generation<a class="headerlink" href="#rag">¶</a></h1>
+<p><strong>Content Level: 200</strong></p>
+<h2 id="tldr">TL;DR<a class="headerlink" href="#tldr">¶</a></h2>
+<p>Ground answers in <em>retrieved</em> context, see <a href="https://example.com">docs</a>.</p>
+<div class="admonition note"><p class="admonition-title">Note</p><p>snake_case *stars*</p></div>
+<h3 id="pipeline">Pipeline</h3>
+<ol><li>Chunk</li><li>Embed<ul><li>dense</li></ul></li></ol>
+<pre><code class="language-python">def retrieve(q):
+    return index.search(q)
+</code></pre>
+<table><thead><tr><th>Stage</th><th>Cost</th></tr></thead>
+<tbody><tr><td>Embed</td><td>Low</td></tr></tbody></table>
+<figure><img src="./assets/rag.png" alt="RAG architecture" width="800"/>
+<figcaption>Figure 1: RAG flow</figcaption></figure>
+<h2 id="further">Further Reading</h2><p>Line one<br/>line two</p>
+</article></div>
+<footer class="md-footer"><h4>Cookie consent</h4></footer>
+</body></html>
+'''
+
+
+def _two_pass_markdown(html):
+    """Reference: the previous full-parse, serialize and re-parse conversion.
+
+    Kept verbatim, selectors and decompose loop included, so that changes to
+    the single-pass chrome filtering show up as differences.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    main_content = None
+    for selector in (
+        'article',
+        "div[role='main']",
+        '.md-content__inner',
+        '.md-content',
+        'main',
+        '#content',
+    ):
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    if not main_content:
+        main_content = soup.body if soup.body else soup
+
+    for selector in (
+        'nav',
+        'header',
+        'footer',
+        '.md-header',
+        '.md-footer',
+        '.md-sidebar',
+        '.md-tabs',
+        '.md-search',
+        '.md-top',
+        '.headerlink',
+        'script',
+        'style',
+        'noscript',
+    ):
+        for element in main_content.select(selector):
+            element.decompose()
+
+    content = markdownify.markdownify(
+        str(main_content),
+        heading_style=markdownify.ATX,
+        autolinks=True,
+        escape_asterisks=True,
+        escape_underscores=True,
+        newline_style='SPACES',
+    )
+    return content.strip() if content else ''
+
+
+@pytest.mark.parametrize(
+    'html',
+    [
+        MATERIAL_PAGE,
+        '<html><body><h2>No article</h2><p>Body <b>bold</b></p><nav>x</nav></body></html>',
+        '<p>Fragment with <code>code</code> and a_b</p>',
+        '<div role="main"><h2>Main<a class="headerlink" href="#m">¶</a></h2>'
+        '<div class="md-sidebar"><p>Side</p></div><p>Kept <span class="md-top">top</span></p>'
+        '<div class="md-tabs"><nav><p>Tabs</p></nav></div><style>p {}</style></div>',
+        '<main><div class="md-search"><p>Search</p></div><noscript>JS</noscript>'
+        '<section><header><h2>Head</h2></header><p>Body</p><footer>Foot</footer></section>'
+        '</main>',
+    ],
+)
+def test_single_pass_matches_two_pass_conversion(html):
+    """The single-pass converter produces exactly the previous output."""
+    assert html_to_markdown(html) == _two_pass_markdown(html)
+
+
+def test_build_page_content_shares_one_parse():
+    """Markdown and diagrams from one parse match the standalone functions."""
+    url = 'https://example.com/topics/rag/rag.html'
+    page = build_page_content(MATERIAL_PAGE, url)
+    assert page.markdown == html_to_markdown(MATERIAL_PAGE)
+    assert page.diagrams == extract_diagrams(MATERIAL_PAGE, url)
+    assert page.diagrams[0]['image_url'] == 'https://example.com/topics/rag/assets/rag.png'
+
+
+def test_extract_sections_ignores_page_chrome():
+    """Headings outside the article (dialogs, footer) are not sections."""
+    result = extract_sections(MATERIAL_PAGE, ['TL;DR'])
+    assert 'Ground answers' in result
+    assert 'Pipeline' in result
+    assert 'Further Reading' not in result
+    with pytest.raises(ValueError) as excinfo:
+        extract_sections(MATERIAL_PAGE, ['Missing'])
+    assert 'Cookie consent' not in str(excinfo.value)
+    assert '"Further Reading"' in str(excinfo.value)
+
+
+@pytest.fixture(params=PARSER_BACKENDS)
+def backend(request, monkeypatch):
+    """Run a test once per parser backend that is installed."""
+    if request.param != 'html.parser':
+        pytest.importorskip(request.param)
+    monkeypatch.setattr(config, 'html_parser', request.param)
+    return request.param
+
+
+def _all_outputs(html):
+    """Every converter output for a page, for cross-backend comparison."""
+    url = 'https://example.com/topics/rag/rag.html'
+    try:
+        sections = extract_sections(html, ['TL;DR', 'Further Reading', 'Missing & <b>'])
+    except ValueError as e:
+        sections = f'ValueError: {e}'
+    return (
+        html_to_markdown(html),
+        sections,
+        extract_diagrams(html, url),
+        html_to_text(html),
+        build_page_content(html, url).model_dump(),
+    )
+
+
+@pytest.mark.parametrize(
+    'html',
+    [
+        MATERIAL_PAGE,
+        '<html><body><h2>TL;DR</h2><p>No article &amp; <i>loose</i> markup<p>unclosed</body>',
+        '<p>Fragment <img src="x.png" alt="Chart" width="400"> tail</p>',
+    ],
+)
+def test_backends_produce_identical_output(html, backend, monkeypatch):
+    """Every backend converts exactly like the html.parser reference."""
+    result = _all_outputs(html)
+    monkeypatch.setattr(config, 'html_parser', 'html.parser')
+    assert result == _all_outputs(html)
+
+
+def test_parser_backend_selection(monkeypatch):
+    """Unknown or missing backends fall back to html.parser."""
+    monkeypatch.setattr(config, 'html_parser', 'html.parser')
+    assert parser_backend() == 'html.parser'
+    monkeypatch.setattr(config, 'html_parser', 'no-such-parser')
+    assert parser_backend() == 'html.parser'
+    monkeypatch.setattr(config, 'html_parser', 'auto')
+    assert parser_backend() in PARSER_BACKENDS
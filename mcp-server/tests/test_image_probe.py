@@ -0,0 +1,118 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for reading image metadata from header bytes."""
+
+import struct
+import weakref
+
+import httpx
+import pytest
+
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.utils import fetcher
+from genai_atlas_mcp_server.utils.image_probe import PROBE_BYTES, parse_image_header, probe_image
+
+
+def _png(width, height):
+    """A PNG header: signature and IHDR chunk, followed by filler."""
+    ihdr = struct.pack('>II', width, height) + b'\x08\x06\x00\x00\x00'
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + ihdr + b'\0' * 64
+
+
+def _jpeg(width, height, exif_bytes=0):
+    """A JPEG header with an optional APP1 segment before the SOF0 frame."""
+    data = b'\xff\xd8' + b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\0' + b'\0' * 9
+    if exif_bytes:
+        data += b'\xff\xe1' + struct.pack('>H', exif_bytes + 2) + b'\0' * exif_bytes
+    sof = b'\x08' + struct.pack('>HH', height, width) + b'\x03' + b'\0' * 9
+    return data + b'\xff\xc0' + struct.pack('>H', len(sof) + 2) + sof + b'\xff\xd9'
+
+
+def test_parse_raster_headers():
+    """PNG, JPEG and GIF dimensions come from their headers."""
+    assert parse_image_header(_png(1200, 800)) == ('png', 1200, 800)
+    assert parse_image_header(_jpeg(1800, 627)) == ('jpeg', 1800, 627)
+    assert parse_image_header(b'GIF89a' + struct.pack('<HH', 64, 32)) == ('gif', 64, 32)
+    assert parse_image_header(b'not an image') is None
+
+
+def test_jpeg_dimensions_beyond_the_data():
+    """A JPEG whose frame header lies past the bytes read is not yet parseable."""
+    data = _jpeg(640, 480, exif_bytes=2 * PROBE_BYTES)
+    assert parse_image_header(data[:PROBE_BYTES]) is None
+    assert parse_image_header(data) == ('jpeg', 640, 480)
+
+
+def test_parse_svg_root_element():
+    """SVG sizes come from width/height, else the viewBox; relative sizes are unknown."""
+    prologue = b'<?xml version="1.0"?>\n<!-- drawn -->\n'
+    assert parse_image_header(prologue + b'<svg width="640px" height="480">') == (
+        'svg', 640, 480,
+    )
+    assert parse_image_header(b'<svg viewBox="0 0 1100.5 850" width="100%">') == (
+        'svg', 1100, 850,
+    )
+    assert parse_image_header(b'<svg width="100%" height="100%">') == ('svg', None, None)
+
+
+@pytest.fixture
+def local_images(tmp_path, monkeypatch):
+    """A local site build with a few images."""
+    assets = tmp_path / 'assets'
+    assets.mkdir()
+    # Some Atlas images named .jpg are PNGs
+    (assets / 'figure1.jpg').write_bytes(_png(1112, 768) + b'\0' * 10000)
+    (assets / 'photo.jpg').write_bytes(_jpeg(1800, 627, exif_bytes=6000))
+    (assets / 'notes.txt').write_bytes(b'plain text' * 1000)
+    monkeypatch.setattr(config, 'site_dir', str(tmp_path))
+    return f'{config.base_url}/assets'
+
+
+@pytest.mark.asyncio
+async def test_probe_local_images(local_images):
+    """Local files are probed by format, not extension, with their full size."""
+    assert await probe_image(f'{local_images}/figure1.jpg') == {
+        'format': 'png', 'width': 1112, 'height': 768, 'bytes': len(_png(0, 0)) + 10000,
+    }
+    photo = await probe_image(f'{local_images}/photo.jpg')
+    assert (photo['format'], photo['width'], photo['height']) == ('jpeg', 1800, 627)
+    assert await probe_image(f'{local_images}/notes.txt') is None
+    assert await probe_image(f'{local_images}/missing.png') is None
+
+
+@pytest.fixture
+def image_server(monkeypatch):
+    """An in-memory image server that honours Range; records the bytes it sends."""
+    images = {'https://example.com/big.png': _png(2048, 1536) + b'\0' * 500_000}
+    sent = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        body = images.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        start, end = request.headers['range'].removeprefix('bytes=').split('-')
+        part = body[int(start):int(end) + 1]
+        sent.append(len(part))
+        return httpx.Response(
+            206,
+            content=part,
+            headers={'Content-Range': f'bytes {start}-{end}/{len(body)}'},
+        )
+
+    def _create_client():
+        return httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+
+    monkeypatch.setattr(fetcher, '_create_client', _create_client)
+    monkeypatch.setattr(fetcher, '_clients', weakref.WeakKeyDictionary())
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_probe_uses_a_ranged_request(image_server):
+    """Only the header bytes are transferred; the size comes from Content-Range."""
+    info = await probe_image('https://example.com/big.png')
+    size = len(_png(0, 0)) + 500_000
+    assert info == {'format': 'png', 'width': 2048, 'height': 1536, 'bytes': size}
+    assert image_server == [PROBE_BYTES]
+    assert await probe_image('https://example.com/missing.png') is None
@@ -0,0 +1,63 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for structure-aware markdown pagination."""
+
+import pytest
+
+from genai_atlas_mcp_server.utils.paginator import (
+    block_boundaries,
+    decode_cursor,
+    encode_cursor,
+    estimate_tokens,
+    page_end,
+)
+
+MARKDOWN = (
+    '## Intro\n\nFirst paragraph. Second sentence.\n\n'
+    '```python\ncode = 1\n\nmore = 2\n```\n\n'
+    '| a | b |\n| --- | --- |\n| c | d |\n\n'
+    '## Next\n\nTail text.\n'
+)
+
+
+def test_block_boundaries_skip_code_and_tables():
+    """Headings and paragraph starts are boundaries; blank lines inside code are not."""
+    headings, paragraphs = block_boundaries(MARKDOWN)
+    assert [MARKDOWN[h:h + 7] for h in headings] == ['## Intr', '## Next']
+    starts = [MARKDOWN[p:].split('\n', 1)[0] for p in paragraphs]
+    assert starts == ['First paragraph. Second sentence.', '```python', '| a | b |', 'Tail text.']
+
+
+def test_page_end_prefers_headings_then_paragraphs():
+    """Pages end before a heading in the second half of the budget, else at a paragraph."""
+    next_heading = MARKDOWN.index('## Next')
+    assert page_end(MARKDOWN, 0, next_heading + 5) == next_heading
+    code = MARKDOWN.index('```python')
+    assert page_end(MARKDOWN, 0, code + 10) == code
+    assert page_end(MARKDOWN, 0, len(MARKDOWN) + 10) == len(MARKDOWN)
+
+
+def test_page_end_falls_back_to_sentences_and_lines():
+    """Without block boundaries, prose ends after a sentence and code after a line."""
+    prose = 'One two three. Four five six seven eight nine.'
+    assert prose[:page_end(prose, 0, 30)] == 'One two three. '
+    code = '```\n' + 'x = 1\n' * 20 + '```\n'
+    end = page_end(code, 0, 40)
+    assert code[end - 1] == '\n'
+    assert end <= 40
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque and decode to what was encoded; garbage is rejected."""
+    cursor = encode_cursor('abc123', 4200, 8000)
+    assert '4200' not in cursor
+    assert decode_cursor(cursor) == ('abc123', 4200, 8000)
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor('not-a-cursor')
+
+
+def test_estimate_tokens():
+    """Token estimates round up at four characters per token."""
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('abcde') == 2
@@ -0,0 +1,127 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the cache of finished tool responses."""
+
+from typing import Any, Dict, List, Optional, Union
+
+import pydantic_core
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from genai_atlas_mcp_server.utils import response_cache
+from genai_atlas_mcp_server.utils.response_cache import ResponseCache, cached_tool, dumps
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh response cache."""
+    fresh = ResponseCache(8)
+    monkeypatch.setattr(response_cache, '_response_cache', fresh)
+    return fresh
+
+
+def _tools(version):
+    """The same tool registered plainly and cached, and a log of its calls."""
+    calls = []
+
+    async def lookup(query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Look something up."""
+        calls.append((query, max_results))
+        return [{'title': f'{query} {i}', 'score': i / 3, 'note': 'é'} for i in range(max_results)]
+
+    plain, cached = FastMCP('plain'), FastMCP('cached')
+    plain.tool()(lookup)
+    cached.tool()(cached_tool(lookup, lambda: version[0]))
+    return plain, cached, calls
+
+
+def test_dumps_matches_fastmcp():
+    """The JSON text is the same with either encoder."""
+    value = {'title': 'Ünïcode – RAG', 'score': 0.1 + 0.2, 'items': [1, None, True]}
+    assert dumps(value) == pydantic_core.to_json(value, fallback=str, indent=2).decode()
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_is_transparent(cache):
+    """Clients see the same schemas and content as for the plain tool."""
+    plain, cached, _ = _tools([1])
+    (plain_tool,), (cached_tool_,) = await plain.list_tools(), await cached.list_tools()
+    assert cached_tool_.model_dump() == plain_tool.model_dump()
+
+    expected = await plain.call_tool('lookup', {'query': 'rag', 'max_results': 2})
+    result = await cached.call_tool('lookup', {'query': 'rag', 'max_results': 2})
+    assert (result.content, result.structuredContent) == expected
+
+
+async def _as_dict(query: str) -> Dict[str, Any]:
+    return {'query': query}
+
+
+async def _as_builtin_dict(query: str) -> dict[str, Any]:
+    return {'query': query}
+
+
+async def _as_union(query: str) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    return {'query': query}
+
+
+async def _as_optional(query: str) -> Optional[str]:
+    return None
+
+
+async def _unannotated(query: str):
+    return [query]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'tool', [_as_dict, _as_builtin_dict, _as_union, _as_optional, _unannotated]
+)
+async def test_cached_tool_structures_output_as_fastmcp(cache, tool):
+    """The structured content is wrapped, left as is or omitted as FastMCP does it."""
+    plain, cached = FastMCP('plain'), FastMCP('cached')
+    plain.tool()(tool)
+    cached.tool()(cached_tool(tool, lambda: 1))
+    expected = await plain.call_tool(tool.__name__, {'query': 'rag'})
+    if not isinstance(expected, tuple):
+        expected = (expected, None)
+    result = await cached.call_tool(tool.__name__, {'query': 'rag'})
+    assert (result.content, result.structuredContent) == expected
+
+
+@pytest.mark.asyncio
+async def test_repeated_calls_are_served_from_cache(cache):
+    """Equivalent arguments share an entry; a new index version recomputes."""
+    version = [1]
+    _, cached, calls = _tools(version)
+    first = await cached.call_tool('lookup', {'query': 'rag agents'})
+    # Default arguments and extra whitespace normalize to the same key
+    assert await cached.call_tool('lookup', {'query': ' rag  agents ', 'max_results': 5}) is first
+    assert calls == [('rag agents', 5)]
+    await cached.call_tool('lookup', {'query': 'RAG agents'})
+    assert len(calls) == 2
+    assert (cache.hits, len(cache)) == (1, 2)
+
+    version[0] = 2
+    await cached.call_tool('lookup', {'query': 'rag agents'})
+    assert len(calls) == 3
+    # Entries for the older version are dropped
+    assert len(cache) == 1
+
+    version[0] = None
+    await cached.call_tool('lookup', {'query': 'rag agents'})
+    await cached.call_tool('lookup', {'query': 'rag agents'})
+    assert len(calls) == 5
+
+
+def test_cache_is_bounded():
+    """The least recently used entry is evicted; size 0 disables the cache."""
+    cache = ResponseCache(2)
+    for query in ('a', 'b', 'c'):
+        cache.put(('tool', (('query', query),), 1), query)
+    assert len(cache) == 2
+    assert cache.get(('tool', (('query', 'a'),), 1)) is None
+    disabled = ResponseCache(0)
+    disabled.put(('tool', (), 1), 'x')
+    assert len(disabled) == 0
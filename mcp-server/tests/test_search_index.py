@@ -3,11 +3,52 @@
 
 """Tests for the search index module."""
 
+import asyncio
+import importlib.util
+import json
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.utils import workers
 from genai_atlas_mcp_server.utils.search_index import AtlasSearchIndex, _make_snippet, _tokenize
+from genai_atlas_mcp_server.utils.workers import WorkerPool
+
+# The MkDocs hook that prebuilds the search artifact, at the repository root
+ARTIFACT_HOOK = Path(__file__).resolve().parents[2] / 'hooks' / 'search_artifact_hook.py'
+SHARDS_HOOK = ARTIFACT_HOOK.with_name('search_shards_hook.py')
+
+
+def _stream_json(data, chunk_size=17, artifact=None, completed=None):
+    """Build a fetch_stream replacement that feeds ``data`` as small text chunks.
+
+    Args:
+        data: Content of search_index.json.
+        chunk_size: Characters per chunk.
+        artifact: Optional content of the prebuilt search artifact (text or
+            data); without it, the artifact is missing.
+        completed: Optional list that receives each URL whose body was fully fed.
+    """
+    bodies = {config.search_index_url: json.dumps(data)}
+    if artifact is not None:
+        bodies[config.search_artifact_url] = (
+            artifact if isinstance(artifact, str) else json.dumps(artifact)
+        )
+
+    async def _fake_fetch_stream(url, on_chunk, missing_ok=False):
+        text = bodies.get(url)
+        if text is None:
+            return False
+        for i in range(0, len(text), chunk_size):
+            on_chunk(text[i:i + chunk_size])
+            await asyncio.sleep(0)
+        if completed is not None:
+            completed.append(url)
+        return True
+
+    return _fake_fetch_stream
 
 
 def test_tokenize():
@@ -53,9 +94,9 @@ async def test_search_index_load_failure():
     """Test graceful handling of load failure."""
     index = AtlasSearchIndex()
     with patch(
-        'genai_atlas_mcp_server.utils.search_index.fetch_json',
+        'genai_atlas_mcp_server.utils.search_index.fetch_stream',
         new_callable=AsyncMock,
-        return_value=None,
+        return_value=False,
     ):
         await index.ensure_loaded()
     results = index.search('test')
@@ -81,9 +122,8 @@ async def test_search_index_load_and_search():
     }
     index = AtlasSearchIndex()
     with patch(
-        'genai_atlas_mcp_server.utils.search_index.fetch_json',
-        new_callable=AsyncMock,
-        return_value=mock_data,
+        'genai_atlas_mcp_server.utils.search_index.fetch_stream',
+        side_effect=_stream_json(mock_data),
     ):
         await index.ensure_loaded()
 
@@ -111,12 +151,206 @@ async def test_search_index_deduplication():
     }
     index = AtlasSearchIndex()
     with patch(
-        'genai_atlas_mcp_server.utils.search_index.fetch_json',
-        new_callable=AsyncMock,
-        return_value=mock_data,
+        'genai_atlas_mcp_server.utils.search_index.fetch_stream',
+        side_effect=_stream_json(mock_data),
     ):
         await index.ensure_loaded()
 
     docs = index.get_all_docs()
     assert len(docs) == 1
     assert 'Advanced patterns' in docs[0].text
+
+
+@pytest.mark.asyncio
+async def test_search_index_truncated_stream(monkeypatch):
+    """A body that ends mid-array is treated as a load failure."""
+    monkeypatch.setattr(config, 'corpus', False)
+
+    async def _truncated(url, on_chunk, missing_ok=False):
+        if url != config.search_index_url:
+            return False
+        on_chunk('{"config": {}, "docs": [{"location": "a.html", "title": "A", "text": "x"},')
+        return True
+
+    index = AtlasSearchIndex()
+    with patch('genai_atlas_mcp_server.utils.search_index.fetch_stream', side_effect=_truncated):
+        await index.ensure_loaded()
+    assert index.get_all_docs() == []
+    assert index.search('x') == []
+
+
+def _load_hook(path):
+    if not path.exists():
+        pytest.skip('hooks/ is not part of this checkout')
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    hook = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(hook)
+    return hook
+
+
+@pytest.fixture
+def artifact_hook():
+    """The MkDocs hook that prebuilds the search artifact."""
+    return _load_hook(ARTIFACT_HOOK)
+
+
+@pytest.fixture
+def shards_hook():
+    """The MkDocs hook that splits the search artifact into shards."""
+    return _load_hook(SHARDS_HOOK)
+
+
+SEARCH_DATA = {
+    'docs': [
+        {'location': '', 'title': 'Home', 'text': 'Welcome.'},
+        {'location': 'topics/rag.html', 'title': 'RAG', 'text': '<p>RAG is <b>key</b>.</p>'},
+        {'location': 'topics/rag.html#tldr', 'title': 'TL;DR', 'text': 'Retrieve first.'},
+        {'location': 'topics/rag.html#cost', 'title': 'Cost', 'text': 'Cache embeddings.'},
+        {'location': 'topics/agents.html#tools', 'title': 'Tools', 'text': 'Agents use tools.'},
+    ]
+}
+
+
+async def _load_index(fake_fetch_stream):
+    index = AtlasSearchIndex()
+    with patch('genai_atlas_mcp_server.utils.search_index.fetch_stream', fake_fetch_stream):
+        await index.ensure_loaded()
+    return index
+
+
+@pytest.mark.asyncio
+async def test_prebuilt_artifact_matches_search_index(artifact_hook):
+    """The artifact from the MkDocs hook loads into the same index as search_index.json."""
+    expected = await _load_index(_stream_json(SEARCH_DATA))
+    artifact = artifact_hook.build_artifact(SEARCH_DATA)
+    completed = []
+    index = await _load_index(_stream_json(SEARCH_DATA, artifact=artifact, completed=completed))
+    # search_index.json was dropped as soon as the artifact arrived
+    assert completed == [config.search_artifact_url]
+
+    assert [(d.location, d.title, d.text) for d in index.get_all_docs()] == [
+        (d.location, d.title, d.text) for d in expected.get_all_docs()
+    ]
+    assert index._doc_freq == expected._doc_freq
+    for query in ('rag', 'embeddings cache', 'tools'):
+        assert index.search(query) == expected.search(query)
+    for url, heading in (('topics/rag.html', 'cost'), ('topics/agents.html', 'tools')):
+        assert index.sections.get(url, heading)
+        assert [s.text for s in index.sections.get(url, heading)] == [
+            s.text for s in expected.sections.get(url, heading)
+        ]
+    assert artifact['docs'][0]['level'] is None
+
+    # An artifact built with other tokenization rules is ignored
+    artifact['tokenizer']['title_weight'] = 3
+    fallback = await _load_index(_stream_json(SEARCH_DATA, artifact=artifact))
+    assert len(fallback.get_all_docs()) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('damage', ['postings', 'sections', 'shape', 'truncated'])
+async def test_malformed_artifact_falls_back_to_search_index(artifact_hook, damage):
+    """A damaged artifact is ignored as a whole, and search_index.json is loaded instead."""
+    artifact = artifact_hook.build_artifact(SEARCH_DATA)
+    if damage == 'postings':
+        artifact['postings'][0][0] = len(artifact['docs'])
+    elif damage == 'sections':
+        artifact['sections'][0][0] = -1
+    elif damage == 'shape':
+        artifact = [artifact]
+    else:
+        artifact = json.dumps(artifact)[:-40]
+    index = await _load_index(_stream_json(SEARCH_DATA, artifact=artifact))
+    assert [d.title for d in index.get_all_docs()] == ['RAG', 'Tools']
+    assert index.search('embeddings')
+
+
+@pytest.mark.asyncio
+async def test_artifact_parsed_in_worker_process(artifact_hook, monkeypatch):
+    """Texts parsed in a worker process decode in the server, past the codec's first sample."""
+    pages = [
+        (f'topics/page{n}.html', f'Page {n}', ' '.join(f'page{n} word{i}' for i in range(800)))
+        for n in range(3)
+    ]
+    data = {
+        'docs': [
+            {'location': f'{location}{anchor}', 'title': title, 'text': text}
+            for location, title, text in pages
+            for anchor in ('', '#more')
+        ]
+    }
+    artifact = json.dumps(artifact_hook.build_artifact(data))
+    pool = WorkerPool(1, kind='process')
+    monkeypatch.setattr(workers, '_worker_pool', pool)
+    try:
+        index = AtlasSearchIndex()
+        assert await index._load_artifact(artifact)
+    finally:
+        pool.close()
+
+    assert [doc.text for doc in index.get_all_docs()] == [f'{text} {text}' for _, _, text in pages]
+    for location, _, text in pages:
+        (section,) = index.sections.get(location, 'more')
+        assert section.text == text
+
+
+@pytest.mark.asyncio
+async def test_missing_artifact_costs_no_round_trip():
+    """search_index.json streams while the artifact request is still pending."""
+    stream = _stream_json(SEARCH_DATA)
+    artifact_pending = asyncio.Event()
+
+    async def _fetch_stream(url, on_chunk, missing_ok=False):
+        if url == config.search_artifact_url:
+            await artifact_pending.wait()
+            return False
+        loaded = await stream(url, on_chunk)
+        artifact_pending.set()
+        return loaded
+
+    # Requested one after the other, the artifact would never answer
+    index = await asyncio.wait_for(_load_index(_fetch_stream), timeout=5)
+    assert len(index.get_all_docs()) == 2
+
+
+def test_shards_reassemble_to_artifact(artifact_hook, shards_hook, monkeypatch):
+    """The manifest and shards hold exactly the artifact's docs, postings and sections."""
+    monkeypatch.setattr(shards_hook, 'DOCS_SHARD_CHARS', 20)
+    artifact = artifact_hook.build_artifact(SEARCH_DATA)
+    manifest, files = shards_hook.build_shards(artifact)
+
+    postings = {}
+    for initial in manifest['terms']:
+        for token, token_postings in files[f'terms/{initial}.json'].items():
+            assert token[0] == initial
+            postings[token] = token_postings
+    assert postings == dict(zip(artifact['vocabulary'], artifact['postings']))
+
+    docs_shards = [files[f'docs/{n}.json'] for n in range(manifest['doc_shards'])]
+    assert len(docs_shards) > 1
+    for shard, next_shard in zip(docs_shards, docs_shards[1:]):
+        assert next_shard['start'] == shard['start'] + len(shard['texts'])
+    texts = [text for shard in docs_shards for text in shard['texts']]
+    sections = [section for shard in docs_shards for section in shard['sections']]
+    assert sections == artifact['sections']
+    assert [
+        {key: value for key, value in doc.items() if key != 'shard'} | {'text': text}
+        for doc, text in zip(manifest['docs'], texts, strict=True)
+    ] == artifact['docs']
+    for doc_id, doc in enumerate(manifest['docs']):
+        shard = docs_shards[doc['shard']]
+        assert shard['texts'][doc_id - shard['start']] == artifact['docs'][doc_id]['text']
+    assert manifest['stats'] == artifact['stats']
+    assert manifest['tokenizer'] == artifact['tokenizer']
+
+
+@pytest.mark.parametrize(
+    ('hooks', 'level'),
+    [(['hooks/search_artifact_hook.py'], 'ERROR'), ({'hooks/other_hook.py': None}, 'WARNING')],
+)
+def test_shards_without_artifact(shards_hook, tmp_path, caplog, hooks, level):
+    """A missing artifact is an error only when its hook is configured."""
+    shards_hook.on_post_build({'site_dir': str(tmp_path), 'hooks': hooks})
+    (record,) = caplog.records
+    assert record.levelname == level
+    assert not (tmp_path / 'search' / 'shards').exists()
@@ -0,0 +1,122 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the corpus-wide section index and the collect_sections tool."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.models import TopicEntry
+from genai_atlas_mcp_server.tools import collect_sections as collect_module
+from genai_atlas_mcp_server.tools.collect_sections import collect_sections
+from genai_atlas_mcp_server.utils.page_content import build_page_content
+from genai_atlas_mcp_server.utils.search_index import AtlasSearchIndex
+from genai_atlas_mcp_server.utils.section_index import sections_from_page
+
+RAG = 'topics/rag/rag.html'
+AGENTS = 'topics/agents/agents.html'
+EVAL = 'topics/eval/eval.html'
+
+SEARCH_INDEX = {
+    'config': {},
+    'docs': [
+        {'location': RAG, 'title': 'RAG', 'text': ''},
+        {'location': f'{RAG}#tldr', 'title': 'TL;DR', 'text': '<p>Retrieve, then <b>generate</b>.</p>'},
+        {'location': f'{RAG}#architecture', 'title': 'Architecture', 'text': '<p>Index.</p>'},
+        {'location': AGENTS, 'title': 'Agents', 'text': ''},
+        {'location': f'{AGENTS}#tldr', 'title': 'TL;DR', 'text': '<p>Agents use tools.</p>'},
+        {'location': EVAL, 'title': 'Evaluation', 'text': ''},
+        {'location': f'{EVAL}#overview', 'title': 'Overview', 'text': '<p>Measure RAG quality.</p>'},
+    ],
+}
+
+
+def _url(location):
+    return f'{config.base_url}/{location}'
+
+
+@pytest.fixture
+async def index():
+    """A search index loaded from ``SEARCH_INDEX`` and used by the tool."""
+    text = json.dumps(SEARCH_INDEX)
+
+    async def _fake_fetch_stream(url, on_chunk, missing_ok=False):
+        if url != config.search_index_url:
+            return False
+        on_chunk(text)
+        return True
+
+    loaded = AtlasSearchIndex()
+    with patch('genai_atlas_mcp_server.utils.search_index.fetch_stream', _fake_fetch_stream):
+        await loaded.ensure_loaded()
+    with patch.object(collect_module, 'get_search_index', return_value=loaded):
+        yield loaded
+
+
+@pytest.mark.asyncio
+async def test_anchor_entries_are_indexed_per_page(index):
+    """Each anchor entry becomes a section of its page, looked up by title or anchor."""
+    sections = index.sections
+    assert len(sections) == 4
+    assert [s.url for s in sections.get(_url(RAG), 'tl:dr')] == [_url(f'{RAG}#tldr')]
+    assert sections.get(_url(RAG).replace('.html', '.md'), '#architecture')[0].title == (
+        'Architecture'
+    )
+    assert sections.pages_with('TL;DR') == [_url(RAG), _url(AGENTS)]
+    assert sections.common_headings(1) == [('TL;DR', 2)]
+
+
+@pytest.mark.asyncio
+async def test_collect_sections_across_topics(index):
+    """One call returns the section from every matching page, as markdown."""
+    result = await collect_sections('tl;dr')
+    assert result.startswith('"TL;DR" from 2 Atlas topics:')
+    assert 'Retrieve, then **generate**.' in result
+    assert 'Agents use tools.' in result
+    assert f'Source: {_url(AGENTS)}#tldr' in result
+
+
+@pytest.mark.asyncio
+async def test_collect_sections_by_query_and_topic_section(index):
+    """Queries rank the pages; topic sections filter them."""
+    result = await collect_sections('TL;DR', query='rag')
+    assert 'from 1 Atlas topics' in result
+    assert '## RAG' in result
+    assert '1 other matching topics have no "TL;DR" section' in result
+
+    topics = MagicMock()
+    topics.ensure_loaded = AsyncMock()
+    topics.list_topics.return_value = [TopicEntry(title='Agents', url=_url(AGENTS))]
+    with patch.object(collect_module, 'get_topic_index', return_value=topics):
+        result = await collect_sections('TL;DR', topic_section='agents')
+    assert '## Agents' in result
+    assert '## RAG' not in result
+
+
+@pytest.mark.asyncio
+async def test_collect_sections_unknown_heading(index):
+    """An unknown heading lists the common ones."""
+    result = await collect_sections('Nope')
+    assert 'No matching topics have a "Nope" section' in result
+    assert '"TL;DR" (2 topics)' in result
+
+
+@pytest.mark.asyncio
+async def test_reindexed_page_replaces_its_sections(index):
+    """Re-indexing a page swaps its sections for the converted ones; removal drops them."""
+    page = build_page_content(
+        '<article><h1>RAG</h1><h2 id="tldr">TL;DR</h2><p>Updated summary.</p>'
+        '<h3 id="detail">Detail</h3><p>More.</p></article>',
+        _url(RAG),
+    )
+    index.upsert_page(_url(RAG), 'RAG', 'Updated summary.', sections_from_page(page, _url(RAG)))
+    (tldr,) = index.sections.get(_url(RAG), 'TL;DR')
+    assert not tldr.is_html
+    assert tldr.text == 'Updated summary.\n\n### Detail\n\nMore.'
+    assert index.sections.get(_url(RAG), 'Architecture') == []
+
+    index.remove_page(_url(RAG))
+    assert index.sections.pages_with('TL;DR') == [_url(AGENTS)]
@@ -0,0 +1,156 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for page outlines and site snapshots."""
+
+import zipfile
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from genai_atlas_mcp_server.utils.html_converter import extract_sections
+from genai_atlas_mcp_server.utils.page_content import (
+    build_page_content,
+    markdown_outline,
+    read_page_sections,
+)
+from genai_atlas_mcp_server.utils.snapshot import Snapshot, build_snapshot
+from genai_atlas_mcp_server.utils.url_utils import page_key
+
+BASE = 'https://awslabs.github.io/generative-ai-atlas'
+
+PAGE_HTML = '''
+<html><body><article>
+<h1>RAG</h1>
+<h2 id="tldr">TL;DR<a class="headerlink" href="#tldr">¶</a></h2>
+<p>Short summary.</p>
+<h2 id="architecture">Architecture</h2>
+<p>Overview.</p>
+<img src="./assets/rag.png" alt="RAG Architecture"/>
+<h3 id="ingestion">Ingestion</h3>
+<pre><code>## not a heading</code></pre>
+<h2 id="further-reading">Further Reading</h2>
+<p>Links.</p>
+</article></body></html>
+'''
+
+
+def test_page_key_normalizes_url_forms():
+    """All deployed forms of a page share one key."""
+    keys = {
+        page_key(f'{BASE}/topics/rag/rag.md'),
+        page_key(f'{BASE}/topics/rag/rag.html'),
+        page_key(f'{BASE}/topics/rag/rag/'),
+        page_key(f'{BASE}/topics/rag/rag/index.html#tldr'),
+    }
+    assert keys == {'topics/rag/rag'}
+    assert page_key(f'{BASE}/topics/index.md') == page_key(f'{BASE}/topics/')
+
+
+def test_markdown_outline_skips_code_fences():
+    """Headings inside fenced code are not sections."""
+    markdown = '# Title\n\n## A\n\ntext\n\n```\n## not a heading\n```\n\n### B\n\nmore\n\n## C\n'
+    sections = markdown_outline(markdown)
+    assert [(s.title, s.level) for s in sections] == [('A', 2), ('B', 3), ('C', 2)]
+    assert markdown[sections[0].start:sections[0].end].startswith('## A')
+    assert '## C' not in markdown[sections[0].start:sections[0].end]
+
+
+def test_read_page_sections_matches_extract_sections():
+    """Slicing converted markdown gives the same result as the HTML path."""
+    page = build_page_content(PAGE_HTML, f'{BASE}/topics/rag/rag.html')
+    for titles in (['TL;DR'], ['Architecture'], ['tl:dr', 'Further Reading', 'Missing']):
+        assert read_page_sections(page, titles) == extract_sections(PAGE_HTML, titles)
+
+
+def test_outline_keys_and_anchors():
+    """Sections carry their matching key and the page's heading ids."""
+    page = build_page_content(
+        PAGE_HTML.replace('<h2 id="architecture">', '<h2 id="arch-overview">'),
+        f'{BASE}/topics/rag/rag.html',
+    )
+    assert [(s.key, s.anchor) for s in page.sections] == [
+        ('tl:dr', 'tldr'),
+        ('architecture', 'arch-overview'),
+        ('ingestion', 'ingestion'),
+        ('further reading', 'further-reading'),
+    ]
+    # Headings without an id get the anchor MkDocs would generate
+    assert markdown_outline('## Making it practical!\n')[0].anchor == 'making-it-practical'
+
+
+def test_read_page_sections_by_anchor():
+    """Anchors select sections like titles do."""
+    page = build_page_content(PAGE_HTML, f'{BASE}/topics/rag/rag.html')
+    assert read_page_sections(page, ['#tldr']) == read_page_sections(page, ['TL;DR'])
+    assert read_page_sections(page, ['further-reading']).startswith('## Further Reading')
+
+
+def test_read_page_sections_not_found():
+    """Unknown sections raise ValueError listing the available headings."""
+    page = build_page_content(PAGE_HTML, f'{BASE}/topics/rag/rag.html')
+    with pytest.raises(ValueError, match='Available sections: "TL;DR"'):
+        read_page_sections(page, ['Nope'])
+
+
+@pytest.mark.asyncio
+async def test_build_and_read_snapshot(tmp_path):
+    """Pages are crawled once and read back by any URL form."""
+    url = f'{BASE}/topics/rag/rag.html'
+    output = tmp_path / 'atlas.zip'
+    with patch(
+        'genai_atlas_mcp_server.utils.snapshot._crawl_urls',
+        new_callable=AsyncMock,
+        return_value=[url, f'{BASE}/topics/missing.html'],
+    ), patch(
+        'genai_atlas_mcp_server.utils.snapshot.fetch_atlas_page',
+        new_callable=AsyncMock,
+        side_effect=lambda u: (PAGE_HTML, u) if u == url else None,
+    ):
+        count = await build_snapshot(str(output), max_concurrent=2)
+
+    assert count == 1
+    snapshot = Snapshot(str(output))
+    page = await snapshot.get(f'{BASE}/topics/rag/rag.md')
+    assert page is not None
+    assert 'Short summary.' in page.markdown
+    assert [s.title for s in page.sections][:2] == ['TL;DR', 'Architecture']
+    assert page.diagrams[0]['image_url'] == f'{BASE}/topics/rag/assets/rag.png'
+    assert await snapshot.get(f'{BASE}/topics/missing.html') is None
+
+
+@pytest.mark.asyncio
+async def test_interrupted_build_leaves_no_archive(tmp_path):
+    """A failed build leaves neither a partial archive nor its temporary file."""
+    output = tmp_path / 'atlas.zip'
+    with patch(
+        'genai_atlas_mcp_server.utils.snapshot._crawl_urls',
+        new_callable=AsyncMock,
+        return_value=[f'{BASE}/topics/rag/rag.html'],
+    ), patch(
+        'genai_atlas_mcp_server.utils.snapshot.fetch_atlas_page',
+        new_callable=AsyncMock,
+        side_effect=lambda u: (PAGE_HTML, u),
+    ), patch(
+        'genai_atlas_mcp_server.utils.snapshot.json.dumps', side_effect=KeyboardInterrupt
+    ), pytest.raises(KeyboardInterrupt):
+        await build_snapshot(str(output))
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_corrupt_member_reads_as_missing(tmp_path):
+    """A damaged page entry is reported and read as missing."""
+    path = tmp_path / 'atlas.zip'
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('pages/topics/rag/rag.json', '{"url": ')
+        zf.writestr('manifest.json', '{"format": 1, "pages": {"topics/rag/rag": {}}}')
+    assert await Snapshot(str(path)).get(f'{BASE}/topics/rag/rag.html') is None
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    """Opening a non-snapshot file raises ValueError."""
+    path = tmp_path / 'not-a-snapshot.zip'
+    path.write_bytes(b'not a zip')
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
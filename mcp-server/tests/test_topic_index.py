@@ -0,0 +1,232 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for topic lookup, section grouping and the topic tree."""
+
+import importlib.util
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from genai_atlas_mcp_server.tools import list_topics as list_topics_module
+from genai_atlas_mcp_server.tools.list_topics import list_topics
+from genai_atlas_mcp_server.utils.topic_index import TopicIndex
+from genai_atlas_mcp_server.utils.topic_tree import TopicTree, parse_nav
+
+PACK_HOOK = Path(__file__).resolve().parents[2] / 'hooks' / 'content_pack_hook.py'
+SITE = 'https://awslabs.github.io/generative-ai-atlas/topics'
+PRIMITIVES = f'{SITE}/2_0_technical_foundations_and_patterns/2_1_key_primitives'
+
+LLMS_TXT = f"""# Generative AI Atlas
+
+## Topic Documentation
+
+- [Terminology]({SITE}/1_0_generative_ai_fundamentals/1_1_core/core_concepts.md)
+- [Index]({PRIMITIVES}/index.md)
+- [RAG]({PRIMITIVES}/2_1_7_rag/2_1_7_rag.md)
+- [Fine-tuning]({PRIMITIVES}/2_1_8_fine_tuning/2_1_8_fine_tuning.md)
+- [Model Context Procotol (MCP)]({PRIMITIVES}/2_1_11_mcp/mcp.md)
+- [Multimodal RAG]({SITE}/3_0_architecture_and_design/3_1_multimodal_rag/multimodal.md): Text (and images)
+- [Overview]({SITE}/3_0_architecture_and_design/3_2_vector_databases/overview.md)
+- [Overview]({SITE}/6_0_example_application/6_1_overview/overview.md)
+"""
+
+
+ROOT = 'https://awslabs.github.io/generative-ai-atlas'
+TECH = 'topics/2_0_technical_foundations_and_patterns'
+
+
+PRIMITIVES_PATH = f'{TECH}/2_1_key_primitives'
+
+# content-pack/nav.json of the site build (mkdocs.yml nav)
+NAV_OUTLINE = [
+    [0, 'GenAI Fundamentals', None],
+    [1, 'Terminology', 'topics/1_0_generative_ai_fundamentals/1_1_core/core_concepts.html'],
+    [0, 'Core Concepts', f'{TECH}/index.html'],
+    [1, 'Key Primitives', f'{PRIMITIVES_PATH}/index.html'],
+    [2, 'RAG', f'{PRIMITIVES_PATH}/2_1_7_rag/2_1_7_rag.html'],
+    [2, 'Fine-tuning', f'{PRIMITIVES_PATH}/2_1_8_fine_tuning/2_1_8_fine_tuning.html'],
+    [2, 'Model Context Procotol (MCP)', f'{PRIMITIVES_PATH}/2_1_11_mcp/mcp.html'],
+    [0, 'Contributing', 'contributing.html'],
+]
+NAV = json.dumps({'format': 1, 'build': 'test', 'nav': NAV_OUTLINE})
+
+
+def _fake_fetch(nav):
+    async def _fetch(url, missing_ok=False):
+        return LLMS_TXT if url.endswith('llms.txt') else nav
+    return _fetch
+
+
+@pytest.fixture
+async def topics():
+    """A topic index loaded from ``LLMS_TXT`` and the ``NAV`` navigation."""
+    index = TopicIndex()
+    with patch('genai_atlas_mcp_server.utils.topic_index.fetch_url', _fake_fetch(NAV)):
+        await index.ensure_loaded()
+    return index
+
+
+@pytest.mark.asyncio
+async def test_find_topic_exact_lookups(topics):
+    """URLs in any form, titles and page names are looked up exactly."""
+    rag_html = f'{PRIMITIVES}/2_1_7_rag/2_1_7_rag.html'
+    assert topics.find_topic(rag_html).title == 'RAG'
+    assert topics.find_topic(f'{PRIMITIVES}/2_1_7_rag/2_1_7_rag.md').title == 'RAG'
+    assert topics.find_topic('2_1_7_rag/2_1_7_rag.md').title == 'RAG'
+    # An exact title wins over the earlier topic whose title merely contains it
+    assert topics.find_topic('rag').title == 'RAG'
+    assert topics.find_topic('multimodal RAG').title == 'Multimodal RAG'
+    # A link's description is not part of its URL
+    assert topics.find_topic('multimodal RAG').url.endswith('/3_1_multimodal_rag/multimodal/')
+    assert topics.find_topic('FINE-TUNING').title == 'Fine-tuning'
+    assert topics.find_topic('mcp').title == 'Model Context Procotol (MCP)'
+    assert topics.find_topic('') is None
+
+
+@pytest.mark.asyncio
+async def test_find_topic_fuzzy_and_ranked(topics):
+    """Misspelled and partial queries are ranked by trigram similarity."""
+    assert topics.find_topic('fine tunning').title == 'Fine-tuning'
+    assert topics.find_topic('Model Context Protocol').title == 'Model Context Procotol (MCP)'
+    # "Overview" is ambiguous as a title; the path disambiguates
+    assert '3_2_vector_databases' in topics.find_topic('vector databases').url
+
+    ranked = topics.match_topics('rag', max_results=5)
+    assert [t.title for t, _ in ranked] == ['RAG', 'Multimodal RAG']
+    assert ranked[0][1] > ranked[1][1]
+    assert topics.find_topic('xyzzy') is None
+
+
+@pytest.mark.asyncio
+async def test_list_topics_by_section(topics):
+    """Topics are grouped by section; the filter matches section names partially."""
+    assert len(topics.list_topics()) == 7
+    assert [t.title for t in topics.list_topics('examples')] == ['Overview']
+    assert [t.title for t in topics.list_topics('FOUNDATIONS')] == [
+        'RAG', 'Fine-tuning', 'Model Context Procotol (MCP)',
+    ]
+    # Several matching sections keep llms.txt order
+    assert [t.title for t in topics.list_topics('a')][:2] == ['Terminology', 'RAG']
+    assert topics.list_topics('nope') == []
+
+
+def _page(title, url, is_index=False, is_homepage=False):
+    return SimpleNamespace(
+        is_section=False, is_page=True, title=title, url=url,
+        is_index=is_index, is_homepage=is_homepage,
+    )
+
+
+def _section(title, children):
+    return SimpleNamespace(is_section=True, is_page=False, title=title, children=children)
+
+
+def test_parse_nav_outline():
+    """The hook exports the nav without the home page; sections link to their index page."""
+    if not PACK_HOOK.exists():
+        pytest.skip('hooks/ is not part of this checkout')
+    spec = importlib.util.spec_from_file_location('content_pack_hook', PACK_HOOK)
+    hook = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(hook)
+
+    (_, terminology), (_, tech), (_, primitives), *pages, (_, contributing) = [
+        (title, url) for _, title, url in NAV_OUTLINE if url
+    ]
+    items = [
+        _page('Home', '', is_index=True, is_homepage=True),
+        _section('GenAI Fundamentals', [_page('Terminology', terminology)]),
+        _section('Core Concepts', [
+            _page('Core Concepts', tech, is_index=True),
+            _section('Key Primitives', [
+                _page('Key Primitives', primitives, is_index=True),
+                *[_page(title, url) for title, url in pages],
+            ]),
+        ]),
+        _page('Contributing', contributing),
+    ]
+    assert hook.nav_outline(items) == NAV_OUTLINE
+
+    outline = parse_nav(NAV, f'{ROOT}/')
+    assert [(depth, title) for depth, title, _ in outline] == [
+        (depth, title) for depth, title, _ in NAV_OUTLINE
+    ]
+    assert outline[0][2] is None
+    assert outline[3][2] == f'{ROOT}/{TECH}/2_1_key_primitives/index.html'
+    assert parse_nav('[]', f'{ROOT}/') == []
+
+
+@pytest.mark.asyncio
+async def test_topic_tree_links_and_breadcrumbs(topics):
+    """Nodes know their parent, children, depth and breadcrumbs; ids are stable."""
+    tree = topics.tree
+    rag = tree.get('rag')
+    primitives = tree.get(rag.parent)
+    assert primitives.title == 'Key Primitives'
+    assert rag.breadcrumbs == ['Core Concepts', 'Key Primitives']
+    assert rag.depth == 2
+    assert rag.section == 'Technical Foundations & Patterns'
+    assert tree.get(f'{ROOT}/{TECH}/2_1_key_primitives/2_1_7_rag/2_1_7_rag.md') is rag
+    assert len(primitives.children) == 3
+    # A group without a page takes the section of its pages
+    assert tree.get('GenAI Fundamentals').section == 'GenAI Fundamentals'
+
+    # Ids depend on page paths only, not on the shape of the navigation
+    flat = TopicTree(parse_nav(NAV, f'{ROOT}/')[4:5])
+    assert flat.get('rag').id == rag.id
+    assert flat.get('rag').breadcrumbs == []
+
+
+@pytest.mark.asyncio
+async def test_topic_tree_falls_back_to_llms_paths():
+    """Without a site navigation, the tree follows the llms.txt directories."""
+    index = TopicIndex()
+    with patch('genai_atlas_mcp_server.utils.topic_index.fetch_url', _fake_fetch(None)):
+        await index.ensure_loaded()
+    rag = index.tree.get('rag')
+    assert rag.breadcrumbs == ['Technical Foundations & Patterns', 'Key Primitives']
+    assert index.tree.get(rag.parent).url == f'{PRIMITIVES}/'
+    assert [n.title for n in index.tree.descendants(depth=1)] == [
+        'GenAI Fundamentals',
+        'Technical Foundations & Patterns',
+        'Architecture & Design Patterns',
+        'Examples & References',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_topics_browses_and_pages(topics):
+    """list_topics lists levels and branches of the tree, a page at a time."""
+    with patch.object(list_topics_module, 'get_topic_index', return_value=topics):
+        top = await list_topics(depth=1)
+        assert [t['title'] for t in top['topics']] == [
+            'GenAI Fundamentals', 'Core Concepts', 'Contributing',
+        ]
+        assert top['topics'][1]['children'] == 1
+        assert top['next_offset'] is None
+
+        branch = await list_topics(subtree=top['topics'][1]['id'], max_results=2)
+        assert branch['subtree']['title'] == 'Core Concepts'
+        assert [t['title'] for t in branch['topics']] == ['Key Primitives', 'RAG']
+        assert (branch['total'], branch['next_offset']) == (4, 2)
+        rest = await list_topics(subtree='Core Concepts', offset=2, max_results=2)
+        assert [t['title'] for t in rest['topics']] == [
+            'Fine-tuning', 'Model Context Procotol (MCP)',
+        ]
+        assert rest['topics'][0]['breadcrumbs'] == ['Core Concepts', 'Key Primitives']
+        assert rest['next_offset'] is None
+
+        fundamentals = await list_topics(section='fundamentals', depth=2)
+        assert [t['title'] for t in fundamentals['topics']] == [
+            'GenAI Fundamentals', 'Terminology',
+        ]
+        # Without tree or paging arguments, the flat list of every matching topic
+        flat = await list_topics(section='fundamentals')
+        assert [t['title'] for t in flat] == ['Terminology']
+        assert flat[0]['section'] == fundamentals['topics'][1]['section']
+        # Subtrees are also found by fuzzy title
+        assert (await list_topics(subtree='fine tunning'))['topics'] == []
+        assert 'Unknown subtree' in (await list_topics(subtree='xyzzy'))['error']
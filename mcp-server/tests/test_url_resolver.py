@@ -0,0 +1,75 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for canonical URL resolution."""
+
+
+import weakref
+
+import httpx
+import pytest
+
+from genai_atlas_mcp_server.utils import fetcher, page_cache, url_resolver
+from genai_atlas_mcp_server.utils.url_resolver import PATTERN_HTML, UrlResolver
+
+BASE = 'https://awslabs.github.io/generative-ai-atlas'
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Serve a file-style build (pages only at name.html) and record requests."""
+    pages = {f'{BASE}/topics/rag/rag.html': '<h1>RAG</h1>'}
+    requests = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        body = pages.get(str(request.url))
+        return httpx.Response(404) if body is None else httpx.Response(200, text=body)
+
+    monkeypatch.setattr(
+        fetcher,
+        '_create_client',
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+    )
+    monkeypatch.setattr(fetcher, '_clients', weakref.WeakKeyDictionary())
+    monkeypatch.setattr(url_resolver, '_resolver', UrlResolver())
+    monkeypatch.setattr(page_cache, '_page_cache', page_cache.PageCache(0))
+    return requests
+
+
+def test_llms_link_maps_to_sibling_html():
+    """llms.txt .md links resolve to the HTML file next to them."""
+    resolver = UrlResolver()
+    resolver.register_llms_link(f'{BASE}/topics/rag/rag.md')
+    assert resolver.lookup(f'{BASE}/topics/rag/rag/') == f'{BASE}/topics/rag/rag.html'
+
+
+@pytest.mark.asyncio
+async def test_known_url_fetched_in_one_request(site):
+    """A registered page is fetched from its canonical URL directly."""
+    url_resolver.get_url_resolver().register(f'{BASE}/topics/rag/rag.html')
+    html, fetched_url = await fetcher.fetch_atlas_page(f'{BASE}/topics/rag/rag.md')
+    assert html == '<h1>RAG</h1>'
+    assert fetched_url == f'{BASE}/topics/rag/rag.html'
+    assert site == [f'{BASE}/topics/rag/rag.html']
+
+
+@pytest.mark.asyncio
+async def test_unknown_url_races_candidates_and_learns(site):
+    """Unknown URLs race all patterns; the winner is remembered."""
+    html, fetched_url = await fetcher.fetch_atlas_page(f'{BASE}/topics/rag/rag.md')
+    assert fetched_url == f'{BASE}/topics/rag/rag.html'
+
+    resolver = url_resolver.get_url_resolver()
+    assert resolver.lookup(f'{BASE}/topics/rag/rag/') == f'{BASE}/topics/rag/rag.html'
+    assert resolver.candidates(f'{BASE}/topics/other.md')[0][0] == PATTERN_HTML
+
+    site.clear()
+    await fetcher.fetch_atlas_page(f'{BASE}/topics/rag/rag/')
+    assert site == [f'{BASE}/topics/rag/rag.html']
+
+
+@pytest.mark.asyncio
+async def test_unknown_url_not_found(site):
+    """When no pattern exists the fetch fails."""
+    assert await fetcher.fetch_atlas_page(f'{BASE}/topics/missing.md') is None
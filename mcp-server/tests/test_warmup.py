@@ -0,0 +1,95 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for start-up warm-up and the page cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from genai_atlas_mcp_server.config import config
+from genai_atlas_mcp_server.models import TopicEntry
+from genai_atlas_mcp_server.utils.page_cache import PageCache
+from genai_atlas_mcp_server.utils.warmup import warm_up
+
+BASE = 'https://awslabs.github.io/generative-ai-atlas'
+
+
+def test_page_cache_shares_url_forms_and_evicts_lru():
+    """URL variants of a page hit the same entry; the oldest entry is evicted."""
+    cache = PageCache(max_entries=2)
+    cache.put(f'{BASE}/topics/a/a.md', '<a/>', f'{BASE}/topics/a/a.html')
+    cache.put(f'{BASE}/topics/b/b.html', '<b/>', f'{BASE}/topics/b/b.html')
+    assert cache.get(f'{BASE}/topics/a/a.html') == ('<a/>', f'{BASE}/topics/a/a.html')
+
+    cache.put(f'{BASE}/topics/c/c.html', '<c/>', f'{BASE}/topics/c/c.html')
+    assert cache.get(f'{BASE}/topics/b/b.html') is None
+    assert len(cache) == 2
+
+    cache.invalidate([f'{BASE}/topics/a/a/'])
+    assert cache.get(f'{BASE}/topics/a/a.md') is None
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_indexes_concurrently(monkeypatch):
+    """Both indexes, the content pack and the corpus start loading before any finishes."""
+    monkeypatch.setattr(config, 'corpus', True)
+    started = []
+    release = asyncio.Event()
+
+    def _slow_load(name):
+        async def _load():
+            started.append(name)
+            await release.wait()
+
+        return _load
+
+    search_index = AsyncMock()
+    search_index.ensure_loaded.side_effect = _slow_load('search')
+    topic_index = AsyncMock()
+    topic_index.ensure_loaded.side_effect = _slow_load('topics')
+    corpus = AsyncMock()
+    corpus.ensure_loaded.side_effect = _slow_load('corpus')
+    pack = AsyncMock()
+    pack.ensure_loaded.side_effect = _slow_load('pack')
+
+    with patch(
+        'genai_atlas_mcp_server.utils.warmup.get_search_index', return_value=search_index
+    ), patch(
+        'genai_atlas_mcp_server.utils.warmup.get_topic_index', return_value=topic_index
+    ), patch('genai_atlas_mcp_server.utils.warmup.get_corpus', return_value=corpus), patch(
+        'genai_atlas_mcp_server.utils.warmup.get_content_pack', return_value=pack
+    ):
+        task = asyncio.create_task(warm_up())
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert sorted(started) == ['corpus', 'pack', 'search', 'topics']
+        release.set()
+        await task
+
+
+@pytest.mark.asyncio
+async def test_warm_up_prefetches_top_topics():
+    """Prefetch fetches the first N topics."""
+    topic_index = AsyncMock()
+    topic_index.list_topics = lambda: [
+        TopicEntry(title=f'T{i}', url=f'{BASE}/topics/t{i}.html') for i in range(5)
+    ]
+    with patch(
+        'genai_atlas_mcp_server.utils.warmup.get_search_index', return_value=AsyncMock()
+    ), patch(
+        'genai_atlas_mcp_server.utils.warmup.get_topic_index', return_value=topic_index
+    ), patch(
+        'genai_atlas_mcp_server.utils.warmup.get_corpus', return_value=AsyncMock()
+    ), patch(
+        'genai_atlas_mcp_server.utils.warmup.get_content_pack', return_value=AsyncMock()
+    ), patch(
+        'genai_atlas_mcp_server.utils.warmup.fetch_atlas_page', new_callable=AsyncMock
+    ) as fetch:
+        await warm_up(prefetch=2)
+
+    assert sorted(c.args[0] for c in fetch.call_args_list) == [
+        f'{BASE}/topics/t0.html',
+        f'{BASE}/topics/t1.html',
+    ]
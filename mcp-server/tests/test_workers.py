@@ -0,0 +1,99 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the conversion worker pool and event-loop lag monitor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from genai_atlas_mcp_server.utils.loop_lag import LoopLagMonitor
+from genai_atlas_mcp_server.utils.page_content import build_page_content
+from genai_atlas_mcp_server.utils.workers import WorkerPool
+
+HTML = '<article><h1>RAG</h1><h2>TL;DR</h2><p>Retrieve, then generate.</p></article>'
+URL = 'https://awslabs.github.io/generative-ai-atlas/topics/rag/rag.html'
+
+
+@pytest.mark.asyncio
+async def test_runs_off_the_event_loop_thread():
+    """Jobs run in a worker thread; workers=0 runs them inline."""
+    pool = WorkerPool(2)
+    try:
+        assert await pool.run(lambda: threading.current_thread().name) != (
+            threading.current_thread().name
+        )
+    finally:
+        pool.close()
+
+    inline = WorkerPool(0)
+    assert await inline.run(threading.current_thread) is threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_submissions_are_bounded():
+    """Callers past workers + max_queued wait on the loop, not in the executor."""
+    pool = WorkerPool(1, max_queued=1)
+    release = threading.Event()
+    try:
+        jobs = [asyncio.create_task(pool.run(release.wait, 5)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        assert pool.in_flight == 2
+        assert pool.waiting == 2
+
+        release.set()
+        assert await asyncio.gather(*jobs) == [True] * 4
+        await asyncio.sleep(0)
+        stats = pool.stats()
+        assert stats['submitted'] == stats['completed'] == 4
+        assert stats['in_flight'] == stats['waiting'] == 0
+    finally:
+        release.set()
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_and_free_the_slot():
+    """A failing job raises in the caller and does not leak its slot."""
+    pool = WorkerPool(1, max_queued=0)
+
+    def _fail():
+        raise ValueError('bad page')
+
+    try:
+        with pytest.raises(ValueError, match='bad page'):
+            await pool.run(_fail)
+        assert await asyncio.wait_for(pool.run(len, 'abc'), timeout=1) == 3
+        await asyncio.sleep(0)
+        assert pool.failed == 1
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_converts_pages():
+    """Page conversion works in worker processes (arguments and result pickle)."""
+    pool = WorkerPool(1, kind='process')
+    try:
+        page = await pool.run(build_page_content, HTML, URL)
+    finally:
+        pool.close()
+    assert page == build_page_content(HTML, URL)
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_records_blocking():
+    """Blocking the loop shows up as lag and is counted as slow."""
+    monitor = LoopLagMonitor(interval=0.01, warn_threshold=0.05)
+    task = asyncio.create_task(monitor.run())
+    try:
+        await asyncio.sleep(0.03)
+        time.sleep(0.1)
+        await asyncio.sleep(0.03)
+    finally:
+        task.cancel()
+    stats = monitor.stats()
+    assert stats['max_ms'] >= 50
+    assert stats['slow_samples'] >= 1